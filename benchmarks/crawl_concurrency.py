@@ -0,0 +1,122 @@
+"""
+Throughput comparison between the sequential crawl loop (one worker) and the
+concurrent worker pool.
+
+The fetcher simulates network round-trips with a fixed latency against an
+in-memory synthetic site, so the numbers isolate crawler scheduling from the
+network and from any real server's politeness budget.
+
+Usage:
+    uv run python benchmarks/crawl_concurrency.py --pages 200 --latency 0.05
+    uv run python benchmarks/crawl_concurrency.py --latency 0 --parse-workers 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from scraper.crawler_builder import CrawlerBuilder
+from scraper.http.interface import HttpFetcher
+from scraper.models import PageObject
+from scraper.output.interface import OutputWriter
+
+BASE_URL = "https://bench.local/"
+
+
+class SimulatedLatencyFetcher(HttpFetcher):
+    """Serve a synthetic tree of pages after a fixed simulated latency."""
+
+    def __init__(self, page_count: int, fan_out: int, latency: float) -> None:
+        super().__init__()
+        self._page_count = page_count
+        self._fan_out = fan_out
+        self._latency = latency
+
+    async def get(self, url: str) -> httpx.Response | None:
+        await asyncio.sleep(self._latency)
+        page_id = int(url.rstrip("/").rsplit("/", 1)[-1] or 0) if "/p/" in url else 0
+        children = range(
+            page_id * self._fan_out + 1, page_id * self._fan_out + 1 + self._fan_out
+        )
+        links = "".join(
+            f'<a href="/p/{child}/">page {child}</a>'
+            for child in children
+            if child < self._page_count
+        )
+        html = (
+            f"<html><head><title>Page {page_id}</title></head>"
+            f"<body><p>Synthetic benchmark page number {page_id} with some text.</p>"
+            f"{links}</body></html>"
+        )
+        return httpx.Response(
+            200, content=html.encode(), request=httpx.Request("GET", url)
+        )
+
+
+class CountingWriter(OutputWriter):
+    """Discard records while counting them."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    async def write(self, page_object: PageObject) -> None:
+        self.count += 1
+
+
+async def run_once(args: argparse.Namespace, concurrency: int) -> tuple[int, float]:
+    """Crawl the synthetic site once and return (pages, seconds)."""
+    writer = CountingWriter()
+    builder = (
+        CrawlerBuilder(domain_url=BASE_URL, start_url=BASE_URL, output_path="unused")
+        .with_max_pages(args.pages)
+        .with_concurrency(concurrency)
+        .with_fetcher(
+            SimulatedLatencyFetcher(args.pages * 2, args.fan_out, args.latency)
+        )
+        .with_output_writer(writer)
+    )
+    if args.parse_workers is not None:
+        builder = builder.with_process_pool(args.parse_workers)
+    crawler = builder.build()
+    started = time.perf_counter()
+    async with crawler:
+        await crawler.crawl()
+    return writer.count, time.perf_counter() - started
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--fan-out", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Parse in a process pool of this size (0 = one per core).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    baseline: float | None = None
+    print(f"{'workers':>8} {'pages':>6} {'seconds':>8} {'pages/s':>8} {'speedup':>8}")
+    for concurrency in args.concurrency:
+        pages, seconds = asyncio.run(run_once(args, concurrency))
+        rate = pages / seconds
+        baseline = baseline or rate
+        print(
+            f"{concurrency:>8} {pages:>6} {seconds:>8.2f} {rate:>8.1f} {rate / baseline:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Language detection cost: langdetect.detect() vs LanguageDetector variants.
+
+The corpus has pages from several hosts, each writing mostly in one language
+(English, German, French, Spanish, Italian, Dutch or Portuguese), with
+occasional pages in another language and an English navigation header on
+every page. Page length varies from a few dozen to several thousand words.
+The table reports the time to load the language profiles, pages/sec, and
+agreement with langdetect.detect() over the full text. A variant that agrees
+on fewer than --min-agreement of the pages fails the run.
+
+Usage:
+    uv run python benchmarks/language_detection_benchmark.py --pages 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable
+
+from langdetect import DetectorFactory, LangDetectException, detect
+from langdetect.detector_factory import PROFILES_DIRECTORY, init_factory
+
+from scraper.text_processing.language_detector import LanguageDetector
+
+VOCABULARY = {
+    "en": "the and of to in is that it was for on are with as his they be at one "
+    "have this from by hot word but what some we can out other were all there "
+    "when up use your how said an each she which do their time if will way",
+    "de": "der die und in den von zu das mit sich des auf für ist im dem nicht ein "
+    "eine als auch es an werden aus er hat dass sie nach wird bei einer um am "
+    "sind noch wie einem über einen so zum war haben nur oder aber vor zur",
+    "fr": "le de un être et à il avoir ne je son que se qui ce dans en du elle au "
+    "pour pas que vous par sur faire plus dire me on mon lui nous comme mais "
+    "pouvoir avec tout y aller voir en bien où sans tu ou leur homme si deux",
+    "es": "el la de que y a en un ser se no haber por con su para como estar tener "
+    "le lo todo pero más hacer o poder decir este ir otro ese si me ya ver "
+    "porque dar cuando él muy sin vez mucho saber qué sobre mi alguno mismo",
+    "it": "il di che è e la per un in non una sono mi ho lo ma ha le si ti con cosa "
+    "se io come da ci questo qui hai sei del bene tu sì me più al mio c'è "
+    "perché lei solo hanno gli ciao tutto della so lui abbiamo va anche",
+    "nl": "de en van ik te dat die in een hij het niet zijn is was op aan met als "
+    "voor had er maar om hem dan zou of wat mijn men dit zo door over ze zich "
+    "bij ook tot je mij uit der daar haar naar heb hoe heeft hebben deze u",
+    "pt": "o de a que e do da em um para é com não uma os no se na por mais as dos "
+    "como mas foi ao ele das tem à seu sua ou ser quando muito há nos já está "
+    "eu também só pelo pela até isso ela entre era depois sem mesmo aos",
+}
+HOSTS = [(f"site-{language}.example", language) for language in VOCABULARY]
+NAVIGATION = "Home Products Pricing Blog About Contact Sign in Search Menu"
+
+
+def prose(rng: random.Random, language: str, words: int) -> str:
+    vocabulary = VOCABULARY[language].split()
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def synthetic_corpus(pages: int, seed: int) -> list[tuple[str, str]]:
+    """Return (url, text) pairs; hosts are mostly, not only, monolingual."""
+    rng = random.Random(seed)
+    corpus = []
+    for page_id in range(pages):
+        host, language = HOSTS[page_id % len(HOSTS)]
+        if rng.random() < 0.05:
+            language = rng.choice(list(VOCABULARY))
+        words = int(rng.lognormvariate(6.3, 0.9))
+        text = f"{NAVIGATION} {prose(rng, language, max(20, words))}"
+        corpus.append((f"https://{host}/articles/{page_id}/", text))
+    return corpus
+
+
+def reference(text: str) -> str:
+    try:
+        return detect(text)
+    except LangDetectException:
+        return "unknown"
+
+
+def load_all_profiles() -> None:
+    DetectorFactory().load_profile(PROFILES_DIRECTORY)
+
+
+class Variant:
+    """One detection setup: how to load profiles and how to detect a page."""
+
+    def __init__(
+        self,
+        load: Callable[[], None],
+        factory: Callable[[], Callable[[str, str], str]],
+    ) -> None:
+        self.load = load
+        self.factory = factory
+
+
+def detector_variant(**options: object) -> Variant:
+    def load() -> None:
+        LanguageDetector(**options).warm_up()  # type: ignore[arg-type]
+
+    def factory() -> Callable[[str, str], str]:
+        detector = LanguageDetector(**options)  # type: ignore[arg-type]
+        detector.warm_up()
+        return lambda url, text: detector.detect(text, url.split("/")[2])
+
+    return Variant(load, factory)
+
+
+def time_load(load: Callable[[], None], rounds: int) -> float:
+    """Return the best profile-loading time in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--sample-chars", type=int, default=1_000)
+    parser.add_argument("--min-agreement", type=float, default=0.97)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    corpus = synthetic_corpus(args.pages, args.seed)
+    size = sum(len(text) for _, text in corpus)
+    print(f"corpus: {len(corpus)} pages, {size / 2**20:.1f} MiB of text")
+
+    init_factory()
+    expected = [reference(text) for _, text in corpus]
+    languages = list(VOCABULARY)
+    variants = {
+        "langdetect.detect": Variant(
+            load_all_profiles, lambda: lambda url, text: reference(text)
+        ),
+        "full text, seeded": detector_variant(sample_chars=None),
+        "sampled": detector_variant(sample_chars=args.sample_chars),
+        "sampled, 7 profiles": detector_variant(
+            sample_chars=args.sample_chars, languages=languages
+        ),
+        "sampled, 7 profiles, prior": detector_variant(
+            sample_chars=args.sample_chars,
+            languages=languages,
+            prior_confidence=0.9,
+        ),
+    }
+
+    failed = False
+    baseline: float | None = None
+    print(
+        f"{'variant':>28} {'load ms':>8} {'pages/s':>9} {'speedup':>8} "
+        f"{'agreement':>10}"
+    )
+    for name, variant in variants.items():
+        load_seconds = time_load(variant.load, args.rounds)
+        best = 0.0
+        agreement = 0.0
+        for _ in range(args.rounds):
+            detect_page = variant.factory()
+            started = time.perf_counter()
+            actual = [detect_page(url, text) for url, text in corpus]
+            best = max(best, len(corpus) / (time.perf_counter() - started))
+            agreement = sum(
+                want == got for want, got in zip(expected, actual, strict=True)
+            ) / len(corpus)
+        baseline = baseline or best
+        failed |= agreement < args.min_agreement
+        print(
+            f"{name:>28} {load_seconds * 1e3:>8.0f} {best:>9.1f} "
+            f"{best / baseline:>7.1f}x {agreement:>9.1%}"
+        )
+    if failed:
+        print(f"agreement below {args.min_agreement:.0%}: FAILED")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Pages/sec of the HTML parser backends, with an output parity check.
+
+Every parser parses the same fixture corpus. That corpus is either generated
+(article pages in three site templates with navigation, boilerplate, scripts,
+comments, entities, CRLF line endings and legacy encodings) or loaded from a directory of saved
+.html files with --html-dir. Before timing, each backend's (title, text,
+links) per page is compared with BasicHtmlParser. Any mismatch is reported
+and fails the run.
+
+Usage:
+    uv run python benchmarks/parser_benchmark.py --pages 500
+    uv run python benchmarks/parser_benchmark.py --html-dir saved_pages/
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import time
+from typing import Callable
+
+import httpx
+
+from scraper.parsers.basic_html_parser import BasicHtmlParser
+from scraper.parsers.interface import HtmlParser
+from scraper.parsers.lxml_html_parser import LxmlHtmlParser
+
+BASE_URL = "https://bench.local/"
+
+WORDS = (
+    "crawler frontier parser latency throughput página naïve café "
+    "straße 東京 résumé index shard queue worker budget host politeness"
+).split()
+
+TEMPLATES = (
+    ("", ""),
+    ("<div id='page'>", "</div>"),
+    ("<div class='shell'><div><div><div>", "</div></div></div></div>"),
+)
+
+
+def fixture_page(page_id: int, rng: random.Random) -> bytes:
+    """Return one synthetic article page as encoded bytes."""
+    paragraphs = "".join(
+        "<p>"
+        + " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 80)))
+        + f" &amp; &lt;{page_id}&gt; &nbsp;<em>emphasis</em> <!-- note --> "
+        + f'<a href="/p/{rng.randint(0, 10_000)}/?ref={page_id}&amp;x=1">more</a>'
+        + "</p>\n"
+        for _ in range(rng.randint(5, 30))
+    )
+    nav = "".join(
+        f'<li><a href="/section/{i}/">Section {i}</a></li>' for i in range(12)
+    )
+    html = (
+        "<!DOCTYPE html>\n<html lang='en'><head>"
+        '<meta charset="{charset}">'
+        f"<title>  Article {page_id} &ndash; Bench  </title>"
+        "<style>body { color: #333 } p > a { margin: 0 }</style>"
+        "<script>window.dataLayer = [{page: '<b>x</b>'}];</script>"
+        "</head>\n<body class='article'>\n"
+        "{layout_start}"
+        f"<header class='site-header'><nav><ul>{nav}</ul></nav></header>\n"
+        f"<div id='main'><h1>Article {page_id}</h1>{paragraphs}"
+        "<template><p>hidden <a href='/template-link'>t</a></p></template>"
+        "<noscript>Enable JavaScript</noscript>"
+        "<div class='tags-box'><a href='/tag/a'>a</a><a href=''>empty</a></div>"
+        "</div>\n"
+        "<footer id='footer'><a href='/about'>About</a> &copy; 2026</footer>\n"
+        "{layout_end}"
+        "<script src='/app.js'></script></body></html>\n"
+    )
+    # Three site templates: flat, one wrapper, and boilerplate nested deeper
+    # than the fingerprinted skeleton.
+    layout_start, layout_end = TEMPLATES[page_id % len(TEMPLATES)]
+    html = html.replace("{layout_start}", layout_start)
+    html = html.replace("{layout_end}", layout_end)
+    if page_id % 7 == 3:
+        html = html.replace("\n", "\r\n")
+    if page_id % 5 == 4:
+        return html.replace("{charset}", "windows-1252").encode(
+            "windows-1252", errors="xmlcharrefreplace"
+        )
+    return html.replace("{charset}", "utf-8").encode("utf-8")
+
+
+def load_corpus(args: argparse.Namespace) -> list[tuple[str, bytes]]:
+    """Return (url, content) pairs from --html-dir or the generator."""
+    if args.html_dir:
+        paths = sorted(pathlib.Path(args.html_dir).rglob("*.htm*"))
+        return [(BASE_URL + path.name, path.read_bytes()) for path in paths]
+    rng = random.Random(args.seed)
+    return [
+        (f"{BASE_URL}p/{page_id}/", fixture_page(page_id, rng))
+        for page_id in range(args.pages)
+    ]
+
+
+def responses(corpus: list[tuple[str, bytes]]) -> list[tuple[str, httpx.Response]]:
+    return [
+        (url, httpx.Response(200, content=content, request=httpx.Request("GET", url)))
+        for url, content in corpus
+    ]
+
+
+def extract(parser: HtmlParser, pages: list[tuple[str, httpx.Response]]) -> list:
+    """Return comparable parser output (timestamps excluded) for every page."""
+    results = []
+    for url, response in pages:
+        page, links = parser.process_page(url, response)
+        results.append(((page.title, page.text) if page else None, links))
+    return results
+
+
+def check_parity(
+    name: str,
+    factory: Callable[[], HtmlParser],
+    pages: list[tuple[str, httpx.Response]],
+) -> bool:
+    """Compare a backend against BasicHtmlParser page by page."""
+    expected = extract(BasicHtmlParser(), pages)
+    actual = extract(factory(), pages)
+    mismatches = [
+        url
+        for (url, _), want, got in zip(pages, expected, actual, strict=True)
+        if want != got
+    ]
+    if mismatches:
+        print(f"{name}: {len(mismatches)} of {len(pages)} pages differ, e.g.")
+        for url in mismatches[:5]:
+            print(f"  {url}")
+    return not mismatches
+
+
+def measure(
+    factory: Callable[[], HtmlParser],
+    pages: list[tuple[str, httpx.Response]],
+    rounds: int,
+) -> float:
+    """Return the best pages/sec over several rounds on a fresh parser."""
+    best = 0.0
+    for _ in range(rounds):
+        parser = factory()
+        started = time.perf_counter()
+        for url, response in pages:
+            parser.process_page(url, response)
+        best = max(best, len(pages) / (time.perf_counter() - started))
+    return best
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--html-dir", default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    pages = responses(load_corpus(args))
+    size = sum(len(response.content) for _, response in pages)
+    print(f"corpus: {len(pages)} pages, {size / 2**20:.1f} MiB")
+
+    parsers: dict[str, Callable[[], HtmlParser]] = {
+        "basic (bs4/html.parser)": BasicHtmlParser,
+        "lxml": LxmlHtmlParser,
+    }
+    parity = all(
+        check_parity(name, factory, pages)
+        for name, factory in parsers.items()
+        if factory is not BasicHtmlParser
+    )
+    print(f"parity with BasicHtmlParser: {'ok' if parity else 'FAILED'}")
+
+    baseline: float | None = None
+    print(f"{'parser':>24} {'pages/s':>9} {'MiB/s':>7} {'speedup':>8}")
+    for name, factory in parsers.items():
+        rate = measure(factory, pages, args.rounds)
+        baseline = baseline or rate
+        throughput = rate * size / len(pages) / 2**20
+        print(f"{name:>24} {rate:>9.1f} {throughput:>7.2f} {rate / baseline:>7.1f}x")
+    if not parity:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
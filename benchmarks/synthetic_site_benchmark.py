@@ -0,0 +1,432 @@
+"""
+End-to-end crawl throughput against a local synthetic site.
+
+A separate process serves a deterministic site over HTTP on localhost: a
+tree of article pages with a configurable page count, fan-out and page
+size, per-request latency drawn from a log-normal distribution, transient
+503 errors, duplicate copies (print views and tracking-parameter variants)
+and an endless calendar trap. The full CrawlerBuilder pipeline (HttpxFetcher,
+parser, text processor, JSONL writer) crawls it, and the table reports
+pages/sec, p50/p99 latency of the fetch, parse, process and write stages
+(from CrawlMetrics) and the crawler process's peak RSS so far (rounds share
+the process, worker processes are not included). Results can be saved
+as JSON and compared with a saved baseline to catch regressions between
+versions; a pages/sec drop beyond --max-regression fails the run.
+
+Usage:
+    uv run python benchmarks/synthetic_site_benchmark.py --pages 1000
+    uv run python benchmarks/synthetic_site_benchmark.py --latency-ms 50 \\
+        --error-rate 0.05 --duplicate-rate 0.2 --trap-rate 0.05 --dedup \\
+        --trap-detection --json results.json
+    uv run python benchmarks/synthetic_site_benchmark.py --baseline results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import importlib.metadata
+import json
+import math
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+from multiprocessing.connection import Connection
+from typing import Any
+
+from scraper.crawler_builder import CrawlerBuilder
+from scraper.dedup.simhash_detector import SimHashDuplicateDetector
+from scraper.http.httpx_fetcher import HttpxFetcher
+from scraper.metrics.crawl_metrics import CrawlMetrics
+from scraper.output.jsonl_writer import JsonlWriter
+from scraper.parsers.lxml_html_parser import LxmlHtmlParser
+from scraper.traversal.trap_detector import TrapDetector
+from scraper.utils.logging_config import LoggingLevels, configure_logging
+from scraper.utils.urls import QueryCanonicalizer
+
+WORDS = (
+    "crawler frontier parser latency throughput index shard queue worker "
+    "budget host politeness template signal language corpus extraction "
+    "the of and to in is that for on with as by at from this be are"
+).split()
+NAV_LINKS = 5
+STAGES = ("fetch", "parse", "process", "write")
+# Log-spaced from 25 us to ~30 s, so quantiles are estimated within ~7%.
+LATENCY_BUCKETS = tuple(25e-6 * 1.15**i for i in range(101))
+
+
+class SyntheticSite:
+    """
+    Deterministic page graph served by the benchmark server.
+
+    Page ``i`` (``/`` is page 0) links to its ``fan_out`` children, one
+    random earlier page and the first pages as navigation. A
+    ``duplicate_rate`` share of pages also links to a print view (same text,
+    no canonical link) and to a ``utm_source`` variant of itself (canonical
+    link back to the page). A ``trap_rate`` share links into an endless
+    calendar. An ``error_rate`` share answers every odd request with 503.
+    """
+
+    def __init__(
+        self,
+        pages: int,
+        fan_out: int,
+        page_kb: float,
+        latency_ms: float,
+        latency_sigma: float,
+        error_rate: float,
+        duplicate_rate: float,
+        trap_rate: float,
+        seed: int,
+    ) -> None:
+        self.pages = pages
+        self.fan_out = fan_out
+        self.page_kb = page_kb
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.duplicate_rate = duplicate_rate
+        self.trap_rate = trap_rate
+        self.seed = seed
+        self._requests: Counter[str] = Counter()
+        self._article = functools.cache(self._render_article)
+
+    def warm_up(self) -> None:
+        """Render every article up front so serving costs no CPU in the crawl."""
+        for page_id in range(self.pages):
+            self._article(page_id, False)
+            if page_id and self._duplicated(page_id):
+                self._article(page_id, True)
+
+    def respond(self, target: str) -> tuple[int, bytes, float]:
+        """Return (status, body, delay in seconds) for a request target."""
+        self._requests[target] += 1
+        attempt = self._requests[target]
+        rng = random.Random(f"{self.seed}:{target}:{attempt}")
+        delay = self.latency_ms / 1e3 * math.exp(self.latency_sigma * rng.gauss())
+        path = target.split("?", 1)[0]
+        body = self._route(path)
+        if body is None:
+            return 404, b"Not Found", delay
+        if self._chance("error", path) < self.error_rate and attempt % 2:
+            return 503, b"Service Unavailable", delay
+        return 200, body, delay
+
+    def _chance(self, kind: str, key: object) -> float:
+        return random.Random(f"{self.seed}:{kind}:{key}").random()
+
+    def _route(self, path: str) -> bytes | None:
+        parts = path.strip("/").split("/")
+        if parts == [""]:
+            return self._article(0, False)
+        if parts[0] == "p" and len(parts) in (2, 3) and parts[1].isdigit():
+            page_id = int(parts[1])
+            if not 0 < page_id < self.pages:
+                return None
+            if len(parts) == 2:
+                return self._article(page_id, False)
+            if parts[2] == "print" and self._duplicated(page_id):
+                return self._article(page_id, True)
+            return None
+        if parts[0] == "calendar" and len(parts) == 2 and parts[1].isdigit():
+            return self._calendar(int(parts[1]))
+        return None
+
+    def _duplicated(self, page_id: int) -> bool:
+        return self._chance("duplicate", page_id) < self.duplicate_rate
+
+    def _render_article(self, page_id: int, print_view: bool) -> bytes:
+        rng = random.Random(f"{self.seed}:page:{page_id}")
+        # ~7 bytes per word including the separator.
+        words = max(20, int(self.page_kb * 1024 / 7 * rng.uniform(0.5, 1.5)))
+        text = [rng.choice(WORDS) for _ in range(words)]
+        paragraphs = "".join(
+            f"<p>{' '.join(text[start : start + 100])}</p>"
+            for start in range(0, words, 100)
+        )
+        path = f"/p/{page_id}/" if page_id else "/"
+        if print_view:
+            return (
+                f"<html><head><title>Page {page_id}</title></head>"
+                f"<body><article>{paragraphs}</article></body></html>"
+            ).encode()
+
+        links = [
+            f"/p/{child}/"
+            for child in range(
+                page_id * self.fan_out + 1, (page_id + 1) * self.fan_out + 1
+            )
+            if child < self.pages
+        ]
+        if page_id > 1:
+            links.append(f"/p/{rng.randrange(1, page_id)}/")
+        if page_id and self._duplicated(page_id):
+            links += [f"{path}print/", f"{path}?utm_source=bench"]
+        if self._chance("trap", page_id) < self.trap_rate:
+            links.append(f"/calendar/{page_id * 1_000}/")
+        nav = "".join(
+            f'<a href="/p/{i}/">Section {i}</a>'
+            for i in range(1, min(NAV_LINKS + 1, self.pages))
+        )
+        anchors = "".join(f'<a href="{href}">Read {href}</a> ' for href in links)
+        return (
+            f'<html><head><title>Page {page_id}</title><link rel="canonical" '
+            f'href="{path}"></head><body><nav>{nav}</nav>'
+            f"<article>{paragraphs}</article><aside>{anchors}</aside></body></html>"
+        ).encode()
+
+    def _calendar(self, day: int) -> bytes:
+        return (
+            f"<html><head><title>Calendar {day}</title></head><body>"
+            f"<p>No events on day {day}.</p>"
+            f'<a href="/calendar/{day + 1}/">Next day</a> '
+            f'<a href="/calendar/{day}/?session={day * 7 % 1_000}">Refresh</a>'
+            "</body></html>"
+        ).encode()
+
+
+async def handle_connection(
+    site: SyntheticSite, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Answer keep-alive HTTP/1.1 GET requests until the client disconnects."""
+    try:
+        while request_line := await reader.readline():
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            target = request_line.decode("latin-1").split(" ")[1]
+            status, body, delay = site.respond(target)
+            await asyncio.sleep(delay)
+            reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}
+            writer.write(
+                f"HTTP/1.1 {status} {reason[status]}\r\n"
+                "Content-Type: text/html; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+def serve(site_options: dict[str, Any], ready: Connection) -> None:
+    """Server process entry point: report the bound port, then serve."""
+
+    async def run() -> None:
+        site = SyntheticSite(**site_options)
+        site.warm_up()
+        server = await asyncio.start_server(
+            functools.partial(handle_connection, site), "127.0.0.1", 0
+        )
+        ready.send(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+def site_options(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "pages": args.pages,
+        "fan_out": args.fan_out,
+        "page_kb": args.page_kb,
+        "latency_ms": args.latency_ms,
+        "latency_sigma": args.latency_sigma,
+        "error_rate": args.error_rate,
+        "duplicate_rate": args.duplicate_rate,
+        "trap_rate": args.trap_rate,
+        "seed": args.seed,
+    }
+
+
+def peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+async def crawl_once(args: argparse.Namespace, base_url: str) -> dict[str, Any]:
+    """Crawl the site once through CrawlerBuilder and return the measurements."""
+    metrics = CrawlMetrics(buckets=LATENCY_BUCKETS)
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = f"{directory}/pages.jsonl"
+        builder = (
+            CrawlerBuilder(
+                domain_url=base_url, start_url=base_url, output_path=output_path
+            )
+            .with_max_pages(args.max_pages or args.pages)
+            .with_concurrency(args.concurrency)
+            .with_fetcher(HttpxFetcher(timeout=10, max_retries=2, backoff_base=0.05))
+            .with_output_writer(JsonlWriter(output_path))
+            .with_metrics(metrics)
+        )
+        if args.parser == "lxml":
+            builder = builder.with_html_parser(LxmlHtmlParser())
+        if args.parse_workers is not None:
+            builder = builder.with_process_pool(args.parse_workers)
+        if args.dedup:
+            builder = builder.with_duplicate_detector(SimHashDuplicateDetector())
+        if args.trap_detection:
+            builder = builder.with_trap_detector(TrapDetector())
+        if args.canonicalize_query:
+            builder = builder.with_query_canonicalizer(QueryCanonicalizer())
+        crawler = builder.build()
+        started = time.perf_counter()
+        async with crawler:
+            stats = await crawler.crawl()
+        seconds = time.perf_counter() - started
+
+    fetches = metrics.fetches.summary()
+    result: dict[str, Any] = {
+        "pages": stats.pages_written,
+        "fetches": sum(fetches.values()),
+        "errors": sum(count for key, count in fetches.items() if key != "status=200"),
+        "seconds": round(seconds, 3),
+        "pages_per_second": round(stats.pages_written / seconds, 1),
+        "peak_rss_mib": round(peak_rss_mib(), 1),
+    }
+    for stage in STAGES:
+        for q in (0.5, 0.99):
+            if stage == "fetch":
+                value = metrics.fetch_seconds.quantile(q, status=200)
+            else:
+                value = metrics.stage_seconds.quantile(q, stage=stage)
+            result[f"{stage}_p{round(q * 100)}_ms"] = (
+                None if value is None else round(value * 1e3, 3)
+            )
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    site = parser.add_argument_group("synthetic site")
+    site.add_argument("--pages", type=int, default=1_000)
+    site.add_argument("--fan-out", type=int, default=5)
+    site.add_argument("--page-kb", type=float, default=8.0, help="Mean text size.")
+    site.add_argument(
+        "--latency-ms", type=float, default=20.0, help="Median response latency."
+    )
+    site.add_argument(
+        "--latency-sigma",
+        type=float,
+        default=0.5,
+        help="Log-normal spread of the latency (0 = fixed).",
+    )
+    site.add_argument("--error-rate", type=float, default=0.02)
+    site.add_argument("--duplicate-rate", type=float, default=0.1)
+    site.add_argument("--trap-rate", type=float, default=0.0)
+    site.add_argument("--seed", type=int, default=7)
+    crawl = parser.add_argument_group("crawler")
+    crawl.add_argument("--max-pages", type=int, default=None, help="Default: --pages.")
+    crawl.add_argument("--concurrency", type=int, default=16)
+    crawl.add_argument("--parser", choices=["basic", "lxml"], default="basic")
+    crawl.add_argument("--parse-workers", type=int, default=None)
+    crawl.add_argument("--dedup", action="store_true")
+    crawl.add_argument("--trap-detection", action="store_true")
+    crawl.add_argument("--canonicalize-query", action="store_true")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--json", default=None, help="Write the results here.")
+    parser.add_argument(
+        "--baseline", default=None, help="Results JSON to compare pages/sec with."
+    )
+    parser.add_argument("--max-regression", type=float, default=0.1)
+    parser.add_argument(
+        "--log-level",
+        choices=[level.value for level in LoggingLevels],
+        default=LoggingLevels.error.value,
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    # Retried 503s are logged as warnings; keep them out of the table.
+    configure_logging(args.log_level)
+    options = site_options(args)
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(options, sender), daemon=True)
+    server.start()
+    try:
+        base_url = f"http://127.0.0.1:{receiver.recv()}/"
+        print(
+            f"site: {args.pages} pages, fan-out {args.fan_out}, ~{args.page_kb:g} KiB "
+            f"text/page, latency p50 {args.latency_ms:g} ms "
+            f"(sigma {args.latency_sigma:g}), {args.error_rate:.0%} errors, "
+            f"{args.duplicate_rate:.0%} duplicated, {args.trap_rate:.0%} traps"
+        )
+        columns = ["round", "pages", "fetches", "errors", "seconds", "pages/s"]
+        columns += [f"{stage} p50/p99 ms" for stage in STAGES] + ["peak RSS MiB"]
+        print("  ".join(columns))
+        rounds = []
+        for index in range(args.rounds):
+            result = asyncio.run(crawl_once(args, base_url))
+            rounds.append(result)
+            latencies = [
+                f"{result[f'{stage}_p50_ms'] or 0:.2f}/{result[f'{stage}_p99_ms'] or 0:.2f}"
+                for stage in STAGES
+            ]
+            row = [
+                f"{index + 1:>5}",
+                f"{result['pages']:>5}",
+                f"{result['fetches']:>7}",
+                f"{result['errors']:>6}",
+                f"{result['seconds']:>7.2f}",
+                f"{result['pages_per_second']:>7.1f}",
+                *(
+                    f"{cell:>{len(column)}}"
+                    for cell, column in zip(latencies, columns[6:10])
+                ),
+                f"{result['peak_rss_mib']:>12.1f}",
+            ]
+            print("  ".join(row))
+    finally:
+        server.terminate()
+        server.join()
+
+    best = max(result["pages_per_second"] for result in rounds)
+    report = {
+        "version": importlib.metadata.version("scraping-pipeline"),
+        "python": platform.python_version(),
+        "site": options,
+        "crawler": {
+            "max_pages": args.max_pages or args.pages,
+            "concurrency": args.concurrency,
+            "parser": args.parser,
+            "parse_workers": args.parse_workers,
+            "dedup": args.dedup,
+            "trap_detection": args.trap_detection,
+            "canonicalize_query": args.canonicalize_query,
+        },
+        "best_pages_per_second": best,
+        "rounds": rounds,
+    }
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.baseline is not None:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["site"] != options or baseline["crawler"] != report["crawler"]:
+            print("warning: baseline was measured with different settings")
+        previous = baseline["best_pages_per_second"]
+        change = best / previous - 1
+        print(
+            f"best {best:.1f} pages/s vs baseline {previous:.1f} "
+            f"({baseline['version']}): {change:+.1%}"
+        )
+        if change < -args.max_regression:
+            print(f"regression beyond {args.max_regression:.0%}: FAILED")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Text collected per fetch under a max_pages cap: BFS vs best-first frontier.
+
+The in-memory site mixes long articles with paginated category listings and
+an endless set of thin utility pages, the shape where BFS spends its budget
+on shallow listings. Each traversal crawls the same site with the same cap;
+the table reports the words stored and how many stored pages were articles.
+
+Usage:
+    uv run python benchmarks/traversal_yield_benchmark.py --pages 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from typing import Callable
+
+import httpx
+
+from scraper.crawler_builder import CrawlerBuilder
+from scraper.http.interface import HttpFetcher
+from scraper.models import PageObject
+from scraper.output.interface import OutputWriter
+from scraper.traversal.best_first_traversal import BestFirstTraversalStrategy
+from scraper.traversal.breadth_first_traversal import BreadthFirstTraversalStrategy
+from scraper.traversal.interface import TraversalStrategy
+
+BASE_URL = "https://bench.local/"
+CATEGORIES = 8
+LISTING_PAGES = 30
+ARTICLES_PER_LISTING = 6
+
+WORDS = (
+    "crawler frontier parser latency throughput index shard queue worker "
+    "budget host politeness template signal language corpus extraction"
+).split()
+
+
+def prose(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def render(path: str) -> str:
+    """Return the HTML of one page of the synthetic site."""
+    rng = random.Random(path)
+    parts = path.strip("/").split("/")
+    links: list[tuple[str, str]] = []
+    if parts == [""]:
+        body = prose(rng, 40)
+        links += [
+            (f"/category/{c}/page/1/", f"Category {c}") for c in range(CATEGORIES)
+        ]
+        links += [(f"/info/{i}/", "more") for i in range(6)]
+    elif parts[0] == "category":
+        category, page = int(parts[1]), int(parts[3])
+        body = prose(rng, 30)
+        first = (category * LISTING_PAGES + page) * ARTICLES_PER_LISTING
+        links += [
+            (f"/articles/story-{first + i}/", f"Read the story about {prose(rng, 3)}")
+            for i in range(ARTICLES_PER_LISTING)
+        ]
+        if page < LISTING_PAGES:
+            links += [(f"/category/{category}/page/{page + 1}/", "next")]
+            links += [(f"/category/{category}/page/{page + 2}/", str(page + 2))]
+    elif parts[0] == "articles":
+        body = prose(rng, 900)
+        story = int(parts[1].rsplit("-", 1)[1])
+        links += [(f"/articles/story-{story + 1}/", f"Related: {prose(rng, 4)}")]
+        links += [(f"/info/{rng.randint(0, 10_000)}/", "info")]
+    else:
+        body = prose(rng, 25)
+        links += [(f"/info/{rng.randint(0, 10_000)}/", "more") for _ in range(8)]
+    anchors = "".join(f'<a href="{href}">{text}</a> ' for href, text in links)
+    return (
+        f"<html><head><title>{path}</title></head>"
+        f"<body><p>{body}</p><nav>{anchors}</nav></body></html>"
+    )
+
+
+class SiteFetcher(HttpFetcher):
+    """Serve the synthetic site from memory and count requests."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests = 0
+
+    async def get(self, url: str) -> httpx.Response | None:
+        self.requests += 1
+        path = url[len(BASE_URL) - 1 :]
+        return httpx.Response(
+            200, content=render(path).encode(), request=httpx.Request("GET", url)
+        )
+
+
+class YieldWriter(OutputWriter):
+    """Discard records while totalling their words."""
+
+    def __init__(self) -> None:
+        self.pages = 0
+        self.words = 0
+        self.articles = 0
+
+    async def write(self, page_object: PageObject) -> None:
+        self.pages += 1
+        self.words += page_object.word_count or 0
+        self.articles += "/articles/" in page_object.url
+
+
+async def run_once(
+    factory: Callable[[], TraversalStrategy], pages: int
+) -> tuple[YieldWriter, int]:
+    writer, fetcher = YieldWriter(), SiteFetcher()
+    crawler = (
+        CrawlerBuilder(domain_url=BASE_URL, start_url=BASE_URL, output_path="unused")
+        .with_max_pages(pages)
+        .with_concurrency(1)
+        # Short stage queues so each pop sees the yields of recent pages.
+        .with_queue_size(1)
+        .with_traversal(factory())
+        .with_fetcher(fetcher)
+        .with_output_writer(writer)
+        .build()
+    )
+    async with crawler:
+        await crawler.crawl()
+    return writer, fetcher.requests
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--frontier-size", type=int, default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    strategies: dict[str, Callable[[], TraversalStrategy]] = {
+        "bfs": BreadthFirstTraversalStrategy,
+        "best-first": lambda: BestFirstTraversalStrategy(max_size=args.frontier_size),
+    }
+    baseline: float | None = None
+    print(
+        f"{'traversal':>10} {'fetches':>8} {'pages':>6} {'articles':>9} "
+        f"{'words':>9} {'words/fetch':>12} {'gain':>6}"
+    )
+    for name, factory in strategies.items():
+        writer, fetches = asyncio.run(run_once(factory, args.pages))
+        per_fetch = writer.words / fetches
+        baseline = baseline or per_fetch
+        print(
+            f"{name:>10} {fetches:>8} {writer.pages:>6} {writer.articles:>9} "
+            f"{writer.words:>9} {per_fetch:>12.1f} {per_fetch / baseline:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Link normalization throughput: clean_and_normalize_link() vs UrlNormalizer.
+
+Pages of a synthetic site carry a shared navigation block (root-relative and
+absolute links), page-specific relative links, fragments, queries, default
+ports, mixed-case hosts, external links and mailto:/javascript: links. Each
+variant normalizes every link of every page. Results are checked against
+clean_and_normalize_link() before timing.
+
+Usage:
+    uv run python benchmarks/url_normalization_benchmark.py --pages 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable
+
+from scraper.utils.urls import UrlNormalizer, clean_and_normalize_link
+
+DOMAIN_ROOT = "https://www.example.com/"
+
+
+def synthetic_site(pages: int, seed: int) -> list[tuple[str, list[str]]]:
+    """Return (page url, hrefs) pairs resembling a crawled site."""
+    rng = random.Random(seed)
+    nav = [f"/section/{i}/" for i in range(30)] + [
+        "/",
+        "/about",
+        "/contact/",
+        "/login",
+        "/tag/news/",
+        "https://www.example.com/blog",
+        "https://WWW.Example.com:443/shop/",
+        "https://twitter.com/example",
+        "mailto:hello@example.com",
+        "javascript:void(0)",
+        "#top",
+    ]
+    site = []
+    for page_id in range(pages):
+        section = page_id % 30
+        base = f"https://www.example.com/section/{section}/article-{page_id}/"
+        own = [
+            f"../article-{rng.randint(0, pages)}/",
+            f"related-{rng.randint(0, 50)}",
+            f"?page={rng.randint(1, 5)}",
+            f"/section/{section}/article-{rng.randint(0, pages)}/#comments",
+            f"https://www.example.com/section/{section}/file-{page_id}.pdf",
+            f"http://www.example.com:80/old/{page_id}",
+            "",
+            "  /about  ",
+        ]
+        hrefs = nav + own
+        rng.shuffle(hrefs)
+        site.append((base, hrefs))
+    return site
+
+
+def baseline(site: list[tuple[str, list[str]]]) -> list[list[str]]:
+    """Normalize with the per-link helper, as the crawler used to."""
+    results = []
+    for base, hrefs in site:
+        urls = []
+        for href in hrefs:
+            url = clean_and_normalize_link(
+                href=href, base_url=base, domain_root=DOMAIN_ROOT
+            )
+            if url is not None:
+                urls.append(url)
+        results.append(urls)
+    return results
+
+
+def per_link(site: list[tuple[str, list[str]]]) -> list[list[str]]:
+    """Normalize link by link through a fresh UrlNormalizer."""
+    normalizer = UrlNormalizer(DOMAIN_ROOT)
+    results = []
+    for base, hrefs in site:
+        urls = []
+        for href in hrefs:
+            url = normalizer.normalize(href, base)
+            if url is not None:
+                urls.append(url)
+        results.append(urls)
+    return results
+
+
+def batch(site: list[tuple[str, list[str]]]) -> list[list[str]]:
+    """Normalize each page's links with one normalize_links() call."""
+    normalizer = UrlNormalizer(DOMAIN_ROOT)
+    return [normalizer.normalize_links(hrefs, base) for base, hrefs in site]
+
+
+def distinct(urls: list[str]) -> list[str]:
+    return list(dict.fromkeys(urls))
+
+
+def measure(
+    variant: Callable[[list[tuple[str, list[str]]]], list[list[str]]],
+    site: list[tuple[str, list[str]]],
+    rounds: int,
+) -> float:
+    """Return the best links/sec over several rounds."""
+    links = sum(len(hrefs) for _, hrefs in site)
+    best = 0.0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        variant(site)
+        best = max(best, links / (time.perf_counter() - started))
+    return best
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=11)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    site = synthetic_site(args.pages, args.seed)
+    print(f"site: {len(site)} pages, {sum(len(h) for _, h in site)} links")
+
+    expected = baseline(site)
+    parity = per_link(site) == expected and batch(site) == [
+        distinct(urls) for urls in expected
+    ]
+    print(f"parity with clean_and_normalize_link: {'ok' if parity else 'FAILED'}")
+
+    normalizer = UrlNormalizer(DOMAIN_ROOT)
+    for base, hrefs in site:
+        normalizer.normalize_links(hrefs, base)
+    info = normalizer.cache_info()
+    print(f"memo: {info.hits} hits, {info.misses} misses, {info.currsize} entries")
+
+    variants = {
+        "clean_and_normalize_link": baseline,
+        "UrlNormalizer.normalize": per_link,
+        "UrlNormalizer.normalize_links": batch,
+    }
+    base_rate: float | None = None
+    print(f"{'variant':>30} {'links/s':>12} {'speedup':>8}")
+    for name, variant in variants.items():
+        rate = measure(variant, site, args.rounds)
+        base_rate = base_rate or rate
+        print(f"{name:>30} {rate:>12,.0f} {rate / base_rate:>7.1f}x")
+    if not parity:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
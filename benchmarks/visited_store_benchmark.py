@@ -0,0 +1,107 @@
+"""
+Memory and throughput of the visited-URL stores at crawl scale.
+
+Each store is filled with N synthetic URLs shaped like real crawl targets,
+then probed with N/10 hits and N/10 misses. Memory is the traced allocation
+growth while filling (tracemalloc, measured in a separate pass so it does not
+distort timings).
+
+Usage:
+    uv run python benchmarks/visited_store_benchmark.py --urls 1000000 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+from scraper.visited.bloom_visited_store import BloomFilterVisitedStore
+from scraper.visited.hashed_visited_store import HashedVisitedStore
+from scraper.visited.interface import VisitedStore
+from scraper.visited.set_visited_store import SetVisitedStore
+
+
+def synthetic_urls(count: int, offset: int = 0) -> Iterator[str]:
+    """Yield distinct URLs resembling a large site's link graph."""
+    for i in range(offset, offset + count):
+        yield f"https://www.example.com/category-{i % 997}/articles/{i}/?page={i % 13}"
+
+
+def store_factories(count: int) -> dict[str, Callable[[], VisitedStore]]:
+    return {
+        "set": SetVisitedStore,
+        "hashed": HashedVisitedStore,
+        "bloom@1%": lambda: BloomFilterVisitedStore(count, 0.01),
+        "bloom@0.1%": lambda: BloomFilterVisitedStore(count, 0.001),
+    }
+
+
+def measure_memory(factory: Callable[[], VisitedStore], count: int) -> int:
+    """Return bytes retained by a store after adding count URLs."""
+    gc.collect()
+    tracemalloc.start()
+    store = factory()
+    for url in synthetic_urls(count):
+        store.add(url)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return current
+
+
+def measure_speed(
+    factory: Callable[[], VisitedStore], count: int
+) -> tuple[float, float, float]:
+    """Return (adds/s, lookups/s, observed false-positive rate)."""
+    urls = list(synthetic_urls(count))
+    probes = count // 10
+    misses = list(synthetic_urls(probes, offset=count))
+    store = factory()
+
+    started = time.perf_counter()
+    for url in urls:
+        store.add(url)
+    add_rate = count / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    hits = sum(1 for url in urls[:probes] if url in store)
+    false_positives = sum(1 for url in misses if url in store)
+    lookup_rate = 2 * probes / (time.perf_counter() - started)
+    # Every store must find what was added; only false positives are allowed.
+    assert hits == probes
+    return add_rate, lookup_rate, false_positives / probes
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--urls", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--stores", nargs="+", default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    print(
+        f"{'urls':>10} {'store':>11} {'MiB':>8} {'B/url':>6} "
+        f"{'adds/s':>10} {'lookups/s':>10} {'fp rate':>8}"
+    )
+    for count in args.urls:
+        for name, factory in store_factories(count).items():
+            if args.stores and name not in args.stores:
+                continue
+            memory = measure_memory(factory, count)
+            add_rate, lookup_rate, fp_rate = measure_speed(factory, count)
+            print(
+                f"{count:>10} {name:>11} {memory / 2**20:>8.1f} "
+                f"{memory / count:>6.1f} {add_rate:>10,.0f} {lookup_rate:>10,.0f} "
+                f"{fp_rate:>8.4%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
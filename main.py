@@ -1,12 +1,44 @@
 import argparse
 import asyncio
+import contextlib
+import json
+import logging
+import signal
+import sys
 
 from scraper.crawler_builder import CrawlerBuilder
+from scraper.dedup.interface import DuplicateMode
+from scraper.dedup.simhash_detector import SimHashDuplicateDetector
+from scraper.http.adaptive_throttle import AimdThrottle
+from scraper.http.caching_fetcher import CachingFetcher
+from scraper.http.host_rate_limiter import HostRateLimiter
 from scraper.http.httpx_fetcher import HttpxFetcher
+from scraper.http.interface import HttpFetcher
+from scraper.metrics.crawl_metrics import CrawlMetrics
+from scraper.metrics.http_server import MetricsServer
+from scraper.metrics.stage_profiler import StageProfiler
+from scraper.output.buffered_jsonl_writer import BufferedJsonlWriter, FsyncPolicy
+from scraper.output.interface import OutputWriter
 from scraper.output.jsonl_writer import JsonlWriter
+from scraper.output.parquet_writer import ParquetWriter
+from scraper.output.sharded_writer import Compression, ShardedJsonlWriter
 from scraper.parsers.basic_html_parser import BasicHtmlParser
+from scraper.parsers.interface import HtmlParser
+from scraper.parsers.lxml_html_parser import LxmlHtmlParser
 from scraper.text_processing.basic_text_processor import BasicTextProcessor
+from scraper.text_processing.language_detector import LanguageDetector
+from scraper.text_processing.signal_registry import default_registry
+from scraper.traversal.best_first_traversal import BestFirstTraversalStrategy
+from scraper.traversal.sqlite_traversal import SqliteTraversalStrategy
+from scraper.traversal.trap_detector import TrapDetector
 from scraper.utils.logging_config import LoggingLevels, configure_logging
+from scraper.utils.urls import DEFAULT_STRIPPED_PARAMS, QueryCanonicalizer
+from scraper.visited.bloom_visited_store import BloomFilterVisitedStore
+from scraper.visited.hashed_visited_store import HashedVisitedStore
+from scraper.visited.interface import VisitedStore
+from scraper.visited.set_visited_store import SetVisitedStore
+
+logger = logging.getLogger(__name__)
 
 
 def parse_args() -> argparse.Namespace:
@@ -20,7 +52,43 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--outputpath",
         required=True,
-        help="Destination path for the JSONL output file.",
+        help=(
+            "Destination path for the JSONL output file "
+            "(a directory with --output-format sharded or parquet)."
+        ),
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["jsonl", "sharded", "parquet"],
+        default="jsonl",
+        help=(
+            "Single JSONL file, rotating compressed JSONL shards or Parquet "
+            "part files (default: jsonl)."
+        ),
+    )
+    parser.add_argument(
+        "--compression",
+        choices=[codec.value for codec in Compression],
+        default=Compression.gzip.value,
+        help="Codec for --output-format sharded (default: gzip).",
+    )
+    parser.add_argument(
+        "--shard-records",
+        type=int,
+        default=100_000,
+        help="Rotate shards after this many records (default: 100000).",
+    )
+    parser.add_argument(
+        "--shard-mb",
+        type=int,
+        default=256,
+        help="Rotate shards after this many uncompressed MiB (default: 256).",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=10_000,
+        help="Rows per Parquet row group for --output-format parquet (default: 10000).",
     )
     parser.add_argument(
         "--max-depth",
@@ -34,13 +102,416 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional maximum number of pages to persist; omit for no limit.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=5,
+        help="Number of tasks fetching pages concurrently (default: 5).",
+    )
+    parser.add_argument(
+        "--process-concurrency",
+        type=int,
+        default=None,
+        help=(
+            "Tasks parsing pages and generating signals (default: same as "
+            "--concurrency)."
+        ),
+    )
+    parser.add_argument(
+        "--write-concurrency",
+        type=int,
+        default=1,
+        help=(
+            "Tasks writing pages; above 1 only for writers that serialize "
+            "their own writes (sharded, parquet, buffered) (default: 1)."
+        ),
+    )
+    parser.add_argument(
+        "--stage-queue-size",
+        type=int,
+        default=None,
+        help=(
+            "Capacity of the queues between crawl stages (default: 32, or "
+            "--concurrency with --traversal best-first so fetches follow "
+            "fresh scores)."
+        ),
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=2.0,
+        help="Sustained request rate allowed per host (default: 2.0).",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=1,
+        help="Requests a host may receive back-to-back before pacing (default: 1).",
+    )
+    parser.add_argument(
+        "--max-in-flight-per-host",
+        type=int,
+        default=None,
+        help="Cap on concurrent requests per host; omit for no cap.",
+    )
+    parser.add_argument(
+        "--adaptive-throttle",
+        action="store_true",
+        help=(
+            "Adapt each host's rate (AIMD) to latency, errors, 429/503 and "
+            "Retry-After, starting from --requests-per-second."
+        ),
+    )
+    parser.add_argument(
+        "--max-requests-per-second",
+        type=float,
+        default=20.0,
+        help="Ceiling for the adaptive per-host rate (default: 20.0).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for the on-disk HTTP cache; omit to disable caching.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=512,
+        help="Size bound for cached response bodies in MiB (default: 512).",
+    )
+    parser.add_argument(
+        "--state-path",
+        default=None,
+        help=(
+            "SQLite file for the persistent frontier and checkpoints "
+            "(default with --resume: <outputpath>.state.sqlite)."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue a previous crawl from its checkpoint, appending output.",
+    )
+    parser.add_argument(
+        "--visited-store",
+        choices=["set", "hashed", "bloom"],
+        default="set",
+        help=(
+            "How discovered URLs are remembered: full strings, 64-bit hashes, "
+            "or a Bloom filter (default: set)."
+        ),
+    )
+    parser.add_argument(
+        "--bloom-capacity",
+        type=int,
+        default=10_000_000,
+        help="Expected URL count for --visited-store bloom (default: 10M).",
+    )
+    parser.add_argument(
+        "--bloom-fp-rate",
+        type=float,
+        default=0.001,
+        help="Target false-positive rate for --visited-store bloom.",
+    )
+    parser.add_argument(
+        "--buffered-output",
+        action="store_true",
+        help="Batch output records in memory and write them from a background task.",
+    )
+    parser.add_argument(
+        "--fsync",
+        choices=[policy.value for policy in FsyncPolicy],
+        default=FsyncPolicy.none.value,
+        help="Durability for --buffered-output: fsync each batch or not (default: none).",
+    )
+    parser.add_argument(
+        "--canonicalize-query",
+        action="store_true",
+        help=(
+            "Sort query parameters and drop empty, tracking (utm_*, gclid, ...) "
+            "and session-id parameters before deduplicating URLs."
+        ),
+    )
+    parser.add_argument(
+        "--strip-param",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Extra query parameter to drop (wildcards allowed); repeatable.",
+    )
+    parser.add_argument(
+        "--allow-params",
+        action="append",
+        default=[],
+        metavar="HOST=NAME,...",
+        help="Keep only these query parameters on HOST; repeatable.",
+    )
+    parser.add_argument(
+        "--ignore-canonical",
+        action="store_true",
+        help='Do not use <link rel="canonical"> to drop duplicate pages.',
+    )
+    parser.add_argument(
+        "--traversal",
+        choices=["bfs", "best-first"],
+        default="bfs",
+        help=(
+            "Frontier order: breadth-first, or best-first by expected text "
+            "yield (default: bfs)."
+        ),
+    )
+    parser.add_argument(
+        "--frontier-size",
+        type=int,
+        default=None,
+        help="Bound the best-first frontier, evicting its lowest-scoring URLs.",
+    )
+    parser.add_argument(
+        "--trap-detection",
+        action="store_true",
+        help=(
+            "Refuse trap-like URLs (repetitive paths, exploding query "
+            "permutations) and cap how many URLs each URL template may queue."
+        ),
+    )
+    parser.add_argument(
+        "--template-budget",
+        type=int,
+        default=1_000,
+        help="URLs queued per URL template with --trap-detection (default: 1000).",
+    )
+    parser.add_argument(
+        "--max-query-variants",
+        type=int,
+        default=32,
+        help=(
+            "Distinct query parameter sets per path template with "
+            "--trap-detection (default: 32)."
+        ),
+    )
+    parser.add_argument(
+        "--dedup",
+        choices=["off"] + [mode.value for mode in DuplicateMode],
+        default="off",
+        help=(
+            "Detect exact and near-duplicate page text and skip or mark the "
+            "duplicates (default: off)."
+        ),
+    )
+    parser.add_argument(
+        "--near-dup-bits",
+        type=int,
+        default=3,
+        help="Max differing SimHash bits for a near duplicate (default: 3).",
+    )
+    parser.add_argument(
+        "--dedup-max-pages",
+        type=int,
+        default=1_000_000,
+        help="Page signatures kept for deduplication (default: 1M).",
+    )
+    parser.add_argument(
+        "--skip-duplicate-links",
+        action="store_true",
+        help="Do not follow links found on duplicate pages.",
+    )
+    parser.add_argument(
+        "--signals",
+        default="all",
+        metavar="NAME,...",
+        help=(
+            "Signals to compute per page: names from "
+            f"{', '.join(default_registry().names())}, a cost level (cheap, "
+            "moderate) or all (default: all). Unselected signals are null."
+        ),
+    )
+    parser.add_argument(
+        "--languages",
+        default=None,
+        metavar="CODE,...",
+        help=(
+            "Restrict language detection to these langdetect profiles "
+            "(e.g. en,de,fr); omit to load all 55."
+        ),
+    )
+    parser.add_argument(
+        "--language-sample-chars",
+        type=int,
+        default=0,
+        help=(
+            "Examine only this many characters of each page in language "
+            "detection, drawn from its start, middle and end, e.g. 1000 "
+            "(default: 0, the whole text)."
+        ),
+    )
+    parser.add_argument(
+        "--language-seed",
+        type=int,
+        default=0,
+        help="Seed for langdetect's randomized trials (default: 0).",
+    )
+    parser.add_argument(
+        "--language-prior",
+        type=float,
+        default=None,
+        metavar="CONFIDENCE",
+        help=(
+            "Skip detection on a host once this share of its detected pages "
+            "(e.g. 0.95) has one language; every 10th page is still checked."
+        ),
+    )
+    parser.add_argument(
+        "--parser",
+        choices=["basic", "lxml"],
+        default="basic",
+        help=(
+            "HTML parser backend: BeautifulSoup with html.parser, or the "
+            "single-pass lxml parser (default: basic)."
+        ),
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help=(
+            "Parse and process pages in this many worker processes "
+            "(0 = one per core); omit to parse on the event loop."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help=(
+            "Serve crawl metrics on http://127.0.0.1:PORT/metrics "
+            "(Prometheus text format) while crawling."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-json",
+        default=None,
+        metavar="PATH",
+        help="Write a JSON summary of the crawl metrics here when the run ends.",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["cpu", "memory", "all"],
+        default=None,
+        help=(
+            "Profile the process_page, get_signals and write stages with "
+            "cProfile (cpu), tracemalloc (memory) or both, and report the top "
+            "functions and allocation sites per stage at the end."
+        ),
+    )
+    parser.add_argument(
+        "--profile-sample-rate",
+        type=float,
+        default=1.0,
+        help=(
+            "Share of stage calls profiled; e.g. 0.05 keeps the overhead low "
+            "enough for production crawls (default: 1.0)."
+        ),
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="Functions and allocation sites listed per stage (default: 20).",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default=None,
+        metavar="PATH",
+        help="Write the profile report here instead of standard error.",
+    )
     parser.add_argument(
         "--log-level",
         choices=[level.value for level in LoggingLevels],
         default=LoggingLevels.info.value,
         help="Logging verbosity (default: INFO).",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.buffered_output and args.output_format != "jsonl":
+        parser.error("--buffered-output only applies to --output-format jsonl")
+    return args
+
+
+def build_visited_store(args: argparse.Namespace) -> VisitedStore:
+    """Create the visited-URL store selected on the command line."""
+    if args.visited_store == "hashed":
+        return HashedVisitedStore()
+    if args.visited_store == "bloom":
+        return BloomFilterVisitedStore(
+            capacity=args.bloom_capacity, false_positive_rate=args.bloom_fp_rate
+        )
+    return SetVisitedStore()
+
+
+def build_query_canonicalizer(args: argparse.Namespace) -> QueryCanonicalizer | None:
+    """Create the query canonicalizer configured on the command line."""
+    if not (args.canonicalize_query or args.strip_param or args.allow_params):
+        return None
+    allowed_params: dict[str, list[str]] = {}
+    for spec in args.allow_params:
+        host, separator, names = spec.partition("=")
+        if not separator or not host:
+            raise SystemExit(f"--allow-params expects HOST=NAME,..., got {spec!r}")
+        allowed_params[host] = [name for name in names.split(",") if name]
+    return QueryCanonicalizer(
+        strip_params=DEFAULT_STRIPPED_PARAMS + tuple(args.strip_param),
+        allowed_params=allowed_params,
+    )
+
+
+def build_text_processor(args: argparse.Namespace) -> BasicTextProcessor:
+    """Create the text processor computing the signals selected on the command line."""
+    signals = [name.strip() for name in args.signals.split(",") if name.strip()]
+    if args.traversal == "best-first":
+        # Best-first scores templates by the word_count of their pages.
+        signals.append("word_count")
+    try:
+        language_detector = LanguageDetector(
+            languages=args.languages.split(",") if args.languages else None,
+            sample_chars=args.language_sample_chars or None,
+            seed=args.language_seed,
+            prior_confidence=args.language_prior,
+        )
+    except ValueError as e:
+        raise SystemExit(f"--languages/--language-prior: {e}") from e
+    try:
+        return BasicTextProcessor(
+            registry=default_registry(language_detector), signals=signals
+        )
+    except ValueError as e:
+        raise SystemExit(f"--signals: {e}") from e
+
+
+def build_html_parser(args: argparse.Namespace) -> HtmlParser:
+    """Create the HTML parser backend selected on the command line."""
+    if args.parser == "lxml":
+        return LxmlHtmlParser()
+    return BasicHtmlParser()
+
+
+def build_output_writer(args: argparse.Namespace) -> OutputWriter:
+    """Create the output writer selected on the command line."""
+    if args.output_format == "sharded":
+        return ShardedJsonlWriter(
+            args.outputpath,
+            compression=Compression(args.compression),
+            max_records=args.shard_records,
+            max_bytes=args.shard_mb * 1024 * 1024,
+            append=args.resume,
+        )
+    if args.output_format == "parquet":
+        return ParquetWriter(
+            args.outputpath, row_group_size=args.row_group_size, append=args.resume
+        )
+    if args.buffered_output:
+        return BufferedJsonlWriter(
+            args.outputpath, append=args.resume, fsync=FsyncPolicy(args.fsync)
+        )
+    return JsonlWriter(args.outputpath, append=args.resume)
 
 
 async def run_crawler(args: argparse.Namespace) -> None:
@@ -54,19 +525,144 @@ async def run_crawler(args: argparse.Namespace) -> None:
         builder = builder.with_max_depth(args.max_depth)
     if args.max_pages is not None:
         builder = builder.with_max_pages(args.max_pages)
+    builder = builder.with_concurrency(args.concurrency)
+    builder = builder.with_stage_concurrency(
+        process=args.process_concurrency, write=args.write_concurrency
+    )
+    queue_size = args.stage_queue_size
+    if queue_size is None:
+        queue_size = args.concurrency if args.traversal == "best-first" else 32
+    builder = builder.with_queue_size(queue_size)
+    builder = builder.with_visited_store(build_visited_store(args))
+    builder = builder.with_query_canonicalizer(build_query_canonicalizer(args))
+    builder = builder.with_canonical_links(not args.ignore_canonical)
+    if args.dedup != "off":
+        builder = builder.with_duplicate_detector(
+            SimHashDuplicateDetector(
+                max_entries=args.dedup_max_pages, max_distance=args.near_dup_bits
+            ),
+            mode=DuplicateMode(args.dedup),
+            expand_links=not args.skip_duplicate_links,
+        )
+    if args.trap_detection:
+        builder = builder.with_trap_detector(
+            TrapDetector(
+                max_urls_per_template=args.template_budget,
+                max_query_variants=args.max_query_variants,
+            )
+        )
+    if args.parse_workers is not None:
+        builder = builder.with_process_pool(args.parse_workers)
+    state_path = args.state_path
+    if state_path is None and args.resume:
+        state_path = f"{args.outputpath.rstrip('/')}.state.sqlite"
+    if state_path is not None:
+        if args.traversal != "bfs":
+            raise SystemExit("--state-path and --resume need --traversal bfs")
+        builder = builder.with_traversal(
+            SqliteTraversalStrategy(state_path, resume=args.resume)
+        )
+    elif args.traversal == "best-first":
+        builder = builder.with_traversal(
+            BestFirstTraversalStrategy(max_size=args.frontier_size)
+        )
 
-    crawler = (
-        builder.with_fetcher(
-            HttpxFetcher(timeout=3, min_request_interval=0.5, max_retries=2)
+    rate_limiter = HostRateLimiter(
+        rate=args.requests_per_second,
+        burst=args.burst,
+        max_in_flight=args.max_in_flight_per_host,
+    )
+    throttle: AimdThrottle | None = None
+    if args.adaptive_throttle:
+        throttle = AimdThrottle(
+            rate_limiter,
+            min_rate=min(args.requests_per_second, 0.2),
+            max_rate=args.max_requests_per_second,
+        )
+
+    fetcher: HttpFetcher = HttpxFetcher(
+        timeout=3,
+        max_retries=2,
+        rate_limiter=rate_limiter,
+        throttle=throttle,
+    )
+    if args.cache_dir is not None:
+        fetcher = CachingFetcher(
+            fetcher,
+            cache_dir=args.cache_dir,
+            max_bytes=args.cache_max_mb * 1024 * 1024,
         )
-        .with_html_parser(BasicHtmlParser())
-        .with_text_processor(BasicTextProcessor())
-        .with_output_writer(JsonlWriter(args.outputpath))
+
+    metrics: CrawlMetrics | None = None
+    if args.metrics_port is not None or args.metrics_json is not None:
+        metrics = CrawlMetrics()
+        builder = builder.with_metrics(metrics)
+
+    profiler: StageProfiler | None = None
+    if args.profile is not None:
+        try:
+            profiler = StageProfiler(
+                sample_rate=args.profile_sample_rate,
+                cpu=args.profile in ("cpu", "all"),
+                memory=args.profile in ("memory", "all"),
+            )
+        except ValueError as e:
+            raise SystemExit(f"--profile-sample-rate: {e}") from e
+        builder = builder.with_profiler(profiler)
+
+    crawler = (
+        builder.with_fetcher(fetcher)
+        .with_html_parser(build_html_parser(args))
+        .with_text_processor(build_text_processor(args))
+        .with_output_writer(build_output_writer(args))
         .build()
     )
 
-    async with crawler:
-        await crawler.crawl()
+    loop = asyncio.get_running_loop()
+
+    def stop_on_sigint() -> None:
+        # First Ctrl-C drains and checkpoints; a second one interrupts hard.
+        loop.remove_signal_handler(signal.SIGINT)
+        crawler.request_stop()
+
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            if metrics is not None and args.metrics_port is not None:
+                await stack.enter_async_context(
+                    MetricsServer(metrics.registry, args.metrics_port)
+                )
+            async with crawler:
+                loop.add_signal_handler(signal.SIGINT, stop_on_sigint)
+                try:
+                    await crawler.crawl()
+                finally:
+                    loop.remove_signal_handler(signal.SIGINT)
+    finally:
+        if metrics is not None and args.metrics_json is not None:
+            write_metrics_summary(metrics, args.metrics_json)
+        if profiler is not None:
+            write_profile_report(profiler, args.profile_top, args.profile_output)
+
+
+def write_metrics_summary(metrics: CrawlMetrics, path: str) -> None:
+    """Dump the final metric values as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metrics.registry.summary(), f, indent=2)
+        f.write("\n")
+    logger.info("Wrote metrics summary to %s", path)
+    return None
+
+
+def write_profile_report(profiler: StageProfiler, top: int, path: str | None) -> None:
+    """Write the per-stage profile report to a file or standard error."""
+    report = profiler.report(top)
+    if path is None:
+        sys.stderr.write(report)
+        return None
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(report)
+    logger.info("Wrote profile report to %s", path)
+    return None
 
 
 def main() -> None:
@@ -1,25 +1,80 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
 import logging
-from typing import Any
+import time
+from typing import Any, NamedTuple
 
+import httpx
+
+from scraper.dedup.interface import (
+    DuplicateDetector,
+    DuplicateKind,
+    DuplicateMode,
+)
+from scraper.execution.inline_executor import InlinePageExecutor
+from scraper.execution.interface import PageExecutor
+from scraper.http.errors import RetryableFetchError
 from scraper.http.interface import HttpFetcher
-from scraper.models import PageObject
+from scraper.metrics.crawl_metrics import CrawlMetrics
+from scraper.metrics.stage_profiler import StageProfiler
+from scraper.models import CrawlStats, PageObject
 from scraper.output.interface import OutputWriter
 from scraper.parsers.interface import HtmlParser
 from scraper.text_processing.interface import TextProcessor
-from scraper.traversal.interface import TraversalStrategy
+from scraper.traversal.interface import (
+    FrontierEntry,
+    ResumableTraversalStrategy,
+    TraversalStrategy,
+)
+from scraper.traversal.trap_detector import TrapDetector
 from scraper.utils.urls import (
-    clean_and_normalize_link,
+    QueryCanonicalizer,
+    UrlNormalizer,
     extract_domain_root,
     is_same_domain,
     normalize_url,
 )
+from scraper.visited.interface import VisitedStore
+from scraper.visited.set_visited_store import SetVisitedStore
 
 logger = logging.getLogger(__name__)
 
 
+class _Fetched(NamedTuple):
+    """A fetched URL waiting for the process stage."""
+
+    entry: FrontierEntry
+    response: httpx.Response
+
+
+class _Processed(NamedTuple):
+    """A processed page waiting for the write stage."""
+
+    entry: FrontierEntry
+    page_object: PageObject
+
+
 class Crawler:
+    """
+    Crawls one domain as a pipeline of fetch, process and write stages.
+
+    ``concurrency`` fetch tasks pull URLs from the frontier and hand responses
+    to ``process_concurrency`` process tasks through a bounded queue. Those
+    parse the page and derive its signals (through the page executor),
+    resolve canonical links and duplicates, and queue the page's links. Pages
+    to store go through a second bounded queue to ``write_concurrency``
+    write tasks. A full queue blocks the stage feeding it, so a slow writer
+    slows fetching instead of buffering pages without bound. queue_depths()
+    reports how much work waits in front of each stage.
+
+    When ``max_pages`` is reached or a stop is requested, fetching stops
+    and the queues drain: queued pages are processed and written while the
+    budget allows and discarded otherwise.
+    """
+
     def __init__(
         self,
         domain_url: str,
@@ -31,30 +86,102 @@ class Crawler:
         output_writer: OutputWriter,
         max_pages: int | None,
         max_depth: int | None,
+        concurrency: int = 1,
+        process_concurrency: int | None = None,
+        write_concurrency: int = 1,
+        queue_size: int = 32,
+        page_executor: PageExecutor | None = None,
+        checkpoint_interval: int = 100,
+        visited_store: VisitedStore | None = None,
+        query_canonicalizer: QueryCanonicalizer | None = None,
+        honor_canonical: bool = True,
+        trap_detector: TrapDetector | None = None,
+        duplicate_detector: DuplicateDetector | None = None,
+        duplicate_mode: DuplicateMode = DuplicateMode.skip,
+        expand_duplicate_links: bool = True,
+        metrics: CrawlMetrics | None = None,
+        profiler: StageProfiler | None = None,
     ) -> None:
         """Wire together crawler dependencies and crawl limits."""
         self.domain_url = extract_domain_root(domain_url)
-        self.start_url = normalize_url(start_url)
+        self._url_normalizer = UrlNormalizer(
+            self.domain_url, query_canonicalizer=query_canonicalizer
+        )
+        self.start_url = self._url_normalizer.canonicalize_query(
+            normalize_url(start_url)
+        )
         if not is_same_domain(self.start_url, self.domain_url):
             raise ValueError("start_url must belong to domain_url")
+        self._honor_canonical = honor_canonical
+        self._trap_detector = trap_detector
+        self._duplicate_detector = duplicate_detector
+        self._duplicate_mode = duplicate_mode
+        self._expand_duplicate_links = expand_duplicate_links
 
         self._traverser = traverser
         self._http_fetcher = http_fetcher
         self._html_parser = html_parser
         self._text_processor = text_processor
         self._output_writer = output_writer
+        self._profiler = profiler
+        self._page_executor = page_executor or InlinePageExecutor(
+            html_parser, text_processor, profiler
+        )
 
         self._max_pages = max_pages
         self._max_depth = max_depth
+        if process_concurrency is None:
+            process_concurrency = concurrency
+        if min(concurrency, process_concurrency, write_concurrency, queue_size) < 1:
+            raise ValueError("stage concurrency and queue_size must be at least 1")
+        self._concurrency = concurrency
+        self._process_concurrency = process_concurrency
+        self._write_concurrency = write_concurrency
+        self._queue_size = queue_size
+        self._checkpoint_interval = max(1, checkpoint_interval)
+        if self._checkpoint_interval < output_writer.min_flush_interval:
+            logger.info(
+                "Raising the checkpoint interval from %s to %s URLs for %s",
+                self._checkpoint_interval,
+                output_writer.min_flush_interval,
+                type(output_writer).__name__,
+            )
+            self._checkpoint_interval = output_writer.min_flush_interval
 
-        self._seen: set[str] = set()
+        # Stores define __len__, so an empty one is falsy; compare with None.
+        self._seen: VisitedStore = (
+            visited_store if visited_store is not None else SetVisitedStore()
+        )
+        self._stats = CrawlStats()
+        self._metrics = metrics
+        if metrics is not None:
+            metrics.watch(
+                frontier_size=lambda: self._traverser.size(),
+                seen_size=lambda: len(self._seen),
+                queue_depths=self.queue_depths,
+            )
+        # URLs taken from the frontier whose last stage has not finished.
+        self._in_flight: int = 0
+        self._fetching: int = 0
+        self._process_queue: asyncio.Queue[_Fetched | None] | None = None
+        self._write_queue: asyncio.Queue[_Processed | None] | None = None
+        # (due time, tie-breaker, entry, attempt) for fetches waiting on backoff.
+        self._retry_heap: list[tuple[float, int, FrontierEntry, int]] = []
+        self._retry_sequence = itertools.count()
+        self._work_changed: asyncio.Condition | None = None
+        self._stop_requested = False
+        self._pages_completed = 0
+        self._urls_since_checkpoint = 0
         self._cleanup_stack: list[tuple[str, Any]] = []
         return None
 
     async def __aenter__(self) -> "Crawler":
         """Enter async contexts for managed components."""
         self._cleanup_stack = []
+        # Entered first so it is closed last, after the writer has flushed.
+        await self._enter_component("_traverser")
         await self._enter_component("_http_fetcher")
+        await self._enter_component("_page_executor")
         await self._enter_component("_output_writer")
         logger.info(
             "Crawler ready for domain %s (start: %s)", self.domain_url, self.start_url
@@ -106,72 +233,529 @@ class Crawler:
         logger.info("Crawler resources closed")
         return None
 
-    async def crawl(self) -> None:
-        """Traverse URLs, fetch pages, and persist processed results."""
+    async def crawl(self) -> CrawlStats:
+        """Traverse URLs with a pool of workers and persist processed results."""
         self._seen.clear()
-        pages_written = 0
+        self._stats = CrawlStats()
+        self._in_flight = 0
+        self._fetching = 0
+        self._process_queue = asyncio.Queue(self._queue_size)
+        self._write_queue = asyncio.Queue(self._queue_size)
+        self._retry_heap = []
+        self._work_changed = asyncio.Condition()
+        self._stop_requested = False
+        self._pages_completed = 0
+        self._urls_since_checkpoint = 0
+        if self._trap_detector is not None:
+            self._trap_detector.reset()
+        if self._duplicate_detector is not None:
+            self._duplicate_detector.clear()
 
         start_url = self.start_url
-        self._seen.add(start_url)
-        depth_by_url: dict[str, int] = {start_url: 0}
-        self._traverser.push(start_url)
-        logger.info("Starting crawl at %s", start_url)
-
-        while not self._traverser.is_empty():
-            if self._max_pages is not None and pages_written >= self._max_pages:
-                logger.info("Stopping crawl after reaching max_pages=%s", self._max_pages)
-                break
-
-            current_url = self._traverser.pop()
-            if current_url is None:
-                break
-
-            current_depth = depth_by_url.get(current_url, 0)
-            if self._max_depth is not None and current_depth > self._max_depth:
-                logger.debug(
-                    "Skipping %s because depth %s exceeds max_depth %s",
-                    current_url,
-                    current_depth,
-                    self._max_depth,
-                )
+        resumable = self._resumable
+        checkpoint = resumable.load_checkpoint() if resumable else None
+        if resumable is not None and checkpoint is not None:
+            for seen_url in resumable.iter_seen():
+                self._seen.add(seen_url)
+                if self._trap_detector is not None:
+                    self._trap_detector.record(seen_url)
+            self._stats.pages_written = checkpoint.pages_written
+            self._pages_completed = checkpoint.pages_written
+            logger.info("Resuming crawl of %s", self.domain_url)
+        else:
+            self._seen.add(start_url)
+            if self._trap_detector is not None:
+                self._trap_detector.record(start_url)
+            self._traverser.push(start_url, 0)
+            if self._resumable:
+                self._resumable.record_seen(start_url)
+        logger.info(
+            "Starting crawl at %s with %s fetch, %s process and %s write task(s)",
+            start_url,
+            self._concurrency,
+            self._process_concurrency,
+            self._write_concurrency,
+        )
+
+        await self._run_stages()
+        await self._checkpoint()
+        if self._stop_requested:
+            logger.info("Crawl stopped on request; progress checkpointed")
+        if self._max_pages_reached():
+            logger.info("Stopping crawl after reaching max_pages=%s", self._max_pages)
+        logger.info(
+            "Crawl finished; pages written: %s, fetch failures: %s, "
+            "retries scheduled: %s, retries given up: %s, "
+            "canonical duplicates: %s, exact duplicates: %s, near duplicates: %s, "
+            "peak queue depths: %s",
+            self._stats.pages_written,
+            self._stats.fetch_failures,
+            self._stats.retries_scheduled,
+            self._stats.retries_given_up,
+            self._stats.canonical_duplicates,
+            self._stats.exact_duplicates,
+            self._stats.near_duplicates,
+            self._stats.queue_peaks,
+        )
+        if self._trap_detector is not None and self._stats.trap_throttled:
+            logger.info("Trap detector throttled: %s", self._stats.trap_throttled)
+            for template, count in self._trap_detector.top_throttled():
+                logger.info("  %s URLs matching %s", count, template)
+        return self._stats
+
+    def queue_depths(self) -> dict[str, int]:
+        """
+        Return how much work waits in front of each stage.
+
+        ``fetch`` counts URLs being fetched, ``process`` and ``write`` the
+        items in the bounded queue ahead of that stage. A stage whose queue
+        stays full is the bottleneck; an empty one is starved.
+        """
+        return {
+            "fetch": self._fetching,
+            "process": self._process_queue.qsize() if self._process_queue else 0,
+            "write": self._write_queue.qsize() if self._write_queue else 0,
+        }
+
+    def request_stop(self) -> None:
+        """Ask workers to finish in-flight URLs and stop taking new ones."""
+        if self._stop_requested:
+            return None
+        self._stop_requested = True
+        logger.info("Stop requested; draining in-flight pages")
+        if self._work_changed is not None:
+            asyncio.get_running_loop().create_task(self._wake_workers())
+        return None
+
+    async def _wake_workers(self) -> None:
+        """Wake every idle worker so it re-checks the crawl state."""
+        assert self._work_changed is not None
+        async with self._work_changed:
+            self._work_changed.notify_all()
+        return None
+
+    @property
+    def _resumable(self) -> ResumableTraversalStrategy | None:
+        """Return the traverser when it persists crawl progress."""
+        if isinstance(self._traverser, ResumableTraversalStrategy):
+            return self._traverser
+        return None
+
+    async def _checkpoint(self) -> None:
+        """Flush written pages, then commit frontier progress to match."""
+        if self._resumable is None:
+            return None
+        await self._output_writer.flush()
+        self._resumable.checkpoint()
+        self._urls_since_checkpoint = 0
+        logger.debug("Checkpointed after %s pages", self._pages_completed)
+        return None
+
+    async def _run_stages(self) -> None:
+        """Run the stage tasks until the frontier is exhausted or the crawl stops."""
+        assert self._process_queue is not None and self._write_queue is not None
+        fetchers = [
+            asyncio.create_task(self._fetch_stage(index))
+            for index in range(self._concurrency)
+        ]
+        processors = [
+            asyncio.create_task(self._process_stage(index))
+            for index in range(self._process_concurrency)
+        ]
+        writers = [
+            asyncio.create_task(self._write_stage(index))
+            for index in range(self._write_concurrency)
+        ]
+        stages = fetchers + processors + writers
+        drain = asyncio.create_task(self._drain(fetchers, processors, writers))
+        try:
+            # Returns once the drain (and so every stage) is done, or as soon
+            # as any task fails.
+            await asyncio.wait([drain, *stages], return_when=asyncio.FIRST_EXCEPTION)
+            for task in [*stages, drain]:
+                if task.done() and not task.cancelled():
+                    error = task.exception()
+                    if error is not None:
+                        raise error
+        finally:
+            for task in [*stages, drain]:
+                task.cancel()
+            await asyncio.gather(*stages, drain, return_exceptions=True)
+        return None
+
+    async def _drain(
+        self,
+        fetchers: list[asyncio.Task[None]],
+        processors: list[asyncio.Task[None]],
+        writers: list[asyncio.Task[None]],
+    ) -> None:
+        """Stop each stage once every stage feeding it has finished."""
+        assert self._process_queue is not None and self._write_queue is not None
+        await asyncio.gather(*fetchers)
+        for _ in processors:
+            await self._process_queue.put(None)
+        await asyncio.gather(*processors)
+        for _ in writers:
+            await self._write_queue.put(None)
+        await asyncio.gather(*writers)
+        return None
+
+    async def _fetch_stage(self, index: int) -> None:
+        """Fetch frontier URLs and hand their responses to the process stage."""
+        assert self._process_queue is not None
+        while True:
+            work = await self._next_url()
+            if work is None:
+                logger.debug("Fetch task %s exiting", index)
+                return None
+            entry, attempt = work
+            self._fetching += 1
+            try:
+                result = await self._fetch_url(entry, attempt)
+            except BaseException:
+                await self._finish_url()
+                raise
+            finally:
+                self._fetching -= 1
+            if isinstance(result, bool):
+                await self._complete_url(entry, result)
                 continue
+            await self._process_queue.put(result)
+            self._record_queue_depth("process", self._process_queue.qsize())
 
-            logger.debug("Fetching %s (depth=%s)", current_url, current_depth)
-            response = await self._http_fetcher.get(current_url)
-            if response is None:
-                logger.debug("Fetch failed for %s; continuing", current_url)
+    async def _process_stage(self, index: int) -> None:
+        """Process fetched pages, queue their links and pass pages to writing."""
+        assert self._process_queue is not None and self._write_queue is not None
+        while True:
+            fetched = await self._process_queue.get()
+            if fetched is None:
+                logger.debug("Process task %s exiting", index)
+                return None
+            try:
+                result = await self._process_response(fetched)
+            except BaseException:
+                await self._finish_url()
+                raise
+            if isinstance(result, bool):
+                await self._complete_url(fetched.entry, result)
                 continue
+            await self._write_queue.put(result)
+            self._record_queue_depth("write", self._write_queue.qsize())
 
-            page, links = self._html_parser.process_page(current_url, response)
-            if page is not None:
-                processed_page, signals = self._text_processor.get_signals(page)
-                page_object = PageObject(
-                    **processed_page.model_dump(),
-                    **signals.model_dump(),
-                )
-                await self._output_writer.write(page_object)
-                pages_written += 1
-                logger.info("Stored page #%s: %s", pages_written, current_url)
+    async def _write_stage(self, index: int) -> None:
+        """Persist processed pages within the max_pages budget."""
+        assert self._write_queue is not None
+        while True:
+            processed = await self._write_queue.get()
+            if processed is None:
+                logger.debug("Write task %s exiting", index)
+                return None
+            try:
+                finished = await self._write_page(processed)
+            except BaseException:
+                await self._finish_url()
+                raise
+            await self._complete_url(processed.entry, finished)
 
-            if self._max_depth is not None and current_depth >= self._max_depth:
-                continue
+    async def _complete_url(self, entry: FrontierEntry, finished: bool) -> None:
+        """Mark a URL done when finished, then release its in-flight slot."""
+        try:
+            if finished and self._resumable:
+                self._resumable.mark_done(entry.url)
+                self._urls_since_checkpoint += 1
+                if self._urls_since_checkpoint >= self._checkpoint_interval:
+                    await self._checkpoint()
+        finally:
+            await self._finish_url()
+        return None
+
+    def _record_queue_depth(self, stage: str, depth: int) -> None:
+        """Remember the deepest a stage queue has been during this crawl."""
+        peaks = self._stats.queue_peaks
+        if depth > peaks.get(stage, 0):
+            peaks[stage] = depth
+        return None
 
-            for href in links:
-                normalized = clean_and_normalize_link(
-                    href=href, base_url=current_url, domain_root=self.domain_url
+    async def _next_url(self) -> tuple[FrontierEntry, int] | None:
+        """
+        Wait for the next (entry, attempt) to fetch, or return None once work
+        runs out. Retries that have come due take precedence over new URLs.
+        """
+        assert self._work_changed is not None
+        loop = asyncio.get_running_loop()
+        async with self._work_changed:
+            while True:
+                if self._max_pages_reached() or self._stop_requested:
+                    return None
+
+                # URLs already in the pipeline may fill the remaining budget;
+                # wait for them rather than fetch pages that would be dropped.
+                budget_claimed = (
+                    self._max_pages is not None
+                    and self._stats.pages_written + self._in_flight >= self._max_pages
                 )
-                if normalized is None or normalized in self._seen:
-                    logger.debug("Skipping invalid or seen link from %s -> %s", current_url, href)
+                if budget_claimed:
+                    await self._work_changed.wait()
                     continue
 
-                next_depth = current_depth + 1
-                if self._max_depth is not None and next_depth > self._max_depth:
-                    continue
+                if self._retry_heap and self._retry_heap[0][0] <= loop.time():
+                    _, _, retry_entry, attempt = heapq.heappop(self._retry_heap)
+                    self._in_flight += 1
+                    return (retry_entry, attempt)
+
+                if not self._traverser.is_empty():
+                    entry = self._traverser.pop()
+                    if entry is not None:
+                        self._in_flight += 1
+                        return (entry, 0)
+
+                # An empty frontier only ends the crawl once no other worker
+                # can still discover links and no retry is pending.
+                if self._in_flight == 0 and not self._retry_heap:
+                    self._work_changed.notify_all()
+                    return None
+
+                timeout = None
+                if self._retry_heap:
+                    timeout = max(0.0, self._retry_heap[0][0] - loop.time())
+                try:
+                    await asyncio.wait_for(self._work_changed.wait(), timeout)
+                except TimeoutError:
+                    pass
+
+    async def _finish_url(self) -> None:
+        """Release an in-flight slot and wake workers waiting for new URLs."""
+        assert self._work_changed is not None
+        async with self._work_changed:
+            self._in_flight -= 1
+            self._work_changed.notify_all()
+        return None
+
+    def _max_pages_reached(self) -> bool:
+        """Return True when max_pages pages have been written or reserved."""
+        return (
+            self._max_pages is not None and self._stats.pages_written >= self._max_pages
+        )
+
+    def _schedule_retry(
+        self, entry: FrontierEntry, error: RetryableFetchError, attempt: int
+    ) -> bool:
+        """Queue a failed fetch on the retry heap; return False if it gave up."""
+        if attempt >= self._http_fetcher.max_retries:
+            self._stats.retries_given_up += 1
+            self._stats.fetch_failures += 1
+            logger.error(
+                "Giving up on %s after %s attempts (%s)",
+                error.url,
+                attempt + 1,
+                error.reason,
+            )
+            return False
 
-                self._seen.add(normalized)
-                depth_by_url[normalized] = next_depth
-                self._traverser.push(normalized)
-                logger.debug("Queued %s (depth=%s)", normalized, next_depth)
+        due = asyncio.get_running_loop().time() + error.delay
+        heapq.heappush(
+            self._retry_heap,
+            (due, next(self._retry_sequence), entry, attempt + 1),
+        )
+        self._stats.retries_scheduled += 1
+        logger.debug(
+            "Retrying %s in %.2fs (attempt %s)", error.url, error.delay, attempt + 1
+        )
+        return True
 
-        logger.info("Crawl finished; pages written: %s", pages_written)
+    def _resolve_canonical(self, current_url: str, href: str | None) -> str | None:
+        """Return the page's same-domain canonical URL when it differs."""
+        if href is None or not self._honor_canonical:
+            return None
+        canonical_url = self._url_normalizer.normalize(href, current_url)
+        if canonical_url is None or canonical_url == current_url:
+            return None
+        return canonical_url
+
+    async def _fetch_url(
+        self, entry: FrontierEntry, attempt: int = 0
+    ) -> _Fetched | bool:
+        """
+        Fetch one URL for the process stage.
+
+        Returns a bool instead when the URL ends here: True once it needs no
+        more work (skipped or failed for good), False when a retry is pending
+        or max_pages was reached during the fetch.
+        """
+        current_url, current_depth = entry
+        if self._max_depth is not None and current_depth > self._max_depth:
+            logger.debug(
+                "Skipping %s because depth %s exceeds max_depth %s",
+                current_url,
+                current_depth,
+                self._max_depth,
+            )
+            return True
+
+        logger.debug("Fetching %s (depth=%s)", current_url, current_depth)
+        started = time.perf_counter()
+        try:
+            response = await self._http_fetcher.fetch(current_url, attempt)
+        except RetryableFetchError as e:
+            self._observe_fetch("retry", started)
+            return not self._schedule_retry(entry, e, attempt)
+        if response is None:
+            self._observe_fetch("error", started)
+            self._stats.fetch_failures += 1
+            logger.debug("Fetch failed for %s; continuing", current_url)
+            return True
+        self._observe_fetch(str(response.status_code), started, len(response.content))
+        return _Fetched(entry, response)
+
+    def _observe_fetch(self, status: str, started: float, size: int = 0) -> None:
+        """Report one fetch attempt to the metrics, when enabled."""
+        if self._metrics is not None:
+            self._metrics.observe_fetch(status, time.perf_counter() - started, size)
         return None
+
+    async def _process_response(self, fetched: _Fetched) -> _Processed | bool:
+        """
+        Process a fetched page and enqueue its links.
+
+        Returns the page for the write stage, or a bool when the URL ends
+        here: True once fully processed, False when the page was discarded
+        because max_pages had been reached.
+        """
+        (current_url, current_depth), response = fetched
+        if self._max_pages_reached():
+            # The budget filled while the page waited; parsing would be wasted.
+            logger.debug("Skipping parse of %s; max_pages already reached", current_url)
+            return False
+        # Links of pages at the depth limit are never followed, so the parser
+        # does not collect them and nothing below normalizes them.
+        at_depth_limit = (
+            self._max_depth is not None and current_depth >= self._max_depth
+        )
+        want_anchor_text = self._traverser.needs_anchor_text
+        result = await self._page_executor.run(
+            current_url,
+            response,
+            want_links=not at_depth_limit,
+            want_anchor_text=want_anchor_text,
+        )
+        page_object, links, canonical_href, anchor_texts = result[:4]
+        if self._metrics is not None and result.timings:
+            for stage, seconds in result.timings.items():
+                self._metrics.observe_stage(stage, seconds)
+
+        # A page naming another URL as canonical stands in for that URL. If
+        # that URL is already known, this page is a duplicate; otherwise it
+        # is claimed so links to it are never fetched.
+        canonical_url = self._resolve_canonical(current_url, canonical_href)
+        if canonical_url is not None:
+            if not self._seen.add(canonical_url):
+                self._stats.canonical_duplicates += 1
+                logger.debug(
+                    "Dropping %s; canonical %s already seen", current_url, canonical_url
+                )
+                return True
+            if self._resumable:
+                self._resumable.record_seen(canonical_url)
+            if page_object is not None:
+                page_object = page_object.model_copy(update={"url": canonical_url})
+
+        is_duplicate = False
+        if page_object is not None and self._duplicate_detector is not None:
+            match = self._duplicate_detector.check(page_object.url, page_object.text)
+            if match is not None:
+                is_duplicate = True
+                if match.kind == DuplicateKind.exact:
+                    self._stats.exact_duplicates += 1
+                else:
+                    self._stats.near_duplicates += 1
+                logger.debug(
+                    "%s duplicates %s (%s, distance %s)",
+                    current_url,
+                    match.original_url,
+                    match.kind,
+                    match.distance,
+                )
+                if self._duplicate_mode == DuplicateMode.skip:
+                    page_object = None
+                else:
+                    page_object = page_object.model_copy(
+                        update={"duplicate_of": match.original_url}
+                    )
+
+        if not at_depth_limit and not (
+            is_duplicate and not self._expand_duplicate_links
+        ):
+            if self._queue_links(current_url, current_depth, links, anchor_texts):
+                # Wake fetch tasks idling on an empty frontier.
+                await self._wake_workers()
+
+        if page_object is None:
+            self._traverser.record_yield(current_url, 0)
+            return True
+        return _Processed(fetched.entry, page_object)
+
+    def _queue_links(
+        self,
+        current_url: str,
+        current_depth: int,
+        links: list[str],
+        anchor_texts: list[str] | None,
+    ) -> int:
+        """Push a page's new links onto the frontier; return how many."""
+        if anchor_texts is not None:
+            discovered = self._url_normalizer.normalize_anchors(
+                zip(links, anchor_texts), current_url
+            )
+        else:
+            discovered = dict.fromkeys(
+                self._url_normalizer.normalize_links(links, current_url), ""
+            )
+        queued = 0
+        for normalized, anchor_text in discovered.items():
+            if not self._seen.add(normalized):
+                logger.debug(
+                    "Skipping seen link from %s -> %s", current_url, normalized
+                )
+                continue
+            if self._trap_detector is not None:
+                reason = self._trap_detector.admit(normalized)
+                if reason is not None:
+                    throttled = self._stats.trap_throttled
+                    throttled[str(reason)] = throttled.get(str(reason), 0) + 1
+                    logger.debug("Not queueing %s (%s)", normalized, reason)
+                    continue
+
+            next_depth = current_depth + 1
+            self._traverser.push_link(normalized, next_depth, anchor_text)
+            if self._resumable:
+                self._resumable.record_seen(normalized)
+            queued += 1
+            logger.debug("Queued %s (depth=%s)", normalized, next_depth)
+        return queued
+
+    async def _write_page(self, processed: _Processed) -> bool:
+        """Write one page unless max_pages is already reached."""
+        (current_url, _), page_object = processed
+        # Pages still queued when the budget fills are discarded here; the
+        # slot is reserved before awaiting the write.
+        if self._max_pages_reached():
+            logger.debug("Discarding %s; max_pages already reached", current_url)
+            return False
+        self._stats.pages_written += 1
+        page_number = self._stats.pages_written
+        started = time.perf_counter()
+        if self._profiler is not None:
+            await self._profiler.profile_async(
+                "write", self._output_writer.write(page_object)
+            )
+        else:
+            await self._output_writer.write(page_object)
+        if self._metrics is not None:
+            self._metrics.observe_stage("write", time.perf_counter() - started)
+            self._metrics.pages_written.inc()
+        self._pages_completed += 1
+        if self._resumable:
+            self._resumable.record_pages_written(self._pages_completed)
+        self._traverser.record_yield(current_url, page_object.word_count or 0)
+        logger.info("Stored page #%s: %s", page_number, current_url)
+        return True
@@ -1,13 +1,24 @@
+from typing import Iterable
+
+from scraper.dedup.interface import DuplicateDetector, DuplicateMode
+from scraper.execution.interface import PageExecutor
+from scraper.execution.process_pool_executor import ProcessPoolPageExecutor
 from scraper.http.httpx_fetcher import HttpxFetcher
 from scraper.http.interface import HttpFetcher
+from scraper.metrics.crawl_metrics import CrawlMetrics
+from scraper.metrics.stage_profiler import StageProfiler
 from scraper.output.interface import OutputWriter
 from scraper.output.jsonl_writer import JsonlWriter
 from scraper.parsers.basic_html_parser import BasicHtmlParser
 from scraper.parsers.interface import HtmlParser
 from scraper.text_processing.basic_text_processor import BasicTextProcessor
 from scraper.text_processing.interface import TextProcessor
+from scraper.text_processing.signal_registry import SignalRegistry
 from scraper.traversal.breadth_first_traversal import BreadthFirstTraversalStrategy
 from scraper.traversal.interface import TraversalStrategy
+from scraper.traversal.trap_detector import TrapDetector
+from scraper.utils.urls import QueryCanonicalizer
+from scraper.visited.interface import VisitedStore
 
 from .crawler import Crawler
 
@@ -28,12 +39,28 @@ class CrawlerBuilder:
         self._max_pages: int | None = None
         self._max_depth: int | None = None
         self._concurrency: int = 5
+        self._process_concurrency: int | None = None
+        self._write_concurrency: int = 1
+        self._queue_size: int = 32
+        self._process_workers: int | None = None
+        self._checkpoint_interval: int = 100
+        self._honor_canonical: bool = True
 
         self._traverser: TraversalStrategy | None = None
         self._http_fetcher: HttpFetcher | None = None
         self._html_parser: HtmlParser | None = None
         self._text_processor: TextProcessor | None = None
+        self._signals: list[str] | None = None
+        self._signal_registry: SignalRegistry | None = None
         self._output_writer: OutputWriter | None = None
+        self._visited_store: VisitedStore | None = None
+        self._query_canonicalizer: QueryCanonicalizer | None = None
+        self._trap_detector: TrapDetector | None = None
+        self._duplicate_detector: DuplicateDetector | None = None
+        self._duplicate_mode: DuplicateMode = DuplicateMode.skip
+        self._expand_duplicate_links: bool = True
+        self._metrics: CrawlMetrics | None = None
+        self._profiler: StageProfiler | None = None
 
     def with_max_pages(self, max_pages: int | None) -> "CrawlerBuilder":
         """Set an optional cap on how many pages to persist."""
@@ -46,15 +73,82 @@ class CrawlerBuilder:
         return self
 
     def with_concurrency(self, concurrency: int) -> "CrawlerBuilder":
-        """Set desired concurrency (currently unused)."""
+        """Set how many tasks fetch pages concurrently."""
         self._concurrency = concurrency
         return self
 
+    def with_stage_concurrency(
+        self, process: int | None = None, write: int = 1
+    ) -> "CrawlerBuilder":
+        """Set the process and write task counts (process defaults to concurrency)."""
+        self._process_concurrency = process
+        self._write_concurrency = write
+        return self
+
+    def with_queue_size(self, queue_size: int) -> "CrawlerBuilder":
+        """Bound the queues between the fetch, process and write stages."""
+        self._queue_size = queue_size
+        return self
+
+    def with_process_pool(self, max_workers: int | None = None) -> "CrawlerBuilder":
+        """Parse and process pages in a worker process pool (default: all cores)."""
+        self._process_workers = max_workers or 0
+        return self
+
+    def with_checkpoint_interval(self, urls: int) -> "CrawlerBuilder":
+        """Checkpoint resumable traversal state every N processed URLs."""
+        self._checkpoint_interval = urls
+        return self
+
     def with_traversal(self, traverser: TraversalStrategy) -> "CrawlerBuilder":
         """Inject a traversal strategy implementation."""
         self._traverser = traverser
         return self
 
+    def with_trap_detector(self, detector: TrapDetector | None) -> "CrawlerBuilder":
+        """Refuse trap-like URLs and cap how many URLs each template may queue."""
+        self._trap_detector = detector
+        return self
+
+    def with_duplicate_detector(
+        self,
+        detector: DuplicateDetector | None,
+        mode: DuplicateMode = DuplicateMode.skip,
+        expand_links: bool = True,
+    ) -> "CrawlerBuilder":
+        """Skip or mark pages whose text duplicates an earlier page."""
+        self._duplicate_detector = detector
+        self._duplicate_mode = mode
+        self._expand_duplicate_links = expand_links
+        return self
+
+    def with_metrics(self, metrics: CrawlMetrics | None) -> "CrawlerBuilder":
+        """Record fetch, stage and frontier metrics into these instruments."""
+        self._metrics = metrics
+        return self
+
+    def with_profiler(self, profiler: StageProfiler | None) -> "CrawlerBuilder":
+        """Profile the process_page, get_signals and write stages."""
+        self._profiler = profiler
+        return self
+
+    def with_visited_store(self, store: VisitedStore) -> "CrawlerBuilder":
+        """Inject the store used to remember discovered URLs."""
+        self._visited_store = store
+        return self
+
+    def with_query_canonicalizer(
+        self, canonicalizer: QueryCanonicalizer | None
+    ) -> "CrawlerBuilder":
+        """Canonicalize query strings of discovered URLs (None keeps them)."""
+        self._query_canonicalizer = canonicalizer
+        return self
+
+    def with_canonical_links(self, honor: bool) -> "CrawlerBuilder":
+        """Set whether pages' rel=canonical links are used to drop duplicates."""
+        self._honor_canonical = honor
+        return self
+
     def with_fetcher(self, fetcher: HttpFetcher) -> "CrawlerBuilder":
         """Inject an HTTP fetcher implementation."""
         self._http_fetcher = fetcher
@@ -70,6 +164,14 @@ class CrawlerBuilder:
         self._text_processor = processor
         return self
 
+    def with_signals(
+        self, signals: Iterable[str] | None, registry: SignalRegistry | None = None
+    ) -> "CrawlerBuilder":
+        """Select the signals (and optional custom registry) of the default processor."""
+        self._signals = None if signals is None else list(signals)
+        self._signal_registry = registry
+        return self
+
     def with_output_writer(self, writer: OutputWriter) -> "CrawlerBuilder":
         """Inject an output writer implementation."""
         self._output_writer = writer
@@ -78,11 +180,29 @@ class CrawlerBuilder:
     def build(self) -> Crawler:
         """Create a crawler, filling any missing components with defaults."""
 
-        traverser = self._traverser or BreadthFirstTraversalStrategy()
+        traverser = self._traverser
+        if traverser is None:
+            traverser = BreadthFirstTraversalStrategy()
         http_fetcher = self._http_fetcher or HttpxFetcher()
         html_parser = self._html_parser or BasicHtmlParser()
-        text_processor = self._text_processor or BasicTextProcessor()
+        text_processor = self._text_processor
+        if text_processor is None:
+            text_processor = BasicTextProcessor(
+                registry=self._signal_registry, signals=self._signals
+            )
+        elif self._signals is not None or self._signal_registry is not None:
+            raise ValueError(
+                "with_signals() configures the default text processor only"
+            )
         output_writer = self._output_writer or JsonlWriter(path=self._output_path)
+        page_executor: PageExecutor | None = None
+        if self._process_workers is not None:
+            page_executor = ProcessPoolPageExecutor(
+                html_parser=html_parser,
+                text_processor=text_processor,
+                max_workers=self._process_workers or None,
+                profiler=self._profiler,
+            )
 
         return Crawler(
             domain_url=self._domain_url,
@@ -94,4 +214,19 @@ class CrawlerBuilder:
             output_writer=output_writer,
             max_pages=self._max_pages,
             max_depth=self._max_depth,
+            concurrency=self._concurrency,
+            process_concurrency=self._process_concurrency,
+            write_concurrency=self._write_concurrency,
+            queue_size=self._queue_size,
+            page_executor=page_executor,
+            checkpoint_interval=self._checkpoint_interval,
+            visited_store=self._visited_store,
+            query_canonicalizer=self._query_canonicalizer,
+            honor_canonical=self._honor_canonical,
+            trap_detector=self._trap_detector,
+            duplicate_detector=self._duplicate_detector,
+            duplicate_mode=self._duplicate_mode,
+            expand_duplicate_links=self._expand_duplicate_links,
+            metrics=self._metrics,
+            profiler=self._profiler,
         )
@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from enum import StrEnum
+from typing import NamedTuple
+
+
+class DuplicateKind(StrEnum):
+    exact = "exact"
+    near = "near"
+
+
+class DuplicateMode(StrEnum):
+    # Drop duplicate pages before they reach the output writer.
+    skip = "skip"
+    # Write them with ``duplicate_of`` set to the page they repeat.
+    mark = "mark"
+
+
+class DuplicateMatch(NamedTuple):
+    kind: DuplicateKind
+    original_url: str
+    # Differing signature bits; 0 for exact duplicates.
+    distance: int
+
+
+class DuplicateDetector(ABC):
+    @abstractmethod
+    def check(self, url: str, text: str) -> DuplicateMatch | None:
+        """
+        Return the earlier page whose text this one duplicates.
+
+        Text that duplicates nothing is recorded so later pages can match it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return how many page signatures are stored."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget every stored signature."""
+        raise NotImplementedError
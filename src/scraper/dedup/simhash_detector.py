@@ -0,0 +1,199 @@
+import functools
+import hashlib
+import logging
+from array import array
+from collections import Counter, OrderedDict
+from typing import NamedTuple
+
+from scraper.dedup.interface import DuplicateDetector, DuplicateKind, DuplicateMatch
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+# Each byte value spread into eight 32-bit lanes, one per bit, so that the
+# per-bit votes of a byte column add up with one multiply-add per value.
+_LANE_BITS = 32
+_LANE_MASK = (1 << _LANE_BITS) - 1
+_SPREAD = [
+    sum(1 << (bit * _LANE_BITS) for bit in range(8) if value >> bit & 1)
+    for value in range(256)
+]
+
+
+@functools.lru_cache(maxsize=65_536)
+def _token_hash(token: str) -> int:
+    """Return a stable 64-bit hash of one token."""
+    return int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8", "surrogatepass"), digest_size=8).digest(),
+        "little",
+    )
+
+
+def content_hash(tokens: list[str]) -> bytes:
+    """Hash the whitespace-normalized text for exact matching."""
+    return hashlib.blake2b(
+        " ".join(tokens).encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
+def simhash(tokens: list[str], shingle_size: int = 3) -> int:
+    """
+    Return the 64-bit SimHash of a token list's word shingles.
+
+    Tokens are hashed once (and cached); a shingle's hash combines its
+    tokens' hashes by rotation, so no shingle string is built. Per-bit
+    votes are counted per byte position: each of the eight byte columns of
+    the packed shingle hashes goes through one C-level Counter, and each
+    distinct byte value adds its count to all eight bit lanes at once.
+    """
+    hashes = [_token_hash(token) for token in tokens]
+    features = hashes
+    if len(hashes) >= shingle_size:
+        # One pass per shingle position: rotate left by one, then mix in the
+        # next token's hash.
+        features = hashes[: len(hashes) - shingle_size + 1]
+        for offset in range(1, shingle_size):
+            features = [
+                (((feature << 1) | (feature >> 63)) & _MASK64) ^ value
+                for feature, value in zip(features, hashes[offset:])
+            ]
+    if not features:
+        return 0
+
+    packed = array("Q", features).tobytes()
+    threshold = len(features) / 2
+    signature = 0
+    for column in range(8):
+        lanes = 0
+        for value, count in Counter(packed[column::8]).items():
+            lanes += _SPREAD[value] * count
+        for bit in range(8):
+            if (lanes >> (bit * _LANE_BITS)) & _LANE_MASK > threshold:
+                signature |= 1 << (column * 8 + bit)
+    return signature
+
+
+class _Entry(NamedTuple):
+    url: str
+    exact: bytes
+    signature: int | None
+
+
+class SimHashDuplicateDetector(DuplicateDetector):
+    """
+    Exact and near-duplicate detection with a bounded, indexed store.
+
+    Exact duplicates match on a hash of the whitespace-normalized text.
+    Near duplicates match on 64-bit SimHash signatures of word shingles that
+    differ in at most ``max_distance`` bits. The signature is split into
+    ``max_distance + 1`` bands, and each band indexes the entries holding
+    that band value. Two signatures within the distance share at least one
+    band, so a lookup only compares the entries found in the page's own
+    buckets. Pages shorter than ``min_words`` only get exact matching.
+
+    At most ``max_entries`` pages are kept; the oldest is forgotten first,
+    together with its index entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1_000_000,
+        max_distance: int = 3,
+        shingle_size: int = 3,
+        min_words: int = 20,
+    ) -> None:
+        """Configure the store bound, distance threshold and shingling."""
+        if not 0 <= max_distance < 16:
+            raise ValueError("max_distance must be between 0 and 15")
+        self._max_entries = max(1, max_entries)
+        self._max_distance = max_distance
+        self._shingle_size = shingle_size
+        self._min_words = min_words
+
+        self._band_count = max_distance + 1
+        self._band_bits = -(-64 // self._band_count)
+        self._band_mask = (1 << self._band_bits) - 1
+
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._exact: dict[bytes, int] = {}
+        self._bands: list[dict[int, list[int]]] = [{} for _ in range(self._band_count)]
+        self._next_id = 0
+        return None
+
+    def check(self, url: str, text: str) -> DuplicateMatch | None:
+        """Match the text against stored pages, storing it when it is new."""
+        tokens = text.split()
+        exact = content_hash(tokens)
+        entry_id = self._exact.get(exact)
+        if entry_id is not None:
+            return DuplicateMatch(DuplicateKind.exact, self._entries[entry_id].url, 0)
+
+        signature: int | None = None
+        if len(tokens) >= self._min_words:
+            signature = simhash(tokens, self._shingle_size)
+            match = self._find_near(signature)
+            if match is not None:
+                return match
+
+        self._store(_Entry(url, exact, signature))
+        return None
+
+    def __len__(self) -> int:
+        """Return how many page signatures are stored."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Forget every stored signature."""
+        self._entries.clear()
+        self._exact.clear()
+        for band in self._bands:
+            band.clear()
+        return None
+
+    def _band_keys(self, signature: int) -> list[int]:
+        return [
+            (signature >> (index * self._band_bits)) & self._band_mask
+            for index in range(self._band_count)
+        ]
+
+    def _find_near(self, signature: int) -> DuplicateMatch | None:
+        """Return the closest stored page within max_distance bits."""
+        best: tuple[int, int] | None = None
+        for band, key in zip(self._bands, self._band_keys(signature)):
+            for entry_id in band.get(key, ()):
+                stored = self._entries[entry_id].signature
+                assert stored is not None
+                distance = (stored ^ signature).bit_count()
+                if distance <= self._max_distance and (
+                    best is None or distance < best[0]
+                ):
+                    best = (distance, entry_id)
+        if best is None:
+            return None
+        return DuplicateMatch(DuplicateKind.near, self._entries[best[1]].url, best[0])
+
+    def _store(self, entry: _Entry) -> None:
+        """Index a new page, evicting the oldest one when full."""
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = entry
+        self._exact[entry.exact] = entry_id
+        if entry.signature is not None:
+            for band, key in zip(self._bands, self._band_keys(entry.signature)):
+                band.setdefault(key, []).append(entry_id)
+        if len(self._entries) > self._max_entries:
+            self._evict_oldest()
+        return None
+
+    def _evict_oldest(self) -> None:
+        evicted_id, evicted = self._entries.popitem(last=False)
+        if self._exact.get(evicted.exact) == evicted_id:
+            del self._exact[evicted.exact]
+        if evicted.signature is not None:
+            for band, key in zip(self._bands, self._band_keys(evicted.signature)):
+                bucket = band[key]
+                bucket.remove(evicted_id)
+                if not bucket:
+                    del band[key]
+        logger.debug("Evicted duplicate signature of %s", evicted.url)
+        return None
@@ -0,0 +1,104 @@
+import time
+from contextlib import nullcontext
+
+import httpx
+
+from scraper.execution.interface import PageExecutor, PageResult
+from scraper.metrics.stage_profiler import StageProfiler
+from scraper.models import PageObject
+from scraper.parsers.interface import HtmlParser
+from scraper.text_processing.interface import TextProcessor
+
+
+def build_page_result(
+    html_parser: HtmlParser,
+    text_processor: TextProcessor,
+    url: str,
+    response: httpx.Response,
+    want_links: bool = True,
+    want_anchor_text: bool = False,
+    profiler: StageProfiler | None = None,
+) -> PageResult:
+    """
+    Run the parser and text processor over a response, timing each.
+
+    With a profiler, parsing is profiled as the ``process_page`` stage and
+    signal generation as ``get_signals``.
+    """
+    started = time.perf_counter()
+    with profiler.stage("process_page") if profiler else nullcontext():
+        parsed = html_parser.parse(url, response)
+        canonical_url = parsed.canonical_url()
+        links: list[str] = []
+        anchor_texts: list[str] | None = None
+        if want_links and want_anchor_text:
+            anchors = parsed.anchors()
+            links = [href for href, _ in anchors]
+            anchor_texts = [text for _, text in anchors]
+        elif want_links:
+            links = parsed.links()
+        page = parsed.page()
+    parsed_at = time.perf_counter()
+    if page is None:
+        return PageResult(
+            page_object=None,
+            links=links,
+            canonical_url=canonical_url,
+            anchor_texts=anchor_texts,
+            timings={"parse": parsed_at - started},
+        )
+
+    with profiler.stage("get_signals") if profiler else nullcontext():
+        processed_page, signals = text_processor.get_signals(page)
+    page_object = PageObject(
+        **processed_page.model_dump(),
+        **signals.model_dump(),
+    )
+    return PageResult(
+        page_object=page_object,
+        links=links,
+        canonical_url=canonical_url,
+        anchor_texts=anchor_texts,
+        timings={
+            "parse": parsed_at - started,
+            "process": time.perf_counter() - parsed_at,
+        },
+    )
+
+
+class InlinePageExecutor(PageExecutor):
+    def __init__(
+        self,
+        html_parser: HtmlParser,
+        text_processor: TextProcessor,
+        profiler: StageProfiler | None = None,
+    ) -> None:
+        """Run parsing and signal generation directly on the event loop."""
+        self._html_parser = html_parser
+        self._text_processor = text_processor
+        self._profiler = profiler
+        return None
+
+    async def __aenter__(self) -> "InlinePageExecutor":
+        """Warm up the parser and processor before the first page."""
+        self._html_parser.warm_up()
+        self._text_processor.warm_up()
+        return self
+
+    async def run(
+        self,
+        url: str,
+        response: httpx.Response,
+        want_links: bool = True,
+        want_anchor_text: bool = False,
+    ) -> PageResult:
+        """Process the page synchronously in the calling thread."""
+        return build_page_result(
+            self._html_parser,
+            self._text_processor,
+            url,
+            response,
+            want_links,
+            want_anchor_text,
+            self._profiler,
+        )
@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+import httpx
+
+from scraper.metrics.stage_profiler import StageProfile
+from scraper.models import PageObject
+
+
+class PageResult(NamedTuple):
+    page_object: PageObject | None
+    links: list[str]
+    # Raw href of the page's rel=canonical link, resolved by the crawler.
+    canonical_url: str | None = None
+    # Anchor text per entry of ``links`` when it was requested.
+    anchor_texts: list[str] | None = None
+    # Seconds spent in the "parse" and "process" steps for this page.
+    timings: dict[str, float] | None = None
+    # Stage profiles gathered by a page worker's profiler, merged by the executor.
+    profile: dict[str, StageProfile] | None = None
+
+
+class PageExecutor(ABC):
+    @abstractmethod
+    async def run(
+        self,
+        url: str,
+        response: httpx.Response,
+        want_links: bool = True,
+        want_anchor_text: bool = False,
+    ) -> PageResult:
+        """
+        Parse a fetched response and derive signals for its page.
+
+        With ``want_links=False`` anchors are never collected and the result
+        carries an empty link list. The canonical link is always read. With
+        ``want_anchor_text`` the result also carries each link's anchor text.
+        """
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release any worker resources."""
+        return None
+
+    async def __aenter__(self) -> "PageExecutor":
+        """Enter the executor context."""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Exit the executor context and release resources."""
+        await self.aclose()
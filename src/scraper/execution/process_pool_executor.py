@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from scraper.execution.inline_executor import build_page_result
+from scraper.execution.interface import PageExecutor, PageResult
+from scraper.metrics.stage_profiler import StageProfiler
+from scraper.parsers.interface import HtmlParser
+from scraper.text_processing.interface import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+# Per-process instances installed by _init_worker; each worker owns its copies.
+_worker_parser: HtmlParser | None = None
+_worker_processor: TextProcessor | None = None
+_worker_profiler: StageProfiler | None = None
+
+
+def _init_worker(
+    html_parser: HtmlParser,
+    text_processor: TextProcessor,
+    profiler: StageProfiler | None = None,
+) -> None:
+    """Install and warm up the parser/processor copies for this worker."""
+    global _worker_parser, _worker_processor, _worker_profiler
+    html_parser.warm_up()
+    text_processor.warm_up()
+    _worker_parser = html_parser
+    _worker_processor = text_processor
+    _worker_profiler = profiler
+    return None
+
+
+def _ping() -> int:
+    """Report the worker pid; used to force worker start-up."""
+    return os.getpid()
+
+
+def _process_in_worker(
+    url: str, content: bytes, want_links: bool, want_anchor_text: bool
+) -> PageResult:
+    """Rebuild a response from raw bytes and process it in the worker."""
+    if _worker_parser is None or _worker_processor is None:
+        raise RuntimeError("Page worker was not initialized")
+    response = httpx.Response(200, content=content, request=httpx.Request("GET", url))
+    result = build_page_result(
+        _worker_parser,
+        _worker_processor,
+        url,
+        response,
+        want_links,
+        want_anchor_text,
+        _worker_profiler,
+    )
+    if _worker_profiler is not None:
+        result = result._replace(profile=_worker_profiler.drain())
+    return result
+
+
+class ProcessPoolPageExecutor(PageExecutor):
+    def __init__(
+        self,
+        html_parser: HtmlParser,
+        text_processor: TextProcessor,
+        max_workers: int | None = None,
+        profiler: StageProfiler | None = None,
+    ) -> None:
+        """
+        Configure a process pool that parses pages off the event loop.
+
+        Each worker profiles into its own copy of ``profiler``; the results
+        are merged into ``profiler`` as pages come back.
+        """
+        self._html_parser = html_parser
+        self._text_processor = text_processor
+        self._profiler = profiler
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._pool: ProcessPoolExecutor | None = None
+        return None
+
+    async def __aenter__(self) -> "ProcessPoolPageExecutor":
+        """Start and pre-warm every worker process."""
+        self._pool = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            initializer=_init_worker,
+            initargs=(self._html_parser, self._text_processor, self._profiler),
+        )
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(loop.run_in_executor(self._pool, _ping) for _ in range(self._max_workers))
+        )
+        logger.info("Started %s page worker process(es)", len(set(pids)))
+        return self
+
+    async def run(
+        self,
+        url: str,
+        response: httpx.Response,
+        want_links: bool = True,
+        want_anchor_text: bool = False,
+    ) -> PageResult:
+        """Send the raw body and URL to a worker and await its result."""
+        if self._pool is None:
+            raise RuntimeError("ProcessPoolPageExecutor must be entered before use")
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._pool,
+            _process_in_worker,
+            url,
+            response.content,
+            want_links,
+            want_anchor_text,
+        )
+        if result.profile is not None and self._profiler is not None:
+            self._profiler.merge(result.profile)
+            result = result._replace(profile=None)
+        return result
+
+    async def aclose(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+        return None
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import math
+from collections import deque
+
+from scraper.http.host_rate_limiter import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean "slow down" rather than "this URL is broken".
+BACKPRESSURE_STATUSES = frozenset({429, 503})
+
+
+class _HostHealth:
+    """Rolling latency/outcome window for one host."""
+
+    def __init__(self, window: int) -> None:
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.failures: deque[bool] = deque(maxlen=window)
+        self.baseline_p95: float | None = None
+        self.last_decrease: float = -math.inf
+
+
+class AimdThrottle:
+    """
+    Additive-increase / multiplicative-decrease controller for per-host rates.
+
+    Each healthy response nudges the host's rate up by roughly
+    ``increase_step`` requests/second per second of traffic. A 429/503, an
+    error rate above ``max_error_rate`` or a p95 latency that grows past
+    ``latency_growth`` times the best p95 seen for the host multiplies the rate
+    by ``decrease_factor``. Decreases are spaced by ``cooldown`` seconds so a
+    burst of in-flight failures from one congestion event counts once.
+    ``Retry-After`` pauses the host in the shared ``HostRateLimiter``.
+    """
+
+    def __init__(
+        self,
+        limiter: HostRateLimiter,
+        min_rate: float = 0.2,
+        max_rate: float = 20.0,
+        increase_step: float = 0.5,
+        decrease_factor: float = 0.5,
+        window: int = 50,
+        latency_growth: float = 2.0,
+        min_latency: float = 0.25,
+        max_error_rate: float = 0.1,
+        cooldown: float = 2.0,
+    ) -> None:
+        if not 0 < min_rate <= max_rate:
+            raise ValueError("Expected 0 < min_rate <= max_rate")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self._limiter = limiter
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._increase_step = increase_step
+        self._decrease_factor = decrease_factor
+        self._window = window
+        self._latency_growth = latency_growth
+        self._min_latency = min_latency
+        self._max_error_rate = max_error_rate
+        self._cooldown = cooldown
+        self._hosts: dict[str, _HostHealth] = {}
+
+    def rate_for(self, url: str) -> float:
+        """Return the current controlled rate for the URL's host."""
+        host = HostRateLimiter.host_key(url)
+        return self._current_rate(host)
+
+    def record(
+        self,
+        url: str,
+        status: int | None,
+        latency: float,
+        retry_after: float | None = None,
+    ) -> None:
+        """Feed one request outcome (status None = transport error) back in."""
+        host = HostRateLimiter.host_key(url)
+        health = self._hosts.get(host)
+        if health is None:
+            health = _HostHealth(self._window)
+            self._hosts[host] = health
+
+        if retry_after is not None:
+            self._limiter.pause(host, retry_after)
+            logger.info("Pausing %s for %.2fs (Retry-After)", host, retry_after)
+
+        failed = status is None or status >= 500 or status == 429
+        health.failures.append(failed)
+        if status in BACKPRESSURE_STATUSES:
+            self._decrease(host, health, f"HTTP {status}")
+            return None
+
+        if not failed:
+            health.latencies.append(latency)
+
+        if self._unhealthy(host, health):
+            return None
+
+        self._increase(host)
+        return None
+
+    def _unhealthy(self, host: str, health: _HostHealth) -> bool:
+        """Apply a decrease when error rate or p95 latency has degraded."""
+        samples = len(health.failures)
+        if samples >= self._window // 2:
+            error_rate = sum(health.failures) / samples
+            if error_rate > self._max_error_rate:
+                self._decrease(host, health, f"error rate {error_rate:.0%}")
+                return True
+
+        if len(health.latencies) < self._window // 2:
+            return False
+
+        p95 = _percentile(health.latencies, 0.95)
+        if health.baseline_p95 is None or p95 < health.baseline_p95:
+            health.baseline_p95 = p95
+        threshold = max(self._min_latency, health.baseline_p95 * self._latency_growth)
+        if p95 > threshold:
+            self._decrease(host, health, f"p95 latency {p95:.3f}s")
+            return True
+        return False
+
+    def _increase(self, host: str) -> None:
+        """Additively raise the host rate, one step per rate-worth of responses."""
+        rate = self._current_rate(host)
+        if rate >= self._max_rate:
+            return None
+        new_rate = min(self._max_rate, rate + self._increase_step / rate)
+        self._limiter.set_rate(host, new_rate)
+        return None
+
+    def _decrease(self, host: str, health: _HostHealth, reason: str) -> None:
+        """Multiplicatively cut the host rate, at most once per cooldown."""
+        now = asyncio.get_running_loop().time()
+        if now - health.last_decrease < self._cooldown:
+            return None
+        health.last_decrease = now
+        rate = self._current_rate(host)
+        new_rate = max(self._min_rate, rate * self._decrease_factor)
+        self._limiter.set_rate(host, new_rate)
+        # Latency samples from the old rate would immediately re-trigger.
+        health.latencies.clear()
+        health.failures.clear()
+        logger.info(
+            "Throttling %s from %.2f to %.2f req/s (%s)", host, rate, new_rate, reason
+        )
+        return None
+
+    def _current_rate(self, host: str) -> float:
+        """Return the limiter's rate for the host, clamped to the AIMD range."""
+        rate = self._limiter.rate_for(host)
+        if rate is None:
+            return self._max_rate
+        return min(self._max_rate, max(self._min_rate, rate))
+
+
+def _percentile(values: deque[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of the values."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any
+
+import aiofiles
+import aiofiles.os
+import httpx
+
+from scraper.http.interface import HttpFetcher
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the wire encoding of the original body rather than the
+# decoded bytes we store, so they must not be replayed on cached responses.
+_UNREPLAYABLE_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding", "connection"}
+)
+
+
+class CachingFetcher(HttpFetcher):
+    """
+    On-disk HTTP cache wrapping another fetcher.
+
+    Bodies are stored under ``<cache_dir>/bodies`` and validators (ETag,
+    Last-Modified) plus replayable headers in ``<cache_dir>/index.json``. On a
+    recrawl the wrapped fetcher sends If-None-Match / If-Modified-Since; a 304
+    is answered from disk as an ordinary 200 response, so callers cannot tell
+    cached pages from fresh ones. Entries are evicted least-recently-used once
+    the stored bodies exceed ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        fetcher: HttpFetcher,
+        cache_dir: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        index_flush_interval: int = 100,
+    ) -> None:
+        """Configure the cache directory, size bound and wrapped fetcher."""
+        super().__init__()
+        self._fetcher = fetcher
+        self._cache_dir = cache_dir
+        self._bodies_dir = os.path.join(cache_dir, "bodies")
+        self._index_path = os.path.join(cache_dir, "index.json")
+        self._max_bytes = max_bytes
+        self._index_flush_interval = max(1, index_flush_interval)
+        self._index: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._total_bytes = 0
+        self._dirty_entries = 0
+        self.hits = 0
+        self.misses = 0
+        return None
+
+    @property
+    def max_retries(self) -> int:
+        """Delegate the retry budget to the wrapped fetcher."""
+        return self._fetcher.max_retries
+
+    async def __aenter__(self) -> "CachingFetcher":
+        """Enter the wrapped fetcher and load the cache index from disk."""
+        entered = await self._fetcher.__aenter__()
+        if entered is not None:
+            self._fetcher = entered
+        await aiofiles.os.makedirs(self._bodies_dir, exist_ok=True)
+        await self._load_index()
+        return self
+
+    async def get(self, url: str) -> httpx.Response | None:
+        """Fetch through the cache, sleeping through retries inline."""
+        return await self._get_with_inline_retries(url)
+
+    async def fetch(
+        self, url: str, attempt: int = 0, headers: dict[str, str] | None = None
+    ) -> httpx.Response | None:
+        """Revalidate a cached copy or fetch fresh, storing new validators."""
+        key = self._key(url)
+        entry = self._index.get(key)
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = await self._fetcher.fetch(url, attempt, headers=request_headers)
+        if response is None:
+            return None
+
+        if response.status_code == 304:
+            if entry is None:
+                logger.warning("Unexpected 304 for uncached %s", url)
+                return None
+            cached = await self._read_cached(key, entry, url, response)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            # The body is gone, so the 304 cannot be answered; fetch the page
+            # again without validators to get (and store) a full 200.
+            response = await self._fetcher.fetch(
+                url, attempt, headers=dict(headers or {})
+            )
+            if response is None:
+                return None
+
+        self.misses += 1
+        if response.status_code == 200:
+            await self._store(key, url, response)
+        return response
+
+    async def _read_cached(
+        self,
+        key: str,
+        entry: dict[str, Any],
+        url: str,
+        revalidation: httpx.Response,
+    ) -> httpx.Response | None:
+        """Rebuild a 200 response from disk, refreshing validators from the 304."""
+        try:
+            async with aiofiles.open(self._body_path(key), mode="rb") as body_file:
+                body = await body_file.read()
+        except FileNotFoundError:
+            logger.warning("Cache body missing for %s; dropping entry", url)
+            self._drop(key)
+            return None
+
+        if revalidation.headers.get("ETag"):
+            entry["etag"] = revalidation.headers["ETag"]
+        if revalidation.headers.get("Last-Modified"):
+            entry["last_modified"] = revalidation.headers["Last-Modified"]
+        self._index.move_to_end(key)
+        logger.debug("Serving %s from cache (304)", url)
+        return httpx.Response(
+            200,
+            headers=entry["headers"],
+            content=body,
+            request=revalidation.request,
+        )
+
+    async def _store(self, key: str, url: str, response: httpx.Response) -> None:
+        """Persist a fresh response when it carries revalidation validators."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return None
+
+        body = response.content
+        if len(body) > self._max_bytes:
+            return None
+
+        async with aiofiles.open(self._body_path(key), mode="wb") as body_file:
+            await body_file.write(body)
+
+        previous = self._index.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous["size"]
+        self._index[key] = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": len(body),
+            "headers": [
+                [name, value]
+                for name, value in response.headers.multi_items()
+                if name.lower() not in _UNREPLAYABLE_HEADERS
+            ],
+        }
+        self._total_bytes += len(body)
+        await self._evict()
+
+        self._dirty_entries += 1
+        if self._dirty_entries >= self._index_flush_interval:
+            await self._save_index()
+        return None
+
+    async def _evict(self) -> None:
+        """Remove least-recently-used bodies until the cache fits max_bytes."""
+        while self._total_bytes > self._max_bytes and self._index:
+            key = next(iter(self._index))
+            self._drop(key)
+            try:
+                await aiofiles.os.remove(self._body_path(key))
+            except FileNotFoundError:
+                pass
+        return None
+
+    def _drop(self, key: str) -> None:
+        """Forget an index entry and its accounted size."""
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry["size"]
+        return None
+
+    async def _load_index(self) -> None:
+        """Read the LRU-ordered index written by a previous run."""
+        self._index = OrderedDict()
+        self._total_bytes = 0
+        try:
+            async with aiofiles.open(self._index_path, mode="r") as index_file:
+                raw = json.loads(await index_file.read())
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            logger.warning("Ignoring corrupt cache index at %s", self._index_path)
+            return None
+
+        for key, entry in raw.items():
+            self._index[key] = entry
+            self._total_bytes += entry["size"]
+        logger.info(
+            "Loaded HTTP cache with %s entries (%s bytes)",
+            len(self._index),
+            self._total_bytes,
+        )
+        return None
+
+    async def _save_index(self) -> None:
+        """Atomically write the index, preserving LRU order."""
+        tmp_path = self._index_path + ".tmp"
+        async with aiofiles.open(tmp_path, mode="w") as index_file:
+            await index_file.write(json.dumps(self._index))
+        await aiofiles.os.replace(tmp_path, self._index_path)
+        self._dirty_entries = 0
+        return None
+
+    def _body_path(self, key: str) -> str:
+        """Return the on-disk path for a cached body."""
+        return os.path.join(self._bodies_dir, key)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        """Hash a URL into a filesystem-safe cache key."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    async def aclose(self) -> None:
+        """Flush the index and close the wrapped fetcher."""
+        try:
+            if self._index or os.path.exists(self._index_path):
+                await self._save_index()
+            logger.info("HTTP cache: %s hits, %s misses", self.hits, self.misses)
+        finally:
+            await self._fetcher.aclose()
+        return None
@@ -0,0 +1,8 @@
+class RetryableFetchError(Exception):
+    """Raised when a single fetch attempt failed but may succeed later."""
+
+    def __init__(self, url: str, delay: float, reason: str) -> None:
+        super().__init__(f"Retriable failure for {url}: {reason}")
+        self.url = url
+        self.delay = delay
+        self.reason = reason
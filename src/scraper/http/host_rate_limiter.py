@@ -0,0 +1,135 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+
+class _HostBucket:
+    """Token bucket plus in-flight semaphore for a single host."""
+
+    def __init__(
+        self, rate: float | None, burst: int, max_in_flight: int | None, now: float
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens: float = float(burst)
+        self.updated = now
+        self.paused_until = now
+        self.in_flight = (
+            asyncio.Semaphore(max_in_flight) if max_in_flight is not None else None
+        )
+
+
+class HostRateLimiter:
+    """
+    Per-host token bucket (burst + sustained rate) with a cap on concurrent
+    requests per host.
+
+    Tokens are reserved rather than polled: a caller that finds the bucket
+    empty takes a token "on credit" and sleeps until it would have refilled.
+    Waiters therefore never hold a lock while sleeping, requests to different
+    hosts never wait on each other, and a host receives at most
+    ``burst + rate * t`` requests in any window of ``t`` seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float | None,
+        burst: int = 1,
+        max_in_flight: int | None = None,
+    ) -> None:
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive or None")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1 or None")
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self._buckets: dict[str, _HostBucket] = {}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Return the bucket key (lowercased host[:port]) for a URL."""
+        return urlsplit(url).netloc.lower()
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        """Hold an in-flight permit and a rate token for the URL's host."""
+        bucket = self._bucket_for(self.host_key(url))
+        if bucket.in_flight is not None:
+            await bucket.in_flight.acquire()
+        try:
+            await self._take_token(bucket)
+            yield
+        finally:
+            if bucket.in_flight is not None:
+                bucket.in_flight.release()
+
+    def rate_for(self, host: str) -> float | None:
+        """Return the current sustained rate for a host."""
+        bucket = self._buckets.get(host)
+        return bucket.rate if bucket is not None else self.rate
+
+    def set_rate(self, host: str, rate: float) -> None:
+        """Change a host's sustained rate, keeping tokens already accrued."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        bucket = self._bucket_for(host)
+        self._refill(bucket, asyncio.get_running_loop().time())
+        bucket.rate = rate
+        return None
+
+    def pause(self, host: str, seconds: float) -> None:
+        """Hold back new requests to a host for the given number of seconds."""
+        bucket = self._bucket_for(host)
+        until = asyncio.get_running_loop().time() + max(0.0, seconds)
+        bucket.paused_until = max(bucket.paused_until, until)
+        return None
+
+    def _bucket_for(self, host: str) -> _HostBucket:
+        """Return the bucket for a host, creating it on first use."""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _HostBucket(
+                rate=self.rate,
+                burst=self.burst,
+                max_in_flight=self.max_in_flight,
+                now=asyncio.get_running_loop().time(),
+            )
+            self._buckets[host] = bucket
+        return bucket
+
+    async def _take_token(self, bucket: _HostBucket) -> None:
+        """Reserve one token, sleeping until it is covered by the refill."""
+        loop = asyncio.get_running_loop()
+        while bucket.paused_until > loop.time():
+            await asyncio.sleep(bucket.paused_until - loop.time())
+
+        if bucket.rate is None:
+            return None
+
+        self._refill(bucket, loop.time())
+        bucket.tokens -= 1
+        if bucket.tokens >= 0:
+            return None
+
+        try:
+            await asyncio.sleep(-bucket.tokens / bucket.rate)
+        except asyncio.CancelledError:
+            # Hand the reservation back so later callers are not delayed.
+            bucket.tokens += 1
+            raise
+        return None
+
+    @staticmethod
+    def _refill(bucket: _HostBucket, now: float) -> None:
+        """Credit tokens earned since the last update, capped at the burst."""
+        if bucket.rate is not None:
+            elapsed = now - bucket.updated
+            bucket.tokens = min(
+                float(bucket.burst), bucket.tokens + elapsed * bucket.rate
+            )
+        bucket.updated = now
+        return None
@@ -1,15 +1,36 @@
-import asyncio
 import logging
 import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional
 
 import httpx
 
+from scraper.http.adaptive_throttle import AimdThrottle
+from scraper.http.errors import RetryableFetchError
+from scraper.http.host_rate_limiter import HostRateLimiter
 from scraper.http.interface import HttpFetcher
 
 logger = logging.getLogger(__name__)
 
 
+def parse_retry_after(value: str | None) -> float | None:
+    """Convert a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 class HttpxFetcher(HttpFetcher):
     def __init__(
         self,
@@ -18,11 +39,16 @@ class HttpxFetcher(HttpFetcher):
         user_agent: str = "ai-collections-scraper/0.1",
         max_retries: int = 2,
         backoff_base: float = 0.5,
+        rate_limiter: HostRateLimiter | None = None,
+        throttle: AimdThrottle | None = None,
+        max_retry_after: float = 60.0,
     ) -> None:
         """Initialize an AsyncClient with crawler-friendly defaults."""
-        super().__init__(min_request_interval)
+        super().__init__(min_request_interval, rate_limiter)
         self._max_retries = max(0, max_retries)
         self._backoff_base = max(0.0, backoff_base)
+        self._throttle = throttle
+        self._max_retry_after = max_retry_after
         self._client = httpx.AsyncClient(
             timeout=httpx.Timeout(timeout),
             headers={
@@ -33,40 +59,84 @@ class HttpxFetcher(HttpFetcher):
         )
         return None
 
+    @property
+    def max_retries(self) -> int:
+        """Number of retries allowed after the first attempt."""
+        return self._max_retries
+
     async def get(self, url: str) -> httpx.Response | None:
-        """Fetch a URL with httpx and swallow expected errors."""
-        attempt = 0
-        while attempt <= self._max_retries:
-            if self._rate_limiter is not None:
-                await self._rate_limiter.wait()
+        """Fetch a URL, sleeping through retries inline, and swallow errors."""
+        return await self._get_with_inline_retries(url)
 
-            try:
-                response: httpx.Response = await self._client.get(url)
-                response.raise_for_status()
+    async def fetch(
+        self, url: str, attempt: int = 0, headers: dict[str, str] | None = None
+    ) -> httpx.Response | None:
+        """Make one request; raise RetryableFetchError with the backoff delay."""
+        retry_after: float | None = None
+        status: Optional[int] = None
+        started = time.perf_counter()
+        try:
+            async with self._request_slot(url):
+                started = time.perf_counter()
+                response: httpx.Response = await self._client.get(url, headers=headers)
+            status = response.status_code
+            self._record(url, status, started, response)
+            if status == 304:
                 return response
-            except httpx.TimeoutException as e:
-                logger.warning("Timeout while fetching %s: %s", url, e)
-                retriable = True
-            except httpx.HTTPStatusError as e:
-                status: Optional[int] = e.response.status_code if e.response else None
-                if status == 404:
-                    logger.info("Not found (404) while fetching %s", url)
-                    return None
-                logger.warning("HTTP %s while fetching %s: %s", status, url, e)
-                retriable = status is not None and status >= 500
-            except httpx.RequestError as e:
-                logger.warning("Request error while fetching %s: %s", url, e)
-                retriable = True
-
-            if not retriable or attempt == self._max_retries:
+            response.raise_for_status()
+            return response
+        except httpx.TimeoutException as e:
+            self._record(url, None, started)
+            logger.warning("Timeout while fetching %s: %s", url, e)
+            reason = "timeout"
+        except httpx.HTTPStatusError as e:
+            if status == 404:
+                logger.info("Not found (404) while fetching %s", url)
+                return None
+            logger.warning("HTTP %s while fetching %s: %s", status, url, e)
+            if status is None or (status < 500 and status != 429):
                 logger.error("Giving up on %s after %s attempts", url, attempt + 1)
                 return None
+            reason = f"HTTP {status}"
+            retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+        except httpx.RequestError as e:
+            self._record(url, None, started)
+            logger.warning("Request error while fetching %s: %s", url, e)
+            reason = "request error"
 
-            delay = self._backoff_base * (2**attempt)
-            delay += random.uniform(0, delay * 0.1) if delay > 0 else 0
-            logger.debug("Retrying %s in %.2fs (attempt %s)", url, delay, attempt + 1)
-            await asyncio.sleep(delay)
-            attempt += 1
+        if retry_after is not None and retry_after > self._max_retry_after:
+            logger.error(
+                "Giving up on %s; Retry-After %.0fs exceeds limit", url, retry_after
+            )
+            return None
+
+        raise RetryableFetchError(url, self._retry_delay(attempt, retry_after), reason)
+
+    def _retry_delay(self, attempt: int, retry_after: float | None) -> float:
+        """Exponential backoff with jitter, never shorter than Retry-After."""
+        delay = self._backoff_base * (2**attempt)
+        delay += random.uniform(0, delay * 0.1) if delay > 0 else 0
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _record(
+        self,
+        url: str,
+        status: int | None,
+        started: float,
+        response: httpx.Response | None = None,
+    ) -> None:
+        """Report a request outcome to the adaptive throttle, if configured."""
+        if self._throttle is None:
+            return None
+        retry_after = None
+        if response is not None and status in (429, 503):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                retry_after = min(retry_after, self._max_retry_after)
+        self._throttle.record(url, status, time.perf_counter() - started, retry_after)
+        return None
 
     async def aclose(self) -> None:
         """Close the underlying httpx client."""
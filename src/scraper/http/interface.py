@@ -1,14 +1,30 @@
+import asyncio
+import logging
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from httpx import Response
+from scraper.http.errors import RetryableFetchError
+from scraper.http.host_rate_limiter import HostRateLimiter
 from scraper.http.rate_limiter import RateLimiter
 
+logger = logging.getLogger(__name__)
+
 
 class HttpFetcher(ABC):
-    def __init__(self, min_request_interval: float | None = None) -> None:
+    def __init__(
+        self,
+        min_request_interval: float | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+    ) -> None:
+        if min_request_interval and rate_limiter is not None:
+            raise ValueError("Pass either min_request_interval or rate_limiter")
         if min_request_interval:
             self._rate_limiter = RateLimiter(min_interval=min_request_interval)
         else:
             self._rate_limiter = None
+        self._host_rate_limiter = rate_limiter
         return None
 
     @abstractmethod
@@ -16,6 +32,52 @@ class HttpFetcher(ABC):
         """Fetch a URL and return the response or None on failure."""
         raise NotImplementedError
 
+    async def fetch(
+        self, url: str, attempt: int = 0, headers: dict[str, str] | None = None
+    ) -> Response | None:
+        """
+        Make a single fetch attempt without sleeping through backoff.
+
+        Raises RetryableFetchError when the caller should try again later;
+        returns None for permanent failures. Extra request headers are sent
+        when the fetcher supports them. Fetchers without their own retry
+        logic fall back to get().
+        """
+        return await self.get(url)
+
+    async def _get_with_inline_retries(self, url: str) -> Response | None:
+        """Call fetch() until it succeeds, sleeping through each backoff."""
+        attempt = 0
+        while True:
+            try:
+                return await self.fetch(url, attempt)
+            except RetryableFetchError as e:
+                if attempt >= self.max_retries:
+                    logger.error("Giving up on %s after %s attempts", url, attempt + 1)
+                    return None
+                logger.debug(
+                    "Retrying %s in %.2fs (attempt %s)", url, e.delay, attempt + 1
+                )
+                await asyncio.sleep(e.delay)
+                attempt += 1
+
+    @property
+    def max_retries(self) -> int:
+        """Number of retries allowed after the first attempt."""
+        return 0
+
+    @asynccontextmanager
+    async def _request_slot(self, url: str) -> AsyncIterator[None]:
+        """Wait for the configured limiter before sending one request."""
+        if self._host_rate_limiter is not None:
+            async with self._host_rate_limiter.limit(url):
+                yield
+            return
+
+        if self._rate_limiter is not None:
+            await self._rate_limiter.wait()
+        yield
+
     async def aclose(self) -> None:
         """Close held network resources."""
         return None
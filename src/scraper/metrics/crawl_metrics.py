@@ -0,0 +1,89 @@
+from typing import Callable
+
+from scraper.metrics.registry import DEFAULT_BUCKETS, MetricsRegistry
+
+
+class CrawlMetrics:
+    """
+    The crawler's metric families on a MetricsRegistry.
+
+    Fetches are counted and timed by outcome: the HTTP status, ``retry``
+    for attempts scheduled to be retried and ``error`` for permanent
+    failures. Parse, process (signal generation) and write times share one
+    histogram labelled by stage. Frontier, seen-set and stage-queue sizes
+    are gauges read from the crawler at export time (see watch()).
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry | None = None,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Register the crawl metrics on a registry (a new one by default)."""
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.fetches = self.registry.counter(
+            "scraper_fetches_total", "Fetch attempts by outcome.", ("status",)
+        )
+        self.fetch_seconds = self.registry.histogram(
+            "scraper_fetch_seconds",
+            "Fetch time by outcome, including per-host rate-limit waits.",
+            ("status",),
+            buckets,
+        )
+        self.downloaded_bytes = self.registry.counter(
+            "scraper_downloaded_bytes_total", "Response body bytes downloaded."
+        )
+        self.stage_seconds = self.registry.histogram(
+            "scraper_stage_seconds",
+            "Time per page in the parse, process and write stages.",
+            ("stage",),
+            buckets,
+        )
+        self.pages_written = self.registry.counter(
+            "scraper_pages_written_total", "Pages handed to the output writer."
+        )
+        self._frontier_size: Callable[[], int | None] = lambda: None
+        self._seen_size: Callable[[], int | None] = lambda: None
+        self._queue_depths: Callable[[], dict[str, int]] = dict
+        self.registry.gauge(
+            "scraper_frontier_urls",
+            "URLs queued in the frontier.",
+            function=lambda: self._frontier_size(),
+        )
+        self.registry.gauge(
+            "scraper_seen_urls",
+            "URLs in the visited store.",
+            function=lambda: self._seen_size(),
+        )
+        self.registry.gauge(
+            "scraper_stage_queue_depth",
+            "Work waiting in front of each crawl stage.",
+            ("stage",),
+            function=lambda: self._queue_depths(),
+        )
+        return None
+
+    def watch(
+        self,
+        frontier_size: Callable[[], int | None],
+        seen_size: Callable[[], int | None],
+        queue_depths: Callable[[], dict[str, int]],
+    ) -> None:
+        """Read the size gauges from these callables from now on."""
+        self._frontier_size = frontier_size
+        self._seen_size = seen_size
+        self._queue_depths = queue_depths
+        return None
+
+    def observe_fetch(self, status: str, seconds: float, size: int = 0) -> None:
+        """Count and time one fetch attempt."""
+        self.fetches.inc(status=status)
+        self.fetch_seconds.observe(seconds, status=status)
+        if size:
+            self.downloaded_bytes.inc(size)
+        return None
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """Time one page in a parse, process or write stage."""
+        self.stage_seconds.observe(seconds, stage=stage)
+        return None
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import logging
+
+from scraper.metrics.registry import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+_PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """
+    Minimal HTTP endpoint exposing a MetricsRegistry on the event loop.
+
+    ``GET /metrics`` returns the Prometheus text format and
+    ``GET /metrics.json`` the JSON summary. The server binds to localhost by
+    default; use it as an async context manager around the crawl.
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry, port: int, host: str = "127.0.0.1"
+    ) -> None:
+        """Configure the registry to serve and the listening address."""
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+        return None
+
+    async def __aenter__(self) -> "MetricsServer":
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        sockets = self._server.sockets or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        logger.info("Serving metrics on http://%s:%s/metrics", self.host, self.port)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Stop listening and close open connections."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop the server."""
+        if self._server is None:
+            return None
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        return None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer one request, then close the connection."""
+        try:
+            request_line = await reader.readline()
+            # Drain the headers; the request body is never used.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            method, _, rest = request_line.decode("latin-1").partition(" ")
+            path = rest.split(" ", 1)[0].split("?", 1)[0]
+            if method != "GET":
+                status, content_type, body = "405 Method Not Allowed", "text/plain", b""
+            elif path in ("/", "/metrics"):
+                status = "200 OK"
+                content_type = _PROMETHEUS_CONTENT_TYPE
+                body = self.registry.render_prometheus().encode()
+            elif path == "/metrics.json":
+                status = "200 OK"
+                content_type = "application/json"
+                body = json.dumps(self.registry.summary()).encode()
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b""
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.debug("Metrics request failed: %s", e)
+        finally:
+            writer.close()
+        return None
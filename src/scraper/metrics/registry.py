@@ -0,0 +1,336 @@
+import bisect
+import math
+from typing import Any, Callable, Iterator, Mapping
+
+# Latency buckets in seconds, from sub-millisecond parsing to slow fetches.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, **extra: str) -> str:
+    """Render a Prometheus label set such as {status="200"}."""
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _summary_key(names: tuple[str, ...], values: LabelValues) -> str:
+    return ",".join(f"{name}={value}" for name, value in zip(names, values))
+
+
+class _Metric:
+    """A named metric family with a fixed set of label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, label_names: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        return None
+
+    def _key(self, labels: Mapping[str, Any]) -> LabelValues:
+        """Return the label values in declaration order."""
+        if labels.keys() != set(self.label_names):
+            raise ValueError(
+                f"{self.name} expects labels {self.label_names}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """Yield (sample name, label string, value) in exposition order."""
+        raise NotImplementedError
+
+    def summary(self) -> Any:
+        """Return the metric's current values as JSON-ready data."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, label_names: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, label_names)
+        self._values: dict[LabelValues, float] = {}
+        return None
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Add a non-negative amount to the labelled count."""
+        if amount < 0:
+            raise ValueError("Counters only increase")
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+        return None
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, value in sorted(self._values.items()):
+            yield self.name, _format_labels(self.label_names, key), value
+
+    def summary(self) -> Any:
+        if not self.label_names:
+            return self._values.get((), 0)
+        return {
+            _summary_key(self.label_names, key): value
+            for key, value in sorted(self._values.items())
+        }
+
+
+class Gauge(_Metric):
+    """
+    Point-in-time value per label set.
+
+    Values are either set() directly or read from ``function`` whenever the
+    gauge is exported. Without labels the function returns a number (None
+    for unknown); with labels it returns a mapping from label values to
+    numbers.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: tuple[str, ...] = (),
+        function: Callable[[], Any] | None = None,
+    ) -> None:
+        super().__init__(name, help, label_names)
+        self._values: dict[LabelValues, float] = {}
+        self._function = function
+        return None
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = value
+        return None
+
+    def _current(self) -> dict[LabelValues, float]:
+        if self._function is None:
+            return dict(self._values)
+        current = self._function()
+        if current is None:
+            return {}
+        if not self.label_names:
+            return {(): current}
+        return {
+            (key if isinstance(key, tuple) else (str(key),)): value
+            for key, value in current.items()
+        }
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, value in sorted(self._current().items()):
+            yield self.name, _format_labels(self.label_names, key), value
+
+    def summary(self) -> Any:
+        current = self._current()
+        if not self.label_names:
+            return current.get(())
+        return {
+            _summary_key(self.label_names, key): value
+            for key, value in sorted(current.items())
+        }
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self, buckets: int) -> None:
+        # One count per bucket plus the +Inf overflow.
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """
+    Bucketed distribution of observations per label set.
+
+    Buckets are upper bounds, exported cumulatively as in Prometheus.
+    quantile() interpolates linearly inside the bucket holding the rank, the
+    way Prometheus' histogram_quantile() does.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+        return None
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _HistogramSeries(len(self.buckets))
+        series.counts[bisect.bisect_left(self.buckets, value)] += 1
+        series.count += 1
+        series.sum += value
+        return None
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(self._key(labels))
+        return series.count if series else 0
+
+    def quantile(self, q: float, **labels: Any) -> float | None:
+        """Estimate the q-quantile (0..1) of the labelled observations."""
+        series = self._series.get(self._key(labels))
+        if series is None:
+            return None
+        return self._quantile(series, q)
+
+    def _quantile(self, series: _HistogramSeries, q: float) -> float | None:
+        if series.count == 0:
+            return None
+        rank = q * series.count
+        cumulative = 0
+        for index, bucket_count in enumerate(series.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    # Above the last bound: report the bound, as Prometheus does.
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            bounds = [*self.buckets, math.inf]
+            for bound, bucket_count in zip(bounds, series.counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, le=_format_value(bound))
+                yield f"{self.name}_bucket", labels, cumulative
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum", labels, series.sum
+            yield f"{self.name}_count", labels, series.count
+
+    def summary(self) -> Any:
+        summaries = {
+            _summary_key(self.label_names, key): {
+                "count": series.count,
+                "sum": round(series.sum, 6),
+                "mean": round(series.sum / series.count, 6) if series.count else None,
+                **{
+                    f"p{round(q * 100)}": _rounded(self._quantile(series, q))
+                    for q in (0.5, 0.9, 0.99)
+                },
+            }
+            for key, series in sorted(self._series.items())
+        }
+        if not self.label_names:
+            return summaries.get("")
+        return summaries
+
+
+def _rounded(value: float | None) -> float | None:
+    return None if value is None else round(value, 6)
+
+
+class MetricsRegistry:
+    """
+    Named metric families, exported as Prometheus text or a JSON summary.
+
+    Metrics live in process memory and are updated on the event loop; pages
+    processed in worker processes report their timings back through the
+    page results.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        return None
+
+    def counter(
+        self, name: str, help: str, label_names: tuple[str, ...] = ()
+    ) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, help, label_names)
+        self._register(metric)
+        return metric
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        label_names: tuple[str, ...] = (),
+        function: Callable[[], Any] | None = None,
+    ) -> Gauge:
+        """Create and register a gauge, optionally read from a function."""
+        metric = Gauge(name, help, label_names, function)
+        self._register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, help, label_names, buckets)
+        self._register(metric)
+        return metric
+
+    def render_prometheus(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict[str, Any]:
+        """Return every metric's current values keyed by metric name."""
+        return {name: metric.summary() for name, metric in self._metrics.items()}
+
+    def _register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return None
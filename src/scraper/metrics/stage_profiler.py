@@ -0,0 +1,341 @@
+import contextlib
+import cProfile
+import io
+import logging
+import pstats
+import random
+import sys
+import tracemalloc
+from collections import Counter
+from typing import Any, Awaitable, Generator, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Allocations made by the import machinery or by the profilers themselves are
+# noise in the report.
+_ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class StageProfile:
+    """
+    Profiling data gathered for one stage.
+
+    ``cpu_stats`` sums the cProfile runs of the CPU samples;
+    ``allocated`` and ``blocks`` map ``file:line`` sites to the bytes and
+    blocks they allocated during sampled calls and still held at the end of
+    the call.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.sampled = 0
+        self.cpu_sampled = 0
+        self.cpu_stats = _CpuStats()
+        self.memory_sampled = 0
+        self.peak_bytes = 0
+        self.peak_bytes_total = 0
+        self.allocated: Counter[str] = Counter()
+        self.blocks: Counter[str] = Counter()
+        return None
+
+    def merge(self, other: "StageProfile") -> None:
+        """Add another profile of the same stage into this one."""
+        self.calls += other.calls
+        self.sampled += other.sampled
+        self.cpu_sampled += other.cpu_sampled
+        self.cpu_stats.add(other.cpu_stats)
+        self.memory_sampled += other.memory_sampled
+        self.peak_bytes = max(self.peak_bytes, other.peak_bytes)
+        self.peak_bytes_total += other.peak_bytes_total
+        self.allocated.update(other.allocated)
+        self.blocks.update(other.blocks)
+        return None
+
+
+class _CpuStats(pstats.Stats):
+    """pstats.Stats that pickles without its output stream."""
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["stream"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.stream = sys.stdout
+        return None
+
+
+class StageProfiler:
+    """
+    Stage-scoped CPU and memory profiling for a crawl.
+
+    Each call of a stage (see stage() and profile_async()) is sampled with
+    probability ``sample_rate``. A sampled call either runs under its own
+    cProfile.Profile (``cpu``) or between tracemalloc.start() and stop()
+    (``memory``), recording the peak traced memory and the allocation sites
+    still held when the call ends. With both enabled, a stage's samples
+    alternate between the two, so neither profiler inflates the other's
+    numbers and a sample costs one profiler's overhead. Unsampled calls
+    only count, so a low rate keeps the overhead small enough for production
+    crawls. tracemalloc is process-wide: a memory sample is skipped while
+    another one (or a foreign tracemalloc session) is active, and a sample
+    of an async stage also sees what other tasks allocate across its awaits.
+    CPU profiles of async stages cover only the stage's own steps.
+
+    Profilers pickle without their data; a page worker profiles into its own
+    copy and ships the results back through drain() and merge().
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        cpu: bool = True,
+        memory: bool = True,
+        memory_frames: int = 1,
+        seed: int | None = None,
+    ) -> None:
+        """Configure what is profiled and the share of stage calls sampled."""
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError("sample_rate must be in (0, 1]")
+        self.sample_rate = sample_rate
+        self.cpu = cpu
+        self.memory = memory
+        self.memory_frames = max(1, memory_frames)
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._stages: dict[str, StageProfile] = {}
+        self._tracing = False
+        self._cpu_active = False
+        return None
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile one synchronous call of a stage when it is sampled."""
+        profile = self._stage(name)
+        profile.calls += 1
+        if not self._sample():
+            yield
+            return
+        profile.sampled += 1
+        traced = not self._sample_cpu(profile) and self._start_tracing()
+        profiler = cProfile.Profile() if self._sample_cpu(profile) else None
+        enabled = self._enable_cpu(profiler)
+        try:
+            yield
+        finally:
+            if enabled:
+                self._disable_cpu(profiler)
+            self._finish_sample(profile, profiler if enabled else None, traced)
+
+    async def profile_async(self, name: str, awaitable: Awaitable[T]) -> T:
+        """Await one call of an async stage, profiling it when sampled."""
+        profile = self._stage(name)
+        profile.calls += 1
+        if not self._sample():
+            return await awaitable
+        profile.sampled += 1
+        traced = not self._sample_cpu(profile) and self._start_tracing()
+        steps = _ProfiledSteps(self, awaitable) if self._sample_cpu(profile) else None
+        try:
+            return await (steps if steps is not None else awaitable)
+        finally:
+            profiler = steps.profiler if steps and steps.enabled else None
+            self._finish_sample(profile, profiler, traced)
+
+    def stages(self) -> dict[str, StageProfile]:
+        """Return the profile of each stage seen so far."""
+        return dict(self._stages)
+
+    def drain(self) -> dict[str, StageProfile] | None:
+        """Return and reset the data gathered since the last drain."""
+        if not self._stages:
+            return None
+        stages, self._stages = self._stages, {}
+        return stages
+
+    def merge(self, stages: dict[str, StageProfile]) -> None:
+        """Add stage profiles gathered elsewhere, e.g. in a page worker."""
+        for name, other in stages.items():
+            self._stage(name).merge(other)
+        return None
+
+    def report(self, top: int = 20) -> str:
+        """Render the top functions and allocation sites of every stage."""
+        sections = []
+        for name, profile in self._stages.items():
+            lines = [
+                f"=== Stage {name}: {profile.sampled} of {profile.calls} "
+                "call(s) sampled ==="
+            ]
+            if profile.cpu_sampled:
+                stream = io.StringIO()
+                # Sort and print a copy; sorting caches state on the Stats.
+                stats = _CpuStats(stream=stream).add(profile.cpu_stats)
+                stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+                lines.append(
+                    f"CPU over {profile.cpu_sampled} sampled call(s), top {top} "
+                    "functions by internal time:"
+                )
+                lines.append(stream.getvalue().strip("\n"))
+            if profile.memory_sampled:
+                mean_peak = profile.peak_bytes_total / profile.memory_sampled
+                lines.append(
+                    f"Memory over {profile.memory_sampled} sampled call(s): "
+                    f"peak {_format_bytes(mean_peak)} per call on average, "
+                    f"{_format_bytes(profile.peak_bytes)} at most"
+                )
+                lines.append(
+                    f"Top {top} allocation sites still held at the end of a call:"
+                )
+                for site, size in profile.allocated.most_common(top):
+                    lines.append(
+                        f"{_format_bytes(size):>12} {profile.blocks[site]:>8} "
+                        f"blocks  {site}"
+                    )
+            sections.append("\n".join(lines))
+        return "\n\n".join(sections) + "\n"
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle the configuration only; each copy gathers its own data."""
+        state = self.__dict__.copy()
+        state["_random"] = None
+        state["_stages"] = {}
+        state["_tracing"] = False
+        state["_cpu_active"] = False
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        # Unseeded copies draw independent samples.
+        self._random = random.Random(self.seed)
+        return None
+
+    def _stage(self, name: str) -> StageProfile:
+        profile = self._stages.get(name)
+        if profile is None:
+            profile = self._stages[name] = StageProfile()
+        return profile
+
+    def _sample(self) -> bool:
+        return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
+
+    def _sample_cpu(self, profile: StageProfile) -> bool:
+        """Whether the stage's current sample is a CPU (not memory) sample."""
+        return self.cpu and (not self.memory or profile.sampled % 2 == 1)
+
+    def _enable_cpu(self, profiler: cProfile.Profile | None) -> bool:
+        """Enable a stage's profiler unless another one is running."""
+        if profiler is None or self._cpu_active:
+            return False
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiling tool owns the interpreter's profiling hook.
+            logger.debug("CPU profiling skipped; another profiler is active")
+            return False
+        self._cpu_active = True
+        return True
+
+    def _disable_cpu(self, profiler: cProfile.Profile | None) -> None:
+        assert profiler is not None
+        profiler.disable()
+        self._cpu_active = False
+        return None
+
+    def _finish_sample(
+        self, profile: StageProfile, profiler: cProfile.Profile | None, traced: bool
+    ) -> None:
+        """Stop tracing, then fold the sample into the stage's profile."""
+        # Tracing stops first so collecting the CPU stats is not measured.
+        if traced:
+            self._stop_tracing(profile)
+        if profiler is not None:
+            profile.cpu_sampled += 1
+            profile.cpu_stats.add(profiler)
+        return None
+
+    def _start_tracing(self) -> bool:
+        """Start tracemalloc for a memory sample if it is free."""
+        if not self.memory or self._tracing or tracemalloc.is_tracing():
+            return False
+        tracemalloc.start(self.memory_frames)
+        self._tracing = True
+        return True
+
+    def _stop_tracing(self, profile: StageProfile) -> None:
+        """Record the peak and surviving allocations, then stop tracemalloc."""
+        try:
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_ALLOCATION_FILTERS)
+        finally:
+            tracemalloc.stop()
+            self._tracing = False
+        profile.memory_sampled += 1
+        profile.peak_bytes = max(profile.peak_bytes, peak)
+        profile.peak_bytes_total += peak
+        for statistic in snapshot.statistics("lineno"):
+            frame = statistic.traceback[0]
+            site = f"{frame.filename}:{frame.lineno}"
+            profile.allocated[site] += statistic.size
+            profile.blocks[site] += statistic.count
+        return None
+
+
+class _ProfiledSteps:
+    """
+    Awaitable running a coroutine under cProfile one step at a time.
+
+    The profiler is enabled only while the wrapped coroutine runs, never
+    while it is suspended, so other tasks on the event loop stay out of the
+    stage's profile.
+    """
+
+    def __init__(self, owner: StageProfiler, awaitable: Awaitable[Any]) -> None:
+        self.profiler = cProfile.Profile()
+        self.enabled = False
+        self._owner = owner
+        self._awaitable = awaitable
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        steps = self._awaitable.__await__()
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            enabled = self._owner._enable_cpu(self.profiler)
+            self.enabled |= enabled
+            try:
+                if error is not None:
+                    yielded = steps.throw(error)
+                else:
+                    yielded = steps.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if enabled:
+                    self._owner._disable_cpu(self.profiler)
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                steps.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
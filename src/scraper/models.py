@@ -1,4 +1,12 @@
-from pydantic import BaseModel
+from typing import Any
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    SerializerFunctionWrapHandler,
+    model_serializer,
+)
 
 
 class Page(BaseModel):
@@ -9,12 +17,47 @@ class Page(BaseModel):
 
 
 class Signals(BaseModel):
-    word_count: int
-    character_count: int
-    estimated_reading_time: float
-    language: str
-    content_type: str
+    # Signals left out of the processor's selection stay None; custom signals
+    # registered on the processor are kept as extra fields.
+    model_config = ConfigDict(extra="allow")
+
+    word_count: int | None = None
+    character_count: int | None = None
+    estimated_reading_time: float | None = None
+    language: str | None = None
+    content_type: str | None = None
 
 
 class PageObject(Page, Signals):
-    pass
+    model_config = ConfigDict(extra="allow")
+
+    # URL of the earlier page this one duplicates (duplicate mode "mark").
+    duplicate_of: str | None = None
+
+    @model_serializer(mode="wrap")
+    def _omit_unset_duplicate(
+        self, handler: SerializerFunctionWrapHandler
+    ) -> dict[str, Any]:
+        """Leave duplicate_of out of records that are not marked duplicates."""
+        data = handler(self)
+        if self.duplicate_of is None:
+            data.pop("duplicate_of", None)
+        return data
+
+
+class CrawlStats(BaseModel):
+    pages_written: int = 0
+    fetch_failures: int = 0
+    retries_scheduled: int = 0
+    retries_given_up: int = 0
+    canonical_duplicates: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    # URLs refused by the trap detector, by TrapReason.
+    trap_throttled: dict[str, int] = Field(default_factory=dict)
+    # Deepest each stage queue ("process", "write") got during the crawl.
+    queue_peaks: dict[str, int] = Field(default_factory=dict)
+
+
+class CrawlCheckpoint(BaseModel):
+    pages_written: int
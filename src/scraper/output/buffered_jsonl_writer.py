@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import os
+from enum import StrEnum
+
+from scraper.models import PageObject
+from scraper.output.jsonl_writer import JsonlWriter
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class FsyncPolicy(StrEnum):
+    none = "none"
+    batch = "batch"
+
+
+class BufferedJsonlWriter(JsonlWriter):
+    """
+    JSONL writer that batches records in memory and writes them from a
+    background task.
+
+    write() serializes the record and puts the line on a bounded queue, so the
+    crawl only waits when the queue is full. The background task joins lines
+    into one buffer and writes it with a single file call once
+    ``flush_bytes`` is reached or ``flush_interval`` seconds have passed since
+    the first buffered line. With ``FsyncPolicy.batch`` every batch is also
+    fsynced. aclose() always drains the queue and flushes the final batch.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        append: bool = False,
+        flush_bytes: int = 1024 * 1024,
+        flush_interval: float = 1.0,
+        max_pending: int = 1000,
+        fsync: FsyncPolicy = FsyncPolicy.none,
+    ) -> None:
+        """Configure batching thresholds, queue bound and durability."""
+        super().__init__(path, append=append)
+        self._flush_bytes = max(1, flush_bytes)
+        self._flush_interval = flush_interval
+        self._max_pending = max(1, max_pending)
+        self._fsync = FsyncPolicy(fsync)
+        self._queue: asyncio.Queue[object] | None = None
+        self._task: asyncio.Task[None] | None = None
+        # Flush requests taken off the queue but not yet answered.
+        self._waiting: list[asyncio.Future[None]] = []
+        return None
+
+    async def __aenter__(self) -> "BufferedJsonlWriter":
+        """Open the file and start the background flush task."""
+        await super().__aenter__()
+        self._queue = asyncio.Queue(maxsize=self._max_pending)
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def write(self, page_object: PageObject) -> None:
+        """Serialize a record and queue it, waiting if the queue is full."""
+        await self._put(page_object.model_dump_json() + "\n")
+        return None
+
+    async def flush(self) -> None:
+        """Wait until every record queued so far is written (and synced)."""
+        done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        await self._put(done)
+        await self._until_done(done)
+        return None
+
+    async def aclose(self) -> None:
+        """Drain the queue, flush the final batch and close the file."""
+        task, self._task = self._task, None
+        try:
+            if task is not None and self._queue is not None:
+                if not task.done():
+                    await self._queue.put(_STOP)
+                await task
+        finally:
+            await super().aclose()
+        return None
+
+    def _running_queue(self) -> "asyncio.Queue[object]":
+        """Return the queue, surfacing a failed background task."""
+        if self._queue is None or self._task is None:
+            raise RuntimeError("BufferedJsonlWriter must be entered before writing")
+        if self._task.done():
+            self._task.result()
+            raise RuntimeError("BufferedJsonlWriter background task has stopped")
+        return self._queue
+
+    async def _put(self, item: object) -> None:
+        """Queue an item, failing if the background task dies meanwhile."""
+        queue = self._running_queue()
+        try:
+            queue.put_nowait(item)
+            return None
+        except asyncio.QueueFull:
+            pass
+        put = asyncio.ensure_future(queue.put(item))
+        try:
+            await self._until_done(put)
+        finally:
+            put.cancel()
+        return None
+
+    async def _until_done(self, future: "asyncio.Future[None]") -> None:
+        """Await a future, or raise the background task's error if it stops first."""
+        task = self._task
+        assert task is not None
+        await asyncio.wait({future, task}, return_when=asyncio.FIRST_COMPLETED)
+        # A failed task frees queue space as it fails the pending flushes, so
+        # check it first: a put that got through then was never written.
+        if task.done() and (task.cancelled() or task.exception() is not None):
+            if future.done() and not future.cancelled():
+                future.exception()  # Reported through the task's error instead.
+            task.result()
+        if future.done():
+            return future.result()
+        raise RuntimeError("BufferedJsonlWriter background task has stopped")
+
+    async def _run(self) -> None:
+        """Collect queued lines and flush them by size or age."""
+        try:
+            await self._flush_loop()
+        except BaseException as e:
+            self._fail_pending(e)
+            raise
+        return None
+
+    async def _flush_loop(self) -> None:
+        """Write batches until _STOP; flush requests resolve once written."""
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        buffer: list[str] = []
+        buffered_bytes = 0
+        deadline: float | None = None
+        self._waiting.clear()
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except TimeoutError:
+                await self._write_batch(buffer)
+                buffer, buffered_bytes, deadline = [], 0, None
+                continue
+
+            if isinstance(item, str):
+                buffer.append(item)
+                buffered_bytes += len(item)
+                if deadline is None:
+                    deadline = loop.time() + self._flush_interval
+                if buffered_bytes < self._flush_bytes:
+                    continue
+
+            if isinstance(item, asyncio.Future):
+                self._waiting.append(item)
+            await self._write_batch(buffer)
+            buffer, buffered_bytes, deadline = [], 0, None
+            for waiter in self._waiting:
+                if not waiter.done():
+                    waiter.set_result(None)
+            self._waiting.clear()
+            if item is _STOP:
+                return None
+
+    def _fail_pending(self, error: BaseException) -> None:
+        """Fail every flush request still waiting on the stopped task."""
+        assert self._queue is not None
+        waiting = list(self._waiting)
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if isinstance(item, asyncio.Future):
+                waiting.append(item)
+        for waiter in waiting:
+            if waiter.done():
+                continue
+            if isinstance(error, asyncio.CancelledError):
+                waiter.cancel()
+            else:
+                waiter.set_exception(error)
+        return None
+
+    async def _write_batch(self, lines: list[str]) -> None:
+        """Write one batch with a single call, applying the fsync policy."""
+        if self._file is None or not lines:
+            return None
+        await self._file.write("".join(lines))
+        await self._file.flush()
+        if self._fsync == FsyncPolicy.batch:
+            await asyncio.to_thread(os.fsync, self._file.fileno())
+        logger.debug("Flushed %s records to %s", len(lines), self.path)
+        return None
@@ -4,11 +4,20 @@ from scraper.models import PageObject
 
 
 class OutputWriter(ABC):
+    # Fewest records a caller should write between flush() calls. Writers
+    # whose flush() finalizes a file raise it so frequent checkpoints do not
+    # fragment the output.
+    min_flush_interval: int = 1
+
     @abstractmethod
     async def write(self, page_object: PageObject) -> None:
         """Persist a processed page object."""
         raise NotImplementedError
 
+    async def flush(self) -> None:
+        """Push buffered records to durable storage."""
+        return None
+
     async def aclose(self) -> None:
         """Close held resources."""
         return None
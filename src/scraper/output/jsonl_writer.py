@@ -5,9 +5,10 @@ import aiofiles
 
 
 class JsonlWriter(OutputWriter):
-    def __init__(self, path: str) -> None:
-        """Initialize writer with target JSONL path."""
+    def __init__(self, path: str, append: bool = False) -> None:
+        """Initialize writer with target JSONL path (append to resume a crawl)."""
         self.path: str = path
+        self.append: bool = append
         self._file: AsyncTextIOWrapper | None = None
         return None
 
@@ -18,9 +19,17 @@ class JsonlWriter(OutputWriter):
         await self._file.write(page_object.model_dump_json() + "\n")
         return None
 
+    async def flush(self) -> None:
+        """Flush buffered lines to the operating system."""
+        if self._file:
+            await self._file.flush()
+        return None
+
     async def __aenter__(self) -> "JsonlWriter":
         """Open the backing file handle asynchronously."""
-        self._file = await aiofiles.open(file=self.path, mode="w")
+        self._file = await aiofiles.open(
+            file=self.path, mode="a" if self.append else "w"
+        )
         return self
 
     async def aclose(self) -> None:
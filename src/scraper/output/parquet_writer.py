@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import re
+from typing import Any
+
+from scraper.models import PageObject
+from scraper.output.interface import OutputWriter
+
+logger = logging.getLogger(__name__)
+
+# Low-cardinality columns stored as dictionaries in Arrow and in Parquet.
+_DICTIONARY_COLUMNS = ("language", "content_type")
+# Columns without min/max statistics; they are large and never filtered on.
+_UNINDEXED_COLUMNS = ("text", "title", "url", "duplicate_of")
+_TMP_SUFFIX = ".tmp"
+
+
+def _import_pyarrow() -> tuple[Any, Any]:
+    """Import the optional pyarrow dependency with a helpful error."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError(
+            "Parquet output requires the 'pyarrow' package "
+            "(install scraping-pipeline[parquet])"
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+def page_schema() -> Any:
+    """Return the Arrow schema used for PageObject records."""
+    pa, _ = _import_pyarrow()
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            pa.field("url", pa.string(), nullable=False),
+            pa.field("title", pa.string(), nullable=False),
+            pa.field("timestamp", pa.string(), nullable=False),
+            pa.field("language", category, nullable=True),
+            pa.field("content_type", category, nullable=True),
+            pa.field("word_count", pa.int64(), nullable=True),
+            pa.field("character_count", pa.int64(), nullable=True),
+            pa.field("estimated_reading_time", pa.float64(), nullable=True),
+            pa.field("text", pa.large_string(), nullable=False),
+            pa.field("duplicate_of", pa.string(), nullable=True),
+        ]
+    )
+
+
+class ParquetWriter(OutputWriter):
+    """
+    Writes PageObject records as Parquet part files inside a directory.
+
+    Records are collected column by column and written as one row group of
+    ``row_group_size`` rows, off the event loop. ``text`` is a
+    ``large_string`` column with no dictionary or statistics. ``language``
+    and ``content_type`` are dictionary encoded. The numeric signal columns
+    keep min/max statistics, so readers can project and filter on them without
+    decoding any text.
+
+    A part is written under a ``.tmp`` name and renamed to
+    ``part-00000.parquet`` once its footer is written. That happens at
+    ``max_rows_per_file``, on flush() and on close. Rows are durable only
+    once their part is renamed, since a Parquet file without its footer is
+    unreadable. A row group cannot be appended to a finished part, so every
+    flush() starts a new part: ``min_flush_interval`` is ``row_group_size``,
+    and the crawler checkpoints no more often than that so parts hold at
+    least one full row group. With ``append`` the numbering continues, and
+    ``.tmp`` parts left by an interrupted run are discarded: they only hold
+    rows after the last checkpoint, which the resumed crawl fetches again.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        row_group_size: int = 10_000,
+        max_rows_per_file: int | None = 1_000_000,
+        compression: str = "zstd",
+        compression_level: int | None = None,
+        append: bool = False,
+    ) -> None:
+        """Configure the output directory, row group size and codec."""
+        self._pa, self._pq = _import_pyarrow()
+        self.directory = directory
+        self.row_group_size = max(1, row_group_size)
+        self.min_flush_interval = self.row_group_size
+        self.max_rows_per_file = max_rows_per_file
+        self.compression = compression
+        self.compression_level = compression_level
+        self.append = append
+        self.schema = page_schema()
+
+        self._columns: dict[str, list[Any]] = self._empty_columns()
+        self._writer: Any = None
+        self._part_path: str | None = None
+        self._part_rows = 0
+        self._next_index = 0
+        self._lock = asyncio.Lock()
+        self._entered = False
+        return None
+
+    async def __aenter__(self) -> "ParquetWriter":
+        """Create the directory and clear or continue existing parts."""
+        await asyncio.to_thread(self._prepare_directory)
+        self._entered = True
+        return self
+
+    async def write(self, page_object: PageObject) -> None:
+        """Buffer one record, writing a row group once enough rows are held."""
+        if not self._entered:
+            raise RuntimeError("ParquetWriter must be entered before writing")
+        record = page_object.model_dump()
+        async with self._lock:
+            for name, values in self._columns.items():
+                # Optional fields such as duplicate_of are left out when unset.
+                values.append(record.get(name))
+            if len(self._columns["url"]) >= self.row_group_size:
+                await asyncio.to_thread(self._write_row_group, self._take_columns())
+        return None
+
+    async def flush(self) -> None:
+        """Write buffered rows and finalize the open part so it is readable."""
+        async with self._lock:
+            await asyncio.to_thread(self._flush_and_finish, self._take_columns())
+        return None
+
+    async def aclose(self) -> None:
+        """Write remaining rows and finalize the open part."""
+        if not self._entered:
+            return None
+        await self.flush()
+        self._entered = False
+        return None
+
+    def _empty_columns(self) -> dict[str, list[Any]]:
+        """Return one empty value list per schema column."""
+        return {name: [] for name in self.schema.names}
+
+    def _take_columns(self) -> dict[str, list[Any]]:
+        """Hand over the buffered columns and start new ones."""
+        columns, self._columns = self._columns, self._empty_columns()
+        return columns
+
+    def _write_row_group(self, columns: dict[str, list[Any]]) -> None:
+        """Convert buffered columns to a record batch and write it."""
+        rows = len(columns["url"])
+        if not rows:
+            return None
+        batch = self._pa.RecordBatch.from_pydict(columns, schema=self.schema)
+        offset = 0
+        while offset < rows:
+            writer = self._open_part()
+            take = rows - offset
+            if self.max_rows_per_file is not None:
+                take = min(take, self.max_rows_per_file - self._part_rows)
+            writer.write_batch(batch.slice(offset, take), row_group_size=take)
+            self._part_rows += take
+            offset += take
+            if (
+                self.max_rows_per_file is not None
+                and self._part_rows >= self.max_rows_per_file
+            ):
+                self._finish_part()
+        return None
+
+    def _flush_and_finish(self, columns: dict[str, list[Any]]) -> None:
+        """Write the last rows and close the current part."""
+        self._write_row_group(columns)
+        self._finish_part()
+        return None
+
+    def _open_part(self) -> Any:
+        """Return the open part writer, starting the next numbered part."""
+        if self._writer is None:
+            name = f"part-{self._next_index:05d}.parquet"
+            self._part_path = os.path.join(self.directory, name)
+            self._writer = self._pq.ParquetWriter(
+                self._part_path + _TMP_SUFFIX,
+                self.schema,
+                compression=self.compression,
+                compression_level=self.compression_level,
+                use_dictionary=list(_DICTIONARY_COLUMNS),
+                write_statistics=[
+                    name for name in self.schema.names if name not in _UNINDEXED_COLUMNS
+                ],
+            )
+            self._part_rows = 0
+            self._next_index += 1
+        return self._writer
+
+    def _finish_part(self) -> None:
+        """Write the footer of the open part and move it into place."""
+        if self._writer is None or self._part_path is None:
+            return None
+        self._writer.close()
+        os.replace(self._part_path + _TMP_SUFFIX, self._part_path)
+        logger.info(
+            "Finished %s (%s rows)", os.path.basename(self._part_path), self._part_rows
+        )
+        self._writer = None
+        self._part_path = None
+        self._part_rows = 0
+        return None
+
+    def _prepare_directory(self) -> None:
+        """Create the directory, then reset it or continue its numbering."""
+        os.makedirs(self.directory, exist_ok=True)
+        pattern = re.compile(r"^part-(\d{5})\.parquet(\.tmp)?$")
+        indexes = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match is None:
+                continue
+            if not self.append or match.group(2):
+                if self.append:
+                    logger.warning("Discarding unfinished part %s", name)
+                os.remove(os.path.join(self.directory, name))
+                continue
+            indexes.append(int(match.group(1)))
+        self._next_index = max(indexes) + 1 if indexes else 0
+        return None
@@ -0,0 +1,349 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+from enum import StrEnum
+from typing import Any, BinaryIO
+
+from scraper.models import PageObject
+from scraper.output.interface import OutputWriter
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+class Compression(StrEnum):
+    gzip = "gzip"
+    zstd = "zstd"
+
+
+_EXTENSIONS = {Compression.gzip: ".jsonl.gz", Compression.zstd: ".jsonl.zst"}
+
+
+class _HashingFile(io.RawIOBase):
+    """Write-through wrapper that hashes and counts the compressed bytes."""
+
+    def __init__(self, raw: BinaryIO) -> None:
+        self._raw = raw
+        self.sha256 = hashlib.sha256()
+        self.bytes_written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        view = memoryview(data)
+        self.sha256.update(view)
+        self.bytes_written += len(view)
+        self._raw.write(view)
+        return len(view)
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        super().close()
+        self._raw.close()
+
+
+class _Shard:
+    """One open shard: raw file, hashing layer and streaming compressor."""
+
+    def __init__(self, path: str, compression: Compression, level: int) -> None:
+        self.path = path
+        self.records = 0
+        self.uncompressed_bytes = 0
+        self._hashing = _HashingFile(open(path, "wb"))
+        self._stream: Any
+        if compression == Compression.gzip:
+            self._stream = gzip.GzipFile(
+                filename="", mode="wb", fileobj=self._hashing, compresslevel=level
+            )
+        else:
+            zstandard = _import_zstandard()
+            self._stream = zstandard.ZstdCompressor(level=level).stream_writer(
+                self._hashing, closefd=False
+            )
+
+    def write(self, data: bytes, records: int) -> None:
+        self._stream.write(data)
+        self.records += records
+        self.uncompressed_bytes += len(data)
+
+    def flush(self) -> None:
+        self._stream.flush()
+        self._hashing.flush()
+
+    def close(self) -> dict[str, Any]:
+        """Finish the compressed stream and return the manifest entry."""
+        self._stream.close()
+        self._hashing.close()
+        return {
+            "file": os.path.basename(self.path),
+            "records": self.records,
+            "uncompressed_bytes": self.uncompressed_bytes,
+            "compressed_bytes": self._hashing.bytes_written,
+            "sha256": self._hashing.sha256.hexdigest(),
+        }
+
+
+def _import_zstandard() -> Any:
+    """Import the optional zstandard dependency with a helpful error."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError(
+            "zstd compression requires the 'zstandard' package "
+            "(install scraping-pipeline[zstd])"
+        ) from e
+    return zstandard
+
+
+class ShardedJsonlWriter(OutputWriter):
+    """
+    Writes JSONL records into numbered, compressed shards inside a directory.
+
+    A shard is rotated once it holds ``max_records`` records or
+    ``max_bytes`` uncompressed bytes. Records are compressed as a stream
+    (gzip or zstd), and ``manifest.json`` lists every finished shard with its
+    record count, sizes and the SHA-256 of the compressed file, so downstream
+    jobs can load and verify shards in parallel. Lines are buffered and
+    compressed off the event loop in batches of ``buffer_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "pages",
+        compression: Compression = Compression.gzip,
+        compression_level: int | None = None,
+        max_records: int | None = 100_000,
+        max_bytes: int | None = 256 * 1024 * 1024,
+        buffer_bytes: int = 256 * 1024,
+        append: bool = False,
+    ) -> None:
+        """Configure the shard directory, codec and rotation thresholds."""
+        self.directory = directory
+        self.prefix = prefix
+        self.compression = Compression(compression)
+        if self.compression == Compression.zstd:
+            _import_zstandard()
+        if compression_level is None:
+            compression_level = 6 if self.compression == Compression.gzip else 3
+        self._level = compression_level
+        self._max_records = max_records
+        self._max_bytes = max_bytes
+        self._buffer_bytes = max(1, buffer_bytes)
+        self.append = append
+
+        self._manifest: list[dict[str, Any]] = []
+        self._next_index = 0
+        self._shard: _Shard | None = None
+        self._pending: list[bytes] = []
+        self._pending_bytes = 0
+        self._lock = asyncio.Lock()
+        self._entered = False
+        return None
+
+    async def __aenter__(self) -> "ShardedJsonlWriter":
+        """Create the directory and, when appending, pick up the manifest."""
+        await asyncio.to_thread(self._prepare_directory)
+        self._entered = True
+        return self
+
+    async def write(self, page_object: PageObject) -> None:
+        """Buffer one record, compressing and rotating shards as needed."""
+        if not self._entered:
+            raise RuntimeError("ShardedJsonlWriter must be entered before writing")
+        line = (page_object.model_dump_json() + "\n").encode("utf-8")
+        async with self._lock:
+            self._pending.append(line)
+            self._pending_bytes += len(line)
+            if self._pending_bytes >= self._buffer_bytes or self._shard_full():
+                await asyncio.to_thread(self._drain_pending, False)
+        return None
+
+    async def flush(self) -> None:
+        """Compress buffered lines and flush the open shard to disk."""
+        async with self._lock:
+            await asyncio.to_thread(self._drain_pending, True)
+        return None
+
+    async def aclose(self) -> None:
+        """Finish the open shard and write the final manifest."""
+        if not self._entered:
+            return None
+        async with self._lock:
+            await asyncio.to_thread(self._close_all)
+        self._entered = False
+        return None
+
+    def _shard_full(self) -> bool:
+        """Return True when buffered plus written data reaches a threshold."""
+        records = len(self._pending)
+        size = self._pending_bytes
+        if self._shard is not None:
+            records += self._shard.records
+            size += self._shard.uncompressed_bytes
+        return (self._max_records is not None and records >= self._max_records) or (
+            self._max_bytes is not None and size >= self._max_bytes
+        )
+
+    def _drain_pending(self, flush: bool) -> None:
+        """Move buffered lines into shards, rotating at the thresholds."""
+        lines, self._pending, self._pending_bytes = self._pending, [], 0
+        batch: list[bytes] = []
+        batch_bytes = 0
+        for line in lines:
+            shard = self._open_shard()
+            batch.append(line)
+            batch_bytes += len(line)
+            records = shard.records + len(batch)
+            size = shard.uncompressed_bytes + batch_bytes
+            if (self._max_records is not None and records >= self._max_records) or (
+                self._max_bytes is not None and size >= self._max_bytes
+            ):
+                shard.write(b"".join(batch), len(batch))
+                batch, batch_bytes = [], 0
+                self._rotate()
+        if batch:
+            self._open_shard().write(b"".join(batch), len(batch))
+        if flush and self._shard is not None:
+            self._shard.flush()
+        return None
+
+    def _open_shard(self) -> _Shard:
+        """Return the current shard, starting the next numbered one if needed."""
+        if self._shard is None:
+            name = (
+                f"{self.prefix}-{self._next_index:05d}{_EXTENSIONS[self.compression]}"
+            )
+            self._shard = _Shard(
+                os.path.join(self.directory, name), self.compression, self._level
+            )
+            self._next_index += 1
+            logger.debug("Opened shard %s", name)
+        return self._shard
+
+    def _rotate(self) -> None:
+        """Close the current shard and record it in the manifest."""
+        if self._shard is None:
+            return None
+        entry = self._shard.close()
+        self._shard = None
+        self._manifest.append(entry)
+        self._write_manifest()
+        logger.info(
+            "Finished shard %s (%s records, %s -> %s bytes)",
+            entry["file"],
+            entry["records"],
+            entry["uncompressed_bytes"],
+            entry["compressed_bytes"],
+        )
+        return None
+
+    def _close_all(self) -> None:
+        """Drain the buffer, close the open shard and persist the manifest."""
+        self._drain_pending(False)
+        if self._shard is not None and self._shard.records:
+            self._rotate()
+        elif self._shard is not None:
+            self._shard.close()
+            os.remove(self._shard.path)
+            self._shard = None
+        self._write_manifest()
+        return None
+
+    def _write_manifest(self) -> None:
+        """Atomically replace manifest.json with the finished shards."""
+        manifest = {
+            "compression": self.compression.value,
+            "total_records": sum(shard["records"] for shard in self._manifest),
+            "shards": self._manifest,
+        }
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(tmp_path, path)
+        return None
+
+    def _prepare_directory(self) -> None:
+        """Create the directory and load or reset shard bookkeeping."""
+        os.makedirs(self.directory, exist_ok=True)
+        pattern = re.compile(
+            rf"^{re.escape(self.prefix)}-(\d{{5}}){re.escape(_EXTENSIONS[self.compression])}$"
+        )
+        indexes: dict[str, int] = {}
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match is not None:
+                indexes[name] = int(match.group(1))
+        existing = sorted(indexes)
+        if not self.append:
+            for name in existing:
+                os.remove(os.path.join(self.directory, name))
+            self._manifest = []
+            self._next_index = 0
+            return None
+
+        manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as manifest_file:
+                self._manifest = json.load(manifest_file)["shards"]
+        listed = {shard["file"] for shard in self._manifest}
+        for name in existing:
+            if name not in listed:
+                self._manifest.append(self._recover_shard(name))
+        self._manifest.sort(key=lambda shard: shard["file"])
+        if indexes:
+            self._next_index = max(indexes.values()) + 1
+        self._write_manifest()
+        return None
+
+    def _recover_shard(self, name: str) -> dict[str, Any]:
+        """Describe a shard left unfinished by an interrupted run."""
+        path = os.path.join(self.directory, name)
+        with open(path, "rb") as raw:
+            data = raw.read()
+        decompressed, truncated = self._read_tolerantly(data)
+        complete = decompressed[: decompressed.rfind(b"\n") + 1]
+        logger.warning(
+            "Recovered unfinished shard %s (%s complete records%s)",
+            name,
+            complete.count(b"\n"),
+            ", stream truncated" if truncated else "",
+        )
+        return {
+            "file": name,
+            "records": complete.count(b"\n"),
+            "uncompressed_bytes": len(complete),
+            "compressed_bytes": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "truncated": truncated or len(complete) != len(decompressed),
+        }
+
+    def _read_tolerantly(self, data: bytes) -> tuple[bytes, bool]:
+        """Decompress as much as possible; report whether the stream was cut."""
+        reader: Any
+        if self.compression == Compression.gzip:
+            reader = gzip.GzipFile(fileobj=io.BytesIO(data))
+        else:
+            reader = (
+                _import_zstandard().ZstdDecompressor().stream_reader(io.BytesIO(data))
+            )
+        chunks: list[bytes] = []
+        try:
+            while chunk := reader.read(64 * 1024):
+                chunks.append(chunk)
+        except Exception as e:  # EOFError/OSError from gzip, ZstdError from zstd
+            logger.debug("Stopped reading truncated shard: %s", e)
+            return b"".join(chunks), True
+        return b"".join(chunks), False
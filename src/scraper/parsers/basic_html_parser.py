@@ -1,42 +1,112 @@
 from bs4 import BeautifulSoup, Tag
 import httpx
 from scraper.models import Page
-from scraper.parsers.interface import HtmlParser
+from scraper.parsers.extraction_plan import (
+    ExtractionPlan,
+    PlanCache,
+    SkeletonPath,
+    element_signature,
+    fingerprint_digest,
+    is_inside,
+    outermost_paths,
+)
+from scraper.parsers.interface import (
+    DEFAULT_BOILERPLATE_SELECTORS,
+    HtmlParser,
+    ParsedPage,
+)
+
+
+def _child_tags(tag: Tag) -> list[Tag]:
+    """Return a tag's element children, skipping strings and comments."""
+    return [child for child in tag.children if isinstance(child, Tag)]
+
+
+class _SoupParsedPage(ParsedPage):
+    """Lazy page and links over one BeautifulSoup tree."""
+
+    def __init__(self, parser: "BasicHtmlParser", url: str, soup: BeautifulSoup):
+        self._parser = parser
+        self._url = url
+        self._soup = soup
+        self._page: Page | None = None
+        self._page_done: bool = False
+        self._links: list[str] | None = None
+        self._anchors: list[tuple[str, str]] | None = None
+        self._canonical_url: str | None = None
+        self._canonical_done: bool = False
+
+    def page(self) -> Page | None:
+        """Strip boilerplate and build the page on first access."""
+        if not self._page_done:
+            self._page = self._parser._build_page(self._url, self._soup)
+            self._page_done = True
+        return self._page
+
+    def links(self) -> list[str]:
+        """Collect hrefs once boilerplate has been stripped."""
+        if self._links is None:
+            self.page()
+            self._links = self._parser._extract_links(self._soup)
+        return self._links
+
+    def anchors(self) -> list[tuple[str, str]]:
+        """Collect hrefs with their anchor text once boilerplate is stripped."""
+        if self._anchors is None:
+            self.page()
+            self._anchors = self._parser._extract_anchors(self._soup)
+            self._links = [href for href, _ in self._anchors]
+        return self._anchors
+
+    def canonical_url(self) -> str | None:
+        """Read the rel=canonical link once."""
+        if not self._canonical_done:
+            self._canonical_url = self._parser._extract_canonical(self._soup)
+            self._canonical_done = True
+        return self._canonical_url
 
 
 class BasicHtmlParser(HtmlParser):
-    def __init__(self) -> None:
+    """
+    BeautifulSoup parser that strips boilerplate using per-template plans.
+
+    Each page's skeleton (elements down to ``fingerprint_depth``, with their
+    tag, id and classes) is hashed into a template fingerprint. The first
+    page of a template runs every boilerplate selector and compiles an
+    ExtractionPlan. Later pages of the same template drop skeleton elements
+    by path, then run the selectors that matched for whatever lies below the
+    skeleton. Plans for up to
+    ``max_templates`` templates are kept in an LRU.
+    """
+
+    def __init__(self, max_templates: int = 256, fingerprint_depth: int = 3) -> None:
         """Seed parser with heuristics for stripping boilerplate."""
-        self._common_selectors: list[str] = [
-            "header",
-            ".site-header",
-            ".main-header",
-            ".header-box",
-            "#header",
-            "footer",
-            ".site-footer",
-            ".main-footer",
-            "#footer",
-            "tags-box",
-        ]
-        self._selectors_to_remove: list[str] = []
-        self._first_page: bool = True
+        self._common_selectors: list[str] = list(DEFAULT_BOILERPLATE_SELECTORS)
+        self._fingerprint_depth: int = fingerprint_depth
+        self.plan_cache: PlanCache = PlanCache(max_templates)
 
     def process_page(
         self, url: str, response: httpx.Response
     ) -> tuple[Page | None, list[str]]:
         """Create a Page model and outbound link list from a response."""
-        soup: BeautifulSoup = self._make_soup(response)
+        parsed: ParsedPage = self.parse(url, response)
+        return (parsed.page(), parsed.links())
+
+    def parse(self, url: str, response: httpx.Response) -> ParsedPage:
+        """Build the soup now; extract the page and links when asked."""
+        return _SoupParsedPage(self, url, self._make_soup(response))
+
+    def _build_page(self, url: str, soup: BeautifulSoup) -> Page | None:
+        """Create a Page model from the soup, stripping boilerplate."""
         title: str = soup.title.text.strip() if soup.title else ""
         timestamp: str = self._now_iso_utc()
         content: str | None = self._extract_content(soup)
-        links: list[str] = self._extract_links(soup)
 
         page: Page | None = None
         if content:
             page = Page(title=title, url=url, timestamp=timestamp, text=content)
 
-        return (page, links)
+        return page
 
     def _make_soup(self, response: httpx.Response) -> BeautifulSoup:
         """Convert HTTP response into a BeautifulSoup tree."""
@@ -46,28 +116,75 @@ class BasicHtmlParser(HtmlParser):
         return soup
 
     def _extract_content(self, soup: BeautifulSoup) -> str | None:
-        """Strip known boilerplate and return page body text."""
-        if self._first_page:
-            self._learn_selectors_to_remove(soup)
-            self._first_page = False
+        """Strip template boilerplate and return page body text."""
+        skeleton = self._skeleton(soup)
+        fingerprint = fingerprint_digest(path for path, _ in skeleton)
+        plan: ExtractionPlan | None = self.plan_cache.get(fingerprint)
+        if plan is None:
+            plan = self._compile_plan(soup, skeleton)
+            self.plan_cache.put(fingerprint, plan)
 
-        for selector in self._selectors_to_remove:
+        body_tag: Tag | None = None
+        if plan.content_path is not None:
+            if is_inside(plan.content_path, plan.drop_paths):
+                return None
+            body_tag = next(tag for path, tag in skeleton if path == plan.content_path)
+
+        for path, tag in skeleton:
+            if path in plan.drop_paths:
+                tag.decompose()
+        for selector in plan.deep_selectors:
             for element in soup.select(selector):
                 element.decompose()
 
-        body_tag: Tag | None = soup.find("body")
+        if body_tag is None:
+            body_tag = soup.find("body")
         if not body_tag:
             return None
 
         return body_tag.text
 
-    def _learn_selectors_to_remove(self, soup: BeautifulSoup) -> None:
-        """Record which boilerplate selectors exist on the first page."""
+    def _skeleton(self, soup: BeautifulSoup) -> list[tuple[SkeletonPath, Tag]]:
+        """List elements down to the fingerprint depth in document order."""
+        skeleton: list[tuple[SkeletonPath, Tag]] = []
+        stack: list[tuple[SkeletonPath, Tag]] = [
+            ((), child) for child in reversed(_child_tags(soup))
+        ]
+        while stack:
+            parent_path, tag = stack.pop()
+            element_id = tag.get("id")
+            if not isinstance(element_id, str):
+                element_id = None
+            path = parent_path + (
+                element_signature(tag.name, element_id, tag.get("class") or ()),
+            )
+            skeleton.append((path, tag))
+            if len(path) <= self._fingerprint_depth:
+                stack.extend((path, child) for child in reversed(_child_tags(tag)))
+        return skeleton
+
+    def _compile_plan(
+        self, soup: BeautifulSoup, skeleton: list[tuple[SkeletonPath, Tag]]
+    ) -> ExtractionPlan:
+        """Run every boilerplate selector to build a new template's plan."""
+        paths_by_tag = {id(tag): path for path, tag in skeleton}
+        drop_paths: list[SkeletonPath] = []
+        deep_selectors: list[str] = []
         for selector in self._common_selectors:
-            if soup.select_one(selector):
-                self._selectors_to_remove.append(selector)
+            for element in soup.select(selector):
+                path = paths_by_tag.get(id(element))
+                if path is not None:
+                    drop_paths.append(path)
+                if selector not in deep_selectors:
+                    deep_selectors.append(selector)
 
-        return None
+        body_tag: Tag | None = soup.find("body")
+        content_path = None if body_tag is None else paths_by_tag.get(id(body_tag))
+        return ExtractionPlan(
+            drop_paths=outermost_paths(drop_paths),
+            deep_selectors=tuple(deep_selectors),
+            content_path=content_path,
+        )
 
     def _extract_links(self, soup: BeautifulSoup) -> list[str]:
         """Gather href targets from anchor tags."""
@@ -81,3 +198,22 @@ class BasicHtmlParser(HtmlParser):
             links.append(link)
 
         return links
+
+    def _extract_anchors(self, soup: BeautifulSoup) -> list[tuple[str, str]]:
+        """Gather href targets with whitespace-collapsed anchor text."""
+        anchors: list[tuple[str, str]] = []
+        for anchor_tag in soup.find_all("a"):
+            if not anchor_tag.get("href"):
+                continue
+            text = " ".join(anchor_tag.get_text().split())
+            anchors.append((str(anchor_tag.get("href")), text))
+        return anchors
+
+    def _extract_canonical(self, soup: BeautifulSoup) -> str | None:
+        """Return the href of the first <link rel="canonical">."""
+        for link_tag in soup.find_all("link"):
+            rel = [value.lower() for value in link_tag.get("rel") or ()]
+            href = link_tag.get("href")
+            if "canonical" in rel and href:
+                return str(href).strip()
+        return None
@@ -0,0 +1,97 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Iterable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Signatures of an element and its ancestors, from the document root down.
+SkeletonPath = tuple[str, ...]
+
+
+class ExtractionPlan(NamedTuple):
+    """
+    What a page template needs removed and where its text lives.
+
+    ``drop_paths`` are the outermost skeleton paths whose elements matched a
+    boilerplate selector. Selectors only look at tag, id and class, so every
+    element on such a path matches; they are removed without any selector
+    matching. ``deep_selectors`` are all selectors that matched anywhere on
+    the analysed page. They still run as selectors, because a later page of
+    the template may hold matching elements below the skeleton where the
+    analysed page had none. ``content_path`` is the skeleton path of
+    the ``<body>`` (None when it lies outside the skeleton).
+    """
+
+    drop_paths: frozenset[SkeletonPath]
+    deep_selectors: tuple[str, ...]
+    content_path: SkeletonPath | None
+
+
+class PlanCache:
+    """Bounded LRU of extraction plans keyed by template fingerprint."""
+
+    def __init__(self, max_templates: int = 256) -> None:
+        """Configure how many template plans are kept."""
+        self._max_templates = max(1, max_templates)
+        self._plans: OrderedDict[bytes, ExtractionPlan] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        return None
+
+    def get(self, fingerprint: bytes) -> ExtractionPlan | None:
+        """Return the cached plan for a template, refreshing its recency."""
+        plan = self._plans.get(fingerprint)
+        if plan is None:
+            self.misses += 1
+            return None
+        self._plans.move_to_end(fingerprint)
+        self.hits += 1
+        return plan
+
+    def put(self, fingerprint: bytes, plan: ExtractionPlan) -> None:
+        """Store a plan, evicting the least recently used template."""
+        self._plans[fingerprint] = plan
+        self._plans.move_to_end(fingerprint)
+        if len(self._plans) > self._max_templates:
+            self._plans.popitem(last=False)
+            logger.debug("Evicted least recently used extraction plan")
+        return None
+
+    def __len__(self) -> int:
+        """Return the number of cached templates."""
+        return len(self._plans)
+
+
+def element_signature(tag: str, element_id: str | None, classes: Iterable[str]) -> str:
+    """Describe one skeleton element by tag, id and classes."""
+    return f"{tag}#{element_id or ''}.{'.'.join(classes)}"
+
+
+def fingerprint_digest(paths: Iterable[SkeletonPath]) -> bytes:
+    """
+    Hash the set of skeleton paths into a template fingerprint.
+
+    Using the set makes pages that only differ in how often an element
+    repeats (list items, paragraphs, teasers) share one template.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(set(paths)):
+        digest.update("\0".join(path).encode("utf-8", "surrogatepass"))
+        digest.update(b"\n")
+    return digest.digest()
+
+
+def outermost_paths(paths: Iterable[SkeletonPath]) -> frozenset[SkeletonPath]:
+    """Drop paths nested inside another path; removing the outer one suffices."""
+    kept: list[SkeletonPath] = []
+    for path in sorted(set(paths)):
+        if kept and path[: len(kept[-1])] == kept[-1]:
+            continue
+        kept.append(path)
+    return frozenset(kept)
+
+
+def is_inside(path: SkeletonPath, ancestors: Iterable[SkeletonPath]) -> bool:
+    """Return True when path equals or lies below any of the ancestors."""
+    return any(path[: len(ancestor)] == ancestor for ancestor in ancestors)
@@ -2,34 +2,88 @@ from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 
 import httpx
-from bs4 import BeautifulSoup
 
 from scraper.models import Page
 
+# Boilerplate containers pruned from page text when the first page has them.
+DEFAULT_BOILERPLATE_SELECTORS: tuple[str, ...] = (
+    "header",
+    ".site-header",
+    ".main-header",
+    ".header-box",
+    "#header",
+    "footer",
+    ".site-footer",
+    ".main-footer",
+    "#footer",
+    "tags-box",
+)
 
-class HtmlParser(ABC):
-    @abstractmethod
-    def process_page(
-        self, url: str, response: httpx.Response
-    ) -> tuple[Page | None, list[str]]:
-        """Return a structured page plus outbound links extracted from HTML."""
-        raise NotImplementedError
+
+class ParsedPage(ABC):
+    """
+    A parsed document whose outputs are extracted on first access.
+
+    Callers ask only for what they use: a page at the crawl's depth limit
+    never needs its links, so link extraction is skipped entirely.
+    """
 
     @abstractmethod
-    def _make_soup(self, response: httpx.Response) -> BeautifulSoup:
-        """Build a BeautifulSoup tree from the HTTP response."""
+    def page(self) -> Page | None:
+        """Return the structured page, or None when it has no content."""
         raise NotImplementedError
 
     @abstractmethod
-    def _extract_content(self, soup: BeautifulSoup) -> str | None:
-        """Extract textual content from the parsed document."""
+    def links(self) -> list[str]:
+        """Return raw link targets found in the document."""
         raise NotImplementedError
 
+    def anchors(self) -> list[tuple[str, str]]:
+        """Return (href, anchor text) for every link in links()."""
+        return [(href, "") for href in self.links()]
+
+    def canonical_url(self) -> str | None:
+        """Return the raw href of the document's rel=canonical link, if any."""
+        return None
+
+
+class StaticParsedPage(ParsedPage):
+    """ParsedPage over outputs that were already extracted."""
+
+    def __init__(
+        self, page: Page | None, links: list[str], canonical_url: str | None = None
+    ) -> None:
+        self._page = page
+        self._links = links
+        self._canonical_url = canonical_url
+
+    def page(self) -> Page | None:
+        return self._page
+
+    def links(self) -> list[str]:
+        return self._links
+
+    def canonical_url(self) -> str | None:
+        return self._canonical_url
+
+
+class HtmlParser(ABC):
     @abstractmethod
-    def _extract_links(self, soup: BeautifulSoup) -> list[str]:
-        """Extract raw link targets from the parsed document."""
+    def process_page(
+        self, url: str, response: httpx.Response
+    ) -> tuple[Page | None, list[str]]:
+        """Return a structured page plus outbound links extracted from HTML."""
         raise NotImplementedError
 
+    def parse(self, url: str, response: httpx.Response) -> ParsedPage:
+        """Parse a response, deferring extraction until outputs are read."""
+        page, links = self.process_page(url, response)
+        return StaticParsedPage(page, links)
+
+    def warm_up(self) -> None:
+        """Load lazily initialized resources ahead of the first page."""
+        return None
+
     def _now_iso_utc(self) -> str:
         """Return the current time in ISO 8601 UTC."""
         return datetime.now(timezone.utc).isoformat()
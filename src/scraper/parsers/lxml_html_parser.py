@@ -0,0 +1,404 @@
+import functools
+import re
+from typing import Any, Callable, Iterator, NamedTuple
+
+import httpx
+from bs4.dammit import UnicodeDammit
+
+from scraper.models import Page
+from scraper.parsers.extraction_plan import (
+    ExtractionPlan,
+    PlanCache,
+    SkeletonPath,
+    element_signature,
+    fingerprint_digest,
+    outermost_paths,
+)
+from scraper.parsers.interface import (
+    DEFAULT_BOILERPLATE_SELECTORS,
+    HtmlParser,
+    ParsedPage,
+    StaticParsedPage,
+)
+
+# Elements whose strings BeautifulSoup leaves out of ``Tag.text``.
+_NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+# html.parser keeps carriage returns that libxml2 would normalize away; the
+# character reference survives parsing as a literal "\r".
+_CARRIAGE_RETURN_REF = "&#13;"
+_BODY_TAG = re.compile(r"<body[\s/>]", re.IGNORECASE)
+_ASCII_SPACES = " \n\t\f\r"
+_PRESERVE_WHITESPACE_TAGS = frozenset({"pre", "textarea"})
+
+
+def _bs4_string(text: str, preserve: bool) -> str:
+    """Apply BeautifulSoup's folding of whitespace-only strings."""
+    if preserve or text.strip(_ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _import_lxml_html() -> Any:
+    """Import the optional lxml dependency with a helpful error."""
+    try:
+        import lxml.html
+    except ImportError as e:
+        raise RuntimeError(
+            "LxmlHtmlParser requires the 'lxml' package "
+            "(install scraping-pipeline[lxml])"
+        ) from e
+    return lxml.html
+
+
+class _SimpleSelectors(NamedTuple):
+    """Tag, class and id sets compiled from simple CSS selectors."""
+
+    tags: frozenset[str]
+    classes: frozenset[str]
+    ids: frozenset[str]
+
+    @classmethod
+    def compile(cls, selectors: list[str]) -> "_SimpleSelectors":
+        tags, classes, ids = set(), set(), set()
+        for selector in selectors:
+            if selector.startswith("."):
+                classes.add(selector[1:])
+            elif selector.startswith("#"):
+                ids.add(selector[1:])
+            elif re.fullmatch(r"[A-Za-z][\w-]*", selector):
+                tags.add(selector.lower())
+            else:
+                raise ValueError(
+                    f"LxmlHtmlParser supports tag, .class and #id selectors, "
+                    f"got {selector!r}"
+                )
+        return cls(frozenset(tags), frozenset(classes), frozenset(ids))
+
+    def matches(self, element: Any) -> bool:
+        if element.tag in self.tags:
+            return True
+        if self.ids and element.get("id") in self.ids:
+            return True
+        if self.classes:
+            class_attr = element.get("class")
+            if class_attr and not self.classes.isdisjoint(class_attr.split()):
+                return True
+        return False
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_selectors(selectors: tuple[str, ...]) -> _SimpleSelectors:
+    """Compile a plan's deep selectors once and share the result."""
+    return _SimpleSelectors.compile(list(selectors))
+
+
+class _Removal(NamedTuple):
+    """Boilerplate to skip on one page: planned elements plus deep selectors."""
+
+    elements: set[Any]
+    deep: _SimpleSelectors
+
+    def matcher(self) -> Callable[[Any], bool]:
+        """Return the cheapest predicate for this page's removal."""
+        elements, deep = self.elements, self.deep
+        if not (deep.tags or deep.classes or deep.ids):
+            return elements.__contains__
+        return lambda element: element in elements or deep.matches(element)
+
+
+class _LxmlParsedPage(ParsedPage):
+    """
+    Lazy page and links over one lxml tree.
+
+    Reading links() first collects hrefs in the same walk as the text, so
+    both come from one traversal; reading only page() skips the anchors.
+    """
+
+    def __init__(
+        self,
+        parser: "LxmlHtmlParser",
+        url: str,
+        root: Any,
+        has_body: bool,
+        removal: "_Removal",
+    ) -> None:
+        self._parser = parser
+        self._url = url
+        self._root = root
+        self._has_body = has_body
+        self._removal = removal
+        self._page: Page | None = None
+        self._page_done: bool = False
+        self._links: list[str] | None = None
+        self._anchor_elements: list[Any] = []
+        self._canonical_url: str | None = None
+        self._canonical_done: bool = False
+
+    def page(self) -> Page | None:
+        if not self._page_done:
+            self._walk(collect_links=False)
+        return self._page
+
+    def links(self) -> list[str]:
+        if self._links is None:
+            self._walk(collect_links=True)
+        assert self._links is not None
+        return self._links
+
+    def anchors(self) -> list[tuple[str, str]]:
+        links = self.links()
+        return [
+            (href, self._parser._anchor_text(element))
+            for href, element in zip(links, self._anchor_elements)
+        ]
+
+    def canonical_url(self) -> str | None:
+        if not self._canonical_done:
+            self._canonical_url = self._parser._extract_canonical(self._root)
+            self._canonical_done = True
+        return self._canonical_url
+
+    def _walk(self, collect_links: bool) -> None:
+        title, content, anchors = self._parser._walk(
+            self._root, self._removal, collect_links
+        )
+        if not self._page_done:
+            self._page = self._parser._build_page(
+                self._url, title, content, self._has_body
+            )
+            self._page_done = True
+        if collect_links:
+            self._anchor_elements = anchors
+            self._links = [element.get("href") for element in anchors]
+        return None
+
+
+class LxmlHtmlParser(HtmlParser):
+    """
+    HtmlParser on libxml2 that extracts title, text and links in one walk.
+
+    Output matches BasicHtmlParser: the same encoding detection, the same
+    per-template extraction plans keyed by skeleton fingerprint, body text
+    without script/style/template strings or comments, and hrefs of every
+    remaining anchor in document order. Selectors are limited to the tag, ``.class``
+    and ``#id`` forms used by the defaults.
+
+    Known differences come from libxml2's tree building, not from extraction.
+    Badly nested markup may be restructured. Markup inside ``<title>`` is
+    kept as text. Unknown entities keep their trailing semicolon.
+    """
+
+    def __init__(
+        self,
+        selectors: list[str] | None = None,
+        max_templates: int = 256,
+        fingerprint_depth: int = 3,
+    ) -> None:
+        """Seed parser with heuristics for stripping boilerplate."""
+        self._common_selectors: list[str] = list(
+            DEFAULT_BOILERPLATE_SELECTORS if selectors is None else selectors
+        )
+        self._candidates: list[tuple[str, _SimpleSelectors]] = [
+            (selector, _SimpleSelectors.compile([selector]))
+            for selector in self._common_selectors
+        ]
+        self._fingerprint_depth: int = fingerprint_depth
+        self.plan_cache: PlanCache = PlanCache(max_templates)
+        self._load_lxml()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Drop the lxml handles so the parser can be sent to worker processes."""
+        state = self.__dict__.copy()
+        del state["_html"], state["_parser"], state["_skeleton_xpath"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore pickled settings and reload lxml."""
+        vars(self).update(state)
+        self._load_lxml()
+        return None
+
+    def process_page(
+        self, url: str, response: httpx.Response
+    ) -> tuple[Page | None, list[str]]:
+        """Create a Page model and outbound link list from a response."""
+        parsed: ParsedPage = self.parse(url, response)
+        links = parsed.links()
+        return (parsed.page(), links)
+
+    def parse(self, url: str, response: httpx.Response) -> ParsedPage:
+        """Build the tree now; walk it when the page or links are read."""
+        markup = self._decode(response)
+        try:
+            root = self._html.document_fromstring(
+                markup.encode("utf-8"), parser=self._parser
+            )
+        except self._html.etree.ParserError:
+            # Empty or comment-only documents have no elements to read.
+            return StaticParsedPage(None, [])
+        # libxml2 always adds a body; BasicHtmlParser reports none.
+        has_body = _BODY_TAG.search(markup) is not None
+        return _LxmlParsedPage(self, url, root, has_body, self._removal_for(root))
+
+    def _build_page(
+        self, url: str, title: str, content: str | None, has_body: bool
+    ) -> Page | None:
+        """Create a Page model from walked title and body text."""
+        if not content or not has_body:
+            return None
+        return Page(
+            title=title.strip(),
+            url=url,
+            timestamp=self._now_iso_utc(),
+            text=content,
+        )
+
+    def _load_lxml(self) -> None:
+        """Import lxml and build the reusable libxml2 parser."""
+        self._html = _import_lxml_html()
+        # Markup is decoded up front, so libxml2 always reads UTF-8 bytes.
+        self._parser = self._html.HTMLParser(encoding="utf-8")
+        # Elements at depth 0..fingerprint_depth, in document order.
+        self._skeleton_xpath = self._html.etree.XPath(
+            "|".join(
+                ["self::*"]
+                + [
+                    "/".join(["*"] * depth)
+                    for depth in range(1, self._fingerprint_depth + 1)
+                ]
+            )
+        )
+        return None
+
+    def _decode(self, response: httpx.Response) -> str:
+        """Decode the body the way BeautifulSoup does and protect CRs."""
+        markup = UnicodeDammit(response.content, is_html=True).unicode_markup or ""
+        if "\r" in markup:
+            markup = markup.replace("\r", _CARRIAGE_RETURN_REF)
+        return markup
+
+    def _removal_for(self, root: Any) -> _Removal:
+        """Look up or compile the template plan and resolve it on this page."""
+        skeleton = self._skeleton(root)
+        fingerprint = fingerprint_digest(path for path, _ in skeleton)
+        plan: ExtractionPlan | None = self.plan_cache.get(fingerprint)
+        if plan is None:
+            plan = self._compile_plan(root, skeleton)
+            self.plan_cache.put(fingerprint, plan)
+        return _Removal(
+            elements={element for path, element in skeleton if path in plan.drop_paths},
+            deep=_compile_selectors(plan.deep_selectors),
+        )
+
+    def _skeleton(self, root: Any) -> list[tuple[SkeletonPath, Any]]:
+        """List elements down to the fingerprint depth in document order."""
+        skeleton: list[tuple[SkeletonPath, Any]] = []
+        paths: dict[Any, SkeletonPath] = {}
+        for element in self._skeleton_xpath(root):
+            path = paths.get(element.getparent(), ()) + (
+                element_signature(
+                    element.tag,
+                    element.get("id"),
+                    (element.get("class") or "").split(),
+                ),
+            )
+            paths[element] = path
+            skeleton.append((path, element))
+        return skeleton
+
+    def _compile_plan(
+        self, root: Any, skeleton: list[tuple[SkeletonPath, Any]]
+    ) -> ExtractionPlan:
+        """Match every boilerplate selector to build a new template's plan."""
+        paths_by_element = {element: path for path, element in skeleton}
+        drop_paths: list[SkeletonPath] = []
+        deep_selectors: list[str] = []
+        for element in root.iter():
+            if not isinstance(element.tag, str):
+                continue
+            for selector, matcher in self._candidates:
+                if not matcher.matches(element):
+                    continue
+                path = paths_by_element.get(element)
+                if path is not None:
+                    drop_paths.append(path)
+                if selector not in deep_selectors:
+                    deep_selectors.append(selector)
+
+        body = root.find(".//body")
+        content_path = None if body is None else paths_by_element.get(body)
+        return ExtractionPlan(
+            drop_paths=outermost_paths(drop_paths),
+            deep_selectors=tuple(deep_selectors),
+            content_path=content_path,
+        )
+
+    def _anchor_text(self, element: Any) -> str:
+        """Return an anchor's whitespace-collapsed text, as bs4's get_text()."""
+        if next(element.iterancestors(*_NON_TEXT_TAGS), None) is not None:
+            return ""
+        return " ".join(element.text_content().split())
+
+    def _extract_canonical(self, root: Any) -> str | None:
+        """Return the href of the first <link rel="canonical">."""
+        for link in root.iter("link"):
+            rel = (link.get("rel") or "").lower().split()
+            href = link.get("href")
+            if "canonical" in rel and href:
+                return href.strip()
+        return None
+
+    def _walk(
+        self, root: Any, remove: _Removal, collect_links: bool
+    ) -> tuple[str, str | None, list[Any]]:
+        """Return (title, body text or None, anchors) from a single traversal."""
+        removed = remove.matcher()
+        title: str | None = None
+        body_seen = False
+        parts: list[str] = []
+        anchors: list[Any] = []
+        # Each frame: children iterator, whether its strings count as body
+        # text, whether whitespace is preserved, and the tail to emit once
+        # the element's subtree is done.
+        stack: list[tuple[Iterator[Any], bool, bool, str | None]] = [
+            (iter((root,)), False, False, None)
+        ]
+        while stack:
+            children, collect, preserve, _ = stack[-1]
+            element = next(children, None)
+            if element is None:
+                tail = stack.pop()[3]
+                if tail and stack and stack[-1][1]:
+                    parts.append(_bs4_string(tail, stack[-1][2]))
+                continue
+
+            tag = element.tag
+            if not isinstance(tag, str) or removed(element):
+                # Comments, processing instructions and pruned subtrees keep
+                # only the text that follows them. BasicHtmlParser reads the
+                # title before pruning, so a pruned title still counts.
+                if title is None and isinstance(tag, str):
+                    nested_title = element.find(".//title")
+                    if nested_title is not None:
+                        title = nested_title.text_content()
+                if collect and element.tail:
+                    parts.append(_bs4_string(element.tail, preserve))
+                continue
+
+            if tag == "title" and title is None:
+                title = element.text_content()
+            elif tag == "a" and collect_links and element.get("href"):
+                anchors.append(element)
+
+            child_collect = collect
+            if tag == "body" and not body_seen:
+                body_seen = True
+                child_collect = True
+            elif tag in _NON_TEXT_TAGS:
+                child_collect = False
+            child_preserve = preserve or tag in _PRESERVE_WHITESPACE_TAGS
+            if child_collect and element.text:
+                parts.append(_bs4_string(element.text, child_preserve))
+            stack.append((iter(element), child_collect, child_preserve, element.tail))
+
+        return (title or "", "".join(parts) if body_seen else None, anchors)
@@ -1,66 +1,62 @@
 import re
+from typing import Iterable
+
 from scraper.models import Page, Signals
 from scraper.text_processing.interface import TextProcessor
-
-from langdetect import detect, LangDetectException
+from scraper.text_processing.signal_registry import (
+    SignalContext,
+    SignalRegistry,
+    default_registry,
+)
 
 
 class BasicTextProcessor(TextProcessor):
+    """
+    Whitespace cleanup followed by the selected signals of a registry.
+
+    ``registry`` defaults to the built-in signals (default_registry()) and may
+    hold custom ones. Only ``signals`` and the signals they depend on are
+    computed, in dependency order; the rest stay None. A selection entry is a
+    signal name, "all" (the default) or a cost such as "cheap", which keeps
+    expensive signals like ``language`` out.
+    """
+
+    def __init__(
+        self,
+        registry: SignalRegistry | None = None,
+        signals: Iterable[str] | None = None,
+    ) -> None:
+        """Resolve the signal selection into an evaluation plan."""
+        self._registry = registry if registry is not None else default_registry()
+        self._plan = self._registry.resolve(signals)
+        return None
+
+    @property
+    def signal_names(self) -> list[str]:
+        """Names of the signals computed for each page, in evaluation order."""
+        return [spec.name for spec in self._plan]
+
+    def warm_up(self) -> None:
+        """Load lazy signal resources (e.g. language profiles) before the first page."""
+        for spec in self._plan:
+            warm_up = getattr(spec.compute, "warm_up", None)
+            if warm_up is not None:
+                warm_up()
+        return None
 
     def _process_text(self, text: str) -> str:
         """Normalize whitespace before downstream processing."""
         return self._remove_spaces(text)
 
     def _generate_signals(self, page: Page) -> Signals:
-        """Produce baseline analytics such as counts, language, and type."""
-        character_count: int = len(page.text)
-        word_count: int = len(page.text.split())
-        language = self._detect_language(page.text)
-        signals: Signals = Signals(
-            word_count=word_count,
-            character_count=character_count,
-            language=language,
-            estimated_reading_time=self._estimate_reading_time_minutes(word_count),
-            content_type=self._infer_content_type(page.url, word_count),
-        )
-
-        return signals
+        """Compute the selected signals over one shared context."""
+        context = SignalContext(page)
+        for spec in self._plan:
+            context.values[spec.name] = spec.compute(context)
+        return Signals(**context.values)
 
     def _remove_spaces(self, text: str) -> str:
         """Collapse repeated whitespace and trim the text."""
         text = text.strip()
         text = re.sub(pattern=r"(\s)\1+", repl=r"\1", string=text)
         return text
-
-    def _detect_language(self, text: str) -> str:
-        """Detect the language of the text, falling back to 'unknown'."""
-        try:
-            return detect(text)
-        except LangDetectException:
-            return "unknown"
-
-    def _estimate_reading_time_minutes(self, word_count: int) -> float:
-        """Estimate reading time assuming roughly 200 WPM."""
-        if word_count <= 0:
-            return 0.0
-        return round(word_count / 200.0, 2)
-
-    def _infer_content_type(self, url: str, word_count: int) -> str:
-        """Guess content type using URL cues and word count."""
-        path = url.lower()
-
-        if "/docs/" in path or "/documentation/" in path:
-            return "doc_page"
-        if "/blog/" in path or "/posts/" in path or "/article/" in path:
-            return "article"
-        if "/product" in path or "/pricing" in path:
-            return "product_page"
-        if "/help" in path or "/faq" in path or "/support" in path:
-            return "help_page"
-
-        if word_count > 800:
-            return "long_form"
-        elif word_count > 200:
-            return "content_page"
-        else:
-            return "other"
@@ -10,6 +10,10 @@ class TextProcessor(ABC):
         signals: Signals = self._generate_signals(page)
         return (page, signals)
 
+    def warm_up(self) -> None:
+        """Load lazily initialized resources ahead of the first page."""
+        return None
+
     @abstractmethod
     def _process_text(self, text: str) -> str:
         """Clean or transform the page text."""
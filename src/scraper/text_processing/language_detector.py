@@ -0,0 +1,188 @@
+import logging
+import os
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Iterable
+from urllib.parse import urlsplit
+
+from langdetect import DetectorFactory, LangDetectException
+from langdetect.detector_factory import PROFILES_DIRECTORY
+
+if TYPE_CHECKING:
+    from scraper.text_processing.signal_registry import SignalContext
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_LANGUAGE = "unknown"
+
+
+def available_languages() -> list[str]:
+    """Return the language codes langdetect ships profiles for."""
+    return sorted(
+        name for name in os.listdir(PROFILES_DIRECTORY) if not name.startswith(".")
+    )
+
+
+def text_sample(text: str, max_chars: int, windows: int = 3) -> str:
+    """
+    Return at most ``max_chars`` characters drawn evenly across the text.
+
+    Short texts are returned unchanged. Longer ones contribute ``windows``
+    equal slices (start, middle, end), trimmed to whole words, so a page
+    opening with a foreign-language header is not judged by it alone.
+    """
+    if len(text) <= max_chars:
+        return text
+    width = max_chars // windows
+    step = (len(text) - width) // max(1, windows - 1)
+    slices = []
+    for index in range(windows):
+        start = index * step
+        window = text[start : start + width]
+        if start:
+            window = window.partition(" ")[2]
+        slices.append(window.rpartition(" ")[0] or window)
+    return " ".join(slices)
+
+
+class _HostPrior:
+    """Running language counts of one host's detected pages."""
+
+    __slots__ = ("counts", "pages", "since_check")
+
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+        self.pages = 0
+        self.since_check = 0
+
+
+class LanguageDetector:
+    """
+    Faster langdetect-based language identification.
+
+    Profiles are loaded into a private DetectorFactory: all of langdetect's
+    languages, or only ``languages`` when given. A smaller set loads faster
+    and leaves fewer candidates per n-gram. Loading happens on warm_up() or
+    on the first detection. The whole text is examined unless
+    ``sample_chars`` is set; then only a sample of at most that many
+    characters is examined (see text_sample()). ``seed`` makes langdetect's
+    randomized trials repeatable; None keeps them random.
+
+    With ``prior_confidence`` set, the detector keeps per-host counts of
+    detected languages. Once a host has ``prior_min_pages`` detections and
+    one language holds at least ``prior_confidence`` of them, its pages are
+    assigned that language without running detection. Every
+    ``prior_recheck_every``-th page still runs detection, so the counts keep
+    tracking the host. Only detected pages feed the counts. The state is per
+    process: each page worker builds its own.
+
+    Instances are callable as a ``language`` signal function and pickle
+    without their loaded profiles.
+    """
+
+    def __init__(
+        self,
+        languages: Iterable[str] | None = None,
+        sample_chars: int | None = None,
+        seed: int | None = 0,
+        prior_confidence: float | None = None,
+        prior_min_pages: int = 20,
+        prior_recheck_every: int = 10,
+    ) -> None:
+        """Configure the profile set, text sampling, seeding and host prior."""
+        self.languages = None if languages is None else sorted(set(languages))
+        if self.languages is not None:
+            unknown = set(self.languages) - set(available_languages())
+            if unknown:
+                raise ValueError(
+                    f"No langdetect profile for: {', '.join(sorted(unknown))}"
+                )
+            if len(self.languages) < 2:
+                raise ValueError("langdetect needs at least two language profiles")
+        if prior_confidence is not None and not 0.5 < prior_confidence <= 1.0:
+            raise ValueError("prior_confidence must be in (0.5, 1]")
+        self.sample_chars = sample_chars
+        self.seed = seed
+        self.prior_confidence = prior_confidence
+        self.prior_min_pages = max(1, prior_min_pages)
+        self.prior_recheck_every = max(1, prior_recheck_every)
+
+        self._factory: DetectorFactory | None = None
+        self._hosts: dict[str, _HostPrior] = {}
+        self.detections = 0
+        self.prior_hits = 0
+        return None
+
+    def warm_up(self) -> None:
+        """Load the language profiles now instead of on the first page."""
+        if self._factory is not None:
+            return None
+        factory = DetectorFactory()
+        if self.languages is None:
+            factory.load_profile(PROFILES_DIRECTORY)
+        else:
+            profiles = []
+            for language in self.languages:
+                with open(
+                    os.path.join(PROFILES_DIRECTORY, language), encoding="utf-8"
+                ) as f:
+                    profiles.append(f.read())
+            factory.load_json_profile(profiles)
+        factory.set_seed(self.seed)
+        self._factory = factory
+        logger.debug("Loaded %s language profile(s)", len(factory.get_lang_list()))
+        return None
+
+    def detect(self, text: str, host: str | None = None) -> str:
+        """Return the text's language code, or 'unknown'."""
+        prior = None
+        if host is not None and self.prior_confidence is not None:
+            prior = self._hosts.get(host)
+            if prior is None:
+                prior = self._hosts[host] = _HostPrior()
+            language = self._confident_language(prior)
+            if language is not None:
+                prior.since_check += 1
+                if prior.since_check < self.prior_recheck_every:
+                    self.prior_hits += 1
+                    return language
+
+        language = self._detect(text)
+        if prior is not None and language != UNKNOWN_LANGUAGE:
+            prior.counts[language] += 1
+            prior.pages += 1
+            prior.since_check = 0
+        return language
+
+    def __call__(self, context: "SignalContext") -> str:
+        """Detect the language of a page as a ``language`` signal."""
+        return self.detect(context.text, urlsplit(context.url).netloc)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle the configuration; profiles are reloaded by warm_up()."""
+        state = self.__dict__.copy()
+        state["_factory"] = None
+        return state
+
+    def _confident_language(self, prior: _HostPrior) -> str | None:
+        """Return the host's dominant language once it is confident enough."""
+        if prior.pages < self.prior_min_pages:
+            return None
+        assert self.prior_confidence is not None
+        language, count = prior.counts.most_common(1)[0]
+        if count / prior.pages < self.prior_confidence:
+            return None
+        return language
+
+    def _detect(self, text: str) -> str:
+        """Run langdetect over a bounded sample of the text."""
+        self.warm_up()
+        assert self._factory is not None
+        self.detections += 1
+        if self.sample_chars is not None:
+            text = text_sample(text, self.sample_chars)
+        detector = self._factory.create()
+        try:
+            detector.append(text)
+            return detector.detect()
+        except LangDetectException:
+            return UNKNOWN_LANGUAGE
@@ -0,0 +1,213 @@
+import functools
+import logging
+from enum import StrEnum
+from typing import Any, Callable, Iterable, NamedTuple
+
+from scraper.models import Page
+from scraper.text_processing.language_detector import LanguageDetector
+
+logger = logging.getLogger(__name__)
+
+
+class SignalCost(StrEnum):
+    cheap = "cheap"
+    moderate = "moderate"
+    expensive = "expensive"
+
+
+_COST_RANK = {SignalCost.cheap: 0, SignalCost.moderate: 1, SignalCost.expensive: 2}
+
+
+class SignalContext:
+    """
+    What a signal function sees while one page's signals are computed.
+
+    ``values`` holds the signals computed so far, so a function can read the
+    ones it declared in ``depends_on``. The whitespace tokens of the text are
+    split once, on first use, and shared by every count-type signal.
+    """
+
+    def __init__(self, page: Page) -> None:
+        """Wrap a processed page."""
+        self.page = page
+        self.values: dict[str, Any] = {}
+        return None
+
+    @property
+    def text(self) -> str:
+        return self.page.text
+
+    @property
+    def url(self) -> str:
+        return self.page.url
+
+    @functools.cached_property
+    def tokens(self) -> list[str]:
+        """Return the whitespace-separated words of the text."""
+        return self.page.text.split()
+
+    def __getitem__(self, name: str) -> Any:
+        """Return an already computed signal."""
+        return self.values[name]
+
+
+SignalFunction = Callable[[SignalContext], Any]
+
+
+class SignalSpec(NamedTuple):
+    """A named signal, how expensive it is and what it needs first."""
+
+    name: str
+    compute: SignalFunction
+    cost: SignalCost = SignalCost.cheap
+    depends_on: tuple[str, ...] = ()
+
+
+class SignalRegistry:
+    """
+    Declarative set of the signals a text processor can compute.
+
+    Signals are registered with a compute function, a cost and the names of
+    the signals they read. resolve() turns a selection into an evaluation
+    plan: the selected signals plus everything they depend on, ordered so
+    dependencies come first. A selection entry is a signal name, "all", or a
+    cost ("cheap", "moderate") meaning every signal up to that cost.
+
+    Compute functions must be picklable (module-level functions or objects)
+    when pages are processed in worker processes. A compute object with a
+    warm_up() method has it called when the processor is warmed up.
+    """
+
+    def __init__(self, specs: Iterable[SignalSpec] = ()) -> None:
+        """Start with the given signal specs, in registration order."""
+        self._specs: dict[str, SignalSpec] = {}
+        for spec in specs:
+            self._specs[spec.name] = spec
+        return None
+
+    def register(
+        self,
+        name: str,
+        compute: SignalFunction,
+        cost: SignalCost = SignalCost.cheap,
+        depends_on: Iterable[str] = (),
+    ) -> None:
+        """Add a signal, replacing any signal of the same name."""
+        if name in {"all", *SignalCost}:
+            raise ValueError(f"{name!r} is reserved for signal selections")
+        self._specs[name] = SignalSpec(name, compute, cost, tuple(depends_on))
+        return None
+
+    def copy(self) -> "SignalRegistry":
+        """Return an independent registry with the same signals."""
+        return SignalRegistry(self._specs.values())
+
+    def names(self, max_cost: SignalCost | None = None) -> list[str]:
+        """Return the registered names, optionally only up to a cost."""
+        if max_cost is None:
+            return list(self._specs)
+        limit = _COST_RANK[max_cost]
+        return [
+            name for name, spec in self._specs.items() if _COST_RANK[spec.cost] <= limit
+        ]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def resolve(self, selection: Iterable[str] | None = None) -> list[SignalSpec]:
+        """Return the specs to evaluate for a selection, dependencies first."""
+        wanted: list[str] = []
+        for entry in self.names() if selection is None else selection:
+            if entry == "all":
+                wanted += self.names()
+            elif entry in SignalCost.__members__:
+                wanted += self.names(SignalCost(entry))
+            elif entry in self._specs:
+                wanted.append(entry)
+            else:
+                raise ValueError(
+                    f"Unknown signal {entry!r}; known: {', '.join(self.names())}"
+                )
+
+        plan: dict[str, SignalSpec] = {}
+        visiting: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in plan:
+                return None
+            if name in visiting:
+                raise ValueError(f"Signal dependency cycle through {name!r}")
+            spec = self._specs.get(name)
+            if spec is None:
+                raise ValueError(f"Unknown signal dependency {name!r}")
+            visiting.add(name)
+            for dependency in spec.depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            plan[name] = spec
+            return None
+
+        for name in wanted:
+            visit(name)
+        return list(plan.values())
+
+
+def word_count(context: SignalContext) -> int:
+    """Count whitespace-separated words."""
+    return len(context.tokens)
+
+
+def character_count(context: SignalContext) -> int:
+    """Count characters of the processed text."""
+    return len(context.text)
+
+
+def estimated_reading_time(context: SignalContext) -> float:
+    """Estimate reading time assuming roughly 200 WPM."""
+    words = context["word_count"]
+    if words <= 0:
+        return 0.0
+    return round(words / 200.0, 2)
+
+
+def content_type(context: SignalContext) -> str:
+    """Guess content type using URL cues and word count."""
+    path = context.url.lower()
+
+    if "/docs/" in path or "/documentation/" in path:
+        return "doc_page"
+    if "/blog/" in path or "/posts/" in path or "/article/" in path:
+        return "article"
+    if "/product" in path or "/pricing" in path:
+        return "product_page"
+    if "/help" in path or "/faq" in path or "/support" in path:
+        return "help_page"
+
+    words = context["word_count"]
+    if words > 800:
+        return "long_form"
+    elif words > 200:
+        return "content_page"
+    else:
+        return "other"
+
+
+def default_registry(
+    language_detector: LanguageDetector | None = None,
+) -> SignalRegistry:
+    """Return a new registry holding the built-in signals."""
+    if language_detector is None:
+        language_detector = LanguageDetector()
+    return SignalRegistry(
+        [
+            SignalSpec("word_count", word_count),
+            SignalSpec("character_count", character_count),
+            SignalSpec(
+                "estimated_reading_time",
+                estimated_reading_time,
+                depends_on=("word_count",),
+            ),
+            SignalSpec("language", language_detector, cost=SignalCost.expensive),
+            SignalSpec("content_type", content_type, depends_on=("word_count",)),
+        ]
+    )
@@ -0,0 +1,205 @@
+import heapq
+import itertools
+import logging
+import math
+import re
+from typing import Callable, NamedTuple
+
+from scraper.traversal.interface import FrontierEntry, TraversalStrategy
+from scraper.traversal.trap_detector import url_template
+
+logger = logging.getLogger(__name__)
+
+# Path and query shapes of listing/navigation pages rather than content.
+_LISTING_PATTERN = re.compile(
+    r"/(page|category|categories|archive|archives|tags?|author|search|feed)/"
+    r"|[?&](page|p|sort|order|filter)="
+)
+_NAVIGATION_ANCHOR = re.compile(
+    r"^(next|prev|previous|more|older|newer|home|back|top|[\d\s»«›‹.]+)$",
+    re.IGNORECASE,
+)
+
+
+class LinkCandidate(NamedTuple):
+    """What a scoring function knows about a queued link."""
+
+    url: str
+    depth: int
+    anchor_text: str
+    # Template key of the URL (see trap_detector.url_template()).
+    template: str
+    # Average word_count of pages stored from this template; None if unseen.
+    template_yield: float | None
+
+
+ScoreFunction = Callable[[LinkCandidate], float]
+
+
+def default_link_score(candidate: LinkCandidate) -> float:
+    """
+    Favour links likely to lead to text-rich pages.
+
+    The score is mostly the template's yield on a log scale, where 1,000 words
+    scores about 1. Templates not seen yet get an optimistic 1.0, so each new
+    template is tried early. Depth, listing-like URLs and navigation anchors
+    ("next", "2", "»") lower the score a little, and descriptive anchor text
+    raises it.
+    """
+    if candidate.template_yield is None:
+        score = 1.0
+    else:
+        score = math.log1p(candidate.template_yield) / math.log1p(1_000)
+    score -= 0.02 * candidate.depth
+    if _LISTING_PATTERN.search(candidate.url):
+        score -= 0.15
+    anchor_text = candidate.anchor_text.strip()
+    if anchor_text and _NAVIGATION_ANCHOR.match(anchor_text):
+        score -= 0.1
+    elif len(anchor_text.split()) >= 3:
+        score += 0.1
+    return score
+
+
+class _Queued(NamedTuple):
+    url: str
+    depth: int
+    anchor_text: str
+    template: str
+    score: float
+    # Yield version of the template when the score was computed.
+    version: int
+
+
+class BestFirstTraversalStrategy(TraversalStrategy):
+    """
+    Heap-backed frontier that pops the highest-scoring URL first.
+
+    Each pushed link is scored by ``score`` (default_link_score()) from its
+    depth, URL, anchor text and the running yield of its template: the
+    average word_count of pages already stored from it, reported through
+    record_yield(). Scores are computed at push time. When a template's yield
+    changes, its entries are re-scored lazily as they reach the top of the
+    heap. Equal scores pop in FIFO order.
+
+    With ``max_size`` the frontier is bounded: pushing into a full frontier
+    evicts the lowest-scoring entry (or drops the new one if it scores
+    lowest). A second heap ordered the other way makes eviction O(log n);
+    entries removed from one heap are skipped lazily in the other.
+    """
+
+    needs_anchor_text = True
+
+    def __init__(
+        self, score: ScoreFunction = default_link_score, max_size: int | None = None
+    ) -> None:
+        """Configure the scoring function and optional frontier bound."""
+        self._score = score
+        self._max_size = max_size
+        self._entries: dict[int, _Queued] = {}
+        self._best: list[tuple[float, int]] = []
+        self._worst: list[tuple[float, int]] = []
+        self._sequence = itertools.count()
+        # template -> (pages stored, total words, version)
+        self._yields: dict[str, tuple[int, int, int]] = {}
+        self.evicted = 0
+        return None
+
+    def push(self, url: str, depth: int = 0) -> None:
+        """Add a URL without anchor text."""
+        self.push_link(url, depth, "")
+        return None
+
+    def push_link(self, url: str, depth: int, anchor_text: str) -> None:
+        """Score a discovered link and queue it, evicting if full."""
+        template = self._template(url)
+        score, version = self._score_for(url, depth, anchor_text, template)
+        if self._max_size is not None and len(self._entries) >= self._max_size:
+            worst = self._peek(self._worst)
+            if worst is None or score <= worst[0]:
+                self.evicted += 1
+                logger.debug("Frontier full; dropping %s (score %.3f)", url, score)
+                return None
+            evicted = self._entries.pop(worst[1])
+            heapq.heappop(self._worst)
+            self.evicted += 1
+            logger.debug(
+                "Frontier full; evicting %s (score %.3f)", evicted.url, evicted.score
+            )
+        self._insert(_Queued(url, depth, anchor_text, template, score, version))
+        return None
+
+    def pop(self) -> FrontierEntry | None:
+        """Remove and return the best URL, re-scoring stale entries first."""
+        while True:
+            top = self._peek(self._best)
+            if top is None:
+                return None
+            heapq.heappop(self._best)
+            entry = self._entries.pop(top[1])
+            current_version = self._yields.get(entry.template, (0, 0, 0))[2]
+            if entry.version != current_version:
+                score, version = self._score_for(
+                    entry.url, entry.depth, entry.anchor_text, entry.template
+                )
+                entry = entry._replace(score=score, version=version)
+                following = self._peek(self._best)
+                if following is not None and score < -following[0]:
+                    self._insert(entry)
+                    continue
+            self._compact()
+            return FrontierEntry(entry.url, entry.depth)
+
+    def is_empty(self) -> bool:
+        """Return True when no URLs are queued."""
+        return not self._entries
+
+    def size(self) -> int | None:
+        """Return the number of queued URLs."""
+        return len(self._entries)
+
+    def record_yield(self, url: str, word_count: int) -> None:
+        """Fold a stored page's word count into its template's yield."""
+        template = self._template(url)
+        pages, words, version = self._yields.get(template, (0, 0, 0))
+        self._yields[template] = (pages + 1, words + word_count, version + 1)
+        return None
+
+    def __len__(self) -> int:
+        """Return the number of queued URLs."""
+        return len(self._entries)
+
+    def _template(self, url: str) -> str:
+        path, names = url_template(url)
+        return f"{path}?{names}" if names else path
+
+    def _score_for(
+        self, url: str, depth: int, anchor_text: str, template: str
+    ) -> tuple[float, int]:
+        """Score a link against its template's current yield."""
+        pages, words, version = self._yields.get(template, (0, 0, 0))
+        template_yield = words / pages if pages else None
+        candidate = LinkCandidate(url, depth, anchor_text, template, template_yield)
+        return self._score(candidate), version
+
+    def _insert(self, entry: _Queued) -> None:
+        sequence = next(self._sequence)
+        self._entries[sequence] = entry
+        heapq.heappush(self._best, (-entry.score, sequence))
+        heapq.heappush(self._worst, (entry.score, sequence))
+        return None
+
+    def _peek(self, heap: list[tuple[float, int]]) -> tuple[float, int] | None:
+        """Return the top of a heap, discarding entries already removed."""
+        while heap and heap[0][1] not in self._entries:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _compact(self) -> None:
+        """Rebuild the heaps once removed entries dominate them."""
+        live = len(self._entries)
+        for heap in (self._best, self._worst):
+            if len(heap) > 2 * live + 64:
+                heap[:] = [item for item in heap if item[1] in self._entries]
+                heapq.heapify(heap)
+        return None
@@ -1,19 +1,19 @@
-from scraper.traversal.interface import TraversalStrategy
+from scraper.traversal.interface import FrontierEntry, TraversalStrategy
 from collections import deque
 
 
 class BreadthFirstTraversalStrategy(TraversalStrategy):
     def __init__(self) -> None:
         """Initialize an empty deque-backed queue."""
-        self._queue: deque[str] = deque()
+        self._queue: deque[FrontierEntry] = deque()
         return None
 
-    def push(self, url: str) -> None:
+    def push(self, url: str, depth: int = 0) -> None:
         """Enqueue a URL at the tail."""
-        self._queue.append(url)
+        self._queue.append(FrontierEntry(url, depth))
         return None
 
-    def pop(self) -> str | None:
+    def pop(self) -> FrontierEntry | None:
         """Dequeue the next URL in breadth-first order."""
         if self.is_empty():
             return None
@@ -22,3 +22,7 @@ class BreadthFirstTraversalStrategy(TraversalStrategy):
     def is_empty(self) -> bool:
         """Return True when the queue has no pending URLs."""
         return len(self._queue) == 0
+
+    def size(self) -> int | None:
+        """Return the number of pending URLs."""
+        return len(self._queue)
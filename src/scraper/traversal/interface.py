@@ -1,18 +1,76 @@
 from abc import ABC, abstractmethod
+from typing import Iterator, NamedTuple
+
+from scraper.models import CrawlCheckpoint
+
+
+class FrontierEntry(NamedTuple):
+    url: str
+    depth: int
 
 
 class TraversalStrategy(ABC):
+    # Whether discovered links should be pushed with their anchor text.
+    needs_anchor_text: bool = False
+
     @abstractmethod
-    def push(self, url: str) -> None:
-        """Add a URL to the traversal frontier."""
+    def push(self, url: str, depth: int = 0) -> None:
+        """Add a URL and its crawl depth to the traversal frontier."""
         raise NotImplementedError
 
     @abstractmethod
-    def pop(self) -> str | None:
-        """Remove and return the next URL to visit."""
+    def pop(self) -> FrontierEntry | None:
+        """Remove and return the next URL to visit with its depth."""
         raise NotImplementedError
 
     @abstractmethod
     def is_empty(self) -> bool:
         """Return True when the frontier has no work left."""
         raise NotImplementedError
+
+    def size(self) -> int | None:
+        """Return how many URLs are queued, or None if not tracked."""
+        return None
+
+    def push_link(self, url: str, depth: int, anchor_text: str) -> None:
+        """Add a link discovered on a page, with the text of its anchors."""
+        self.push(url, depth)
+        return None
+
+    def record_yield(self, url: str, word_count: int) -> None:
+        """Report the word count of a page stored from a popped URL."""
+        return None
+
+
+class ResumableTraversalStrategy(TraversalStrategy):
+    """Frontier that also persists crawl progress so a crawl can resume."""
+
+    @abstractmethod
+    def record_seen(self, url: str) -> None:
+        """Persist that a URL has been discovered."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_seen(self) -> Iterator[str]:
+        """Yield every URL recorded as seen, for rebuilding the visited store."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def mark_done(self, url: str) -> None:
+        """Persist that a popped URL has been fully processed."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_pages_written(self, pages_written: int) -> None:
+        """Persist the number of pages handed to the output writer."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_checkpoint(self) -> CrawlCheckpoint | None:
+        """Return saved progress to resume from, or None for a fresh crawl."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def checkpoint(self) -> None:
+        """Commit everything recorded since the previous checkpoint."""
+        raise NotImplementedError
@@ -0,0 +1,167 @@
+import logging
+import sqlite3
+from typing import Iterator
+
+from scraper.models import CrawlCheckpoint
+from scraper.traversal.interface import FrontierEntry, ResumableTraversalStrategy
+
+logger = logging.getLogger(__name__)
+
+_QUEUED = 0
+_IN_PROGRESS = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    depth INTEGER NOT NULL,
+    state INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS frontier_state_seq ON frontier (state, seq);
+CREATE TABLE IF NOT EXISTS seen (
+    url TEXT PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class SqliteTraversalStrategy(ResumableTraversalStrategy):
+    """
+    Breadth-first frontier (URL + depth) persisted in SQLite alongside the
+    seen set and the pages-written counter.
+
+    Changes accumulate in one open transaction and are committed together by
+    checkpoint(), so a resumed crawl always sees a consistent snapshot. Popped
+    URLs stay in the frontier as "in progress" until mark_done(); on resume
+    they are queued again, so work interrupted mid-flight is repeated rather
+    than lost.
+    """
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        """Configure the database path and whether to keep previous state."""
+        self.path = path
+        self._resume = resume
+        self._conn: sqlite3.Connection | None = None
+        self._queued = 0
+        return None
+
+    async def __aenter__(self) -> "SqliteTraversalStrategy":
+        """Open the database, resetting it unless resuming."""
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._resume:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS frontier; DROP TABLE IF EXISTS seen;"
+                " DROP TABLE IF EXISTS meta;"
+            )
+        self._conn.executescript(_SCHEMA)
+        if self._resume:
+            self._conn.execute(
+                "UPDATE frontier SET state = ? WHERE state = ?", (_QUEUED, _IN_PROGRESS)
+            )
+        self._conn.commit()
+        (self._queued,) = self._conn.execute(
+            "SELECT COUNT(*) FROM frontier WHERE state = ?", (_QUEUED,)
+        ).fetchone()
+        return self
+
+    def push(self, url: str, depth: int = 0) -> None:
+        """Append a URL and its depth to the persisted queue."""
+        cursor = self._db().execute(
+            "INSERT OR IGNORE INTO frontier (url, depth, state) VALUES (?, ?, ?)",
+            (url, depth, _QUEUED),
+        )
+        self._queued += cursor.rowcount
+        return None
+
+    def pop(self) -> FrontierEntry | None:
+        """Claim the oldest queued URL and mark it in progress."""
+        if self.is_empty():
+            return None
+        conn = self._db()
+        row = conn.execute(
+            "SELECT seq, url, depth FROM frontier"
+            " WHERE state = ? ORDER BY seq LIMIT 1",
+            (_QUEUED,),
+        ).fetchone()
+        if row is None:
+            self._queued = 0
+            return None
+        seq, url, depth = row
+        conn.execute("UPDATE frontier SET state = ? WHERE seq = ?", (_IN_PROGRESS, seq))
+        self._queued -= 1
+        return FrontierEntry(url, depth)
+
+    def is_empty(self) -> bool:
+        """Return True when no URL is waiting to be claimed."""
+        return self._queued <= 0
+
+    def size(self) -> int | None:
+        """Return the number of URLs waiting to be claimed."""
+        return max(0, self._queued)
+
+    def record_seen(self, url: str) -> None:
+        """Persist a discovered URL."""
+        self._db().execute("INSERT OR IGNORE INTO seen (url) VALUES (?)", (url,))
+        return None
+
+    def iter_seen(self) -> Iterator[str]:
+        """Stream every seen URL from the database."""
+        for (url,) in self._db().execute("SELECT url FROM seen"):
+            yield url
+
+    def mark_done(self, url: str) -> None:
+        """Drop a processed URL from the frontier."""
+        self._db().execute("DELETE FROM frontier WHERE url = ?", (url,))
+        return None
+
+    def record_pages_written(self, pages_written: int) -> None:
+        """Persist the pages-written counter."""
+        self._db().execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('pages_written', ?)",
+            (pages_written,),
+        )
+        return None
+
+    def load_checkpoint(self) -> CrawlCheckpoint | None:
+        """Return the saved page count if there is progress to resume."""
+        conn = self._db()
+        if conn.execute("SELECT 1 FROM seen LIMIT 1").fetchone() is None:
+            return None
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'pages_written'"
+        ).fetchone()
+        checkpoint = CrawlCheckpoint(pages_written=row[0] if row else 0)
+        logger.info(
+            "Resuming crawl: %s queued, %s pages written",
+            self._queued,
+            checkpoint.pages_written,
+        )
+        return checkpoint
+
+    def checkpoint(self) -> None:
+        """Commit the pending batch of frontier and progress changes."""
+        self._db().commit()
+        return None
+
+    async def aclose(self) -> None:
+        """Commit outstanding changes and close the database."""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+        return None
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the database when leaving the context."""
+        await self.aclose()
+
+    def _db(self) -> sqlite3.Connection:
+        """Return the open connection or fail loudly when not entered."""
+        if self._conn is None:
+            raise RuntimeError("SqliteTraversalStrategy must be entered before use")
+        return self._conn
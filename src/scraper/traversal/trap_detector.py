@@ -0,0 +1,175 @@
+import logging
+import re
+from collections import Counter, defaultdict
+from enum import StrEnum
+from urllib.parse import unquote_plus, urlparse
+
+logger = logging.getLogger(__name__)
+
+_DATE = re.compile(r"\d{4}-\d{1,2}(-\d{1,2})?")
+_HEX_ID = re.compile(r"(?=.*\d)[0-9a-f-]{8,}", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+
+
+class TrapReason(StrEnum):
+    url_too_long = "url_too_long"
+    path_too_deep = "path_too_deep"
+    repeated_segments = "repeated_segments"
+    query_explosion = "query_explosion"
+    template_budget = "template_budget"
+
+
+def segment_template(segment: str) -> str:
+    """Replace the variable parts of one path segment with placeholders."""
+    if _DATE.fullmatch(segment):
+        return "{date}"
+    if _HEX_ID.fullmatch(segment):
+        return "{id}"
+    return _DIGITS.sub("{n}", segment)
+
+
+def url_template(url: str) -> tuple[str, str]:
+    """
+    Return the (path template, query names) a URL belongs to.
+
+    Path segments keep their text with numbers, dates and hex ids replaced, so
+    ``/archive/2024-05/page/3/`` becomes ``/archive/{date}/page/{n}/``. The
+    query contributes its sorted, distinct parameter names; values never
+    matter.
+    """
+    parsed = urlparse(url)
+    path = "/".join(segment_template(segment) for segment in parsed.path.split("/"))
+    names = sorted(
+        {
+            unquote_plus(pair.partition("=")[0]).lower()
+            for pair in parsed.query.split("&")
+        }
+        - {""}
+    )
+    return f"{parsed.netloc}{path}", "&".join(names)
+
+
+class TrapDetector:
+    """
+    Frontier-side guard against crawler traps and infinite URL spaces.
+
+    Every URL about to be enqueued is checked with admit(). Cheap structural
+    checks run first: overall length, path depth, and repetitive paths (a
+    segment occurring more than ``max_segment_repeats`` times, or a block of
+    segments repeated back to back like ``/a/b/a/b/``). The URL is then
+    grouped into a template (see url_template()). Each path template accepts
+    at most ``max_query_variants`` distinct sets of query parameter names,
+    which stops faceted filters whose combinations explode. Each full
+    template (path plus parameter names) is admitted at most
+    ``max_urls_per_template`` times, which caps calendars and endless
+    pagination. A budget of None disables that check.
+
+    Rejections are counted per reason and per template for the crawl report.
+    """
+
+    def __init__(
+        self,
+        max_urls_per_template: int | None = 1_000,
+        max_query_variants: int | None = 32,
+        max_segment_repeats: int = 2,
+        max_path_depth: int = 16,
+        max_url_length: int = 2_048,
+    ) -> None:
+        """Configure per-template budgets and structural limits."""
+        self.max_urls_per_template = max_urls_per_template
+        self.max_query_variants = max_query_variants
+        self.max_segment_repeats = max_segment_repeats
+        self.max_path_depth = max_path_depth
+        self.max_url_length = max_url_length
+
+        self._admitted: Counter[tuple[str, str]] = Counter()
+        self._query_variants: defaultdict[str, set[str]] = defaultdict(set)
+        self.throttled: Counter[TrapReason] = Counter()
+        self.throttled_templates: Counter[str] = Counter()
+        return None
+
+    def admit(self, url: str) -> TrapReason | None:
+        """Charge url to its template; return why it was refused, or None."""
+        reason = self._structural_reason(url)
+        template = url_template(url)
+        if reason is None:
+            reason = self._budget_reason(template)
+        if reason is not None:
+            self._record_throttle(reason, template)
+            return reason
+        self._charge(template)
+        return None
+
+    def record(self, url: str) -> None:
+        """Charge an already admitted URL (e.g. from a resumed crawl)."""
+        self._charge(url_template(url))
+        return None
+
+    def reset(self) -> None:
+        """Forget budgets and throttle counts before a new crawl."""
+        self._admitted.clear()
+        self._query_variants.clear()
+        self.throttled.clear()
+        self.throttled_templates.clear()
+        return None
+
+    def top_throttled(self, limit: int = 5) -> list[tuple[str, int]]:
+        """Return the templates with the most refused URLs."""
+        return self.throttled_templates.most_common(limit)
+
+    def _structural_reason(self, url: str) -> TrapReason | None:
+        """Check length, depth and repetition of the URL itself."""
+        if len(url) > self.max_url_length:
+            return TrapReason.url_too_long
+        segments = [segment for segment in urlparse(url).path.split("/") if segment]
+        if len(segments) > self.max_path_depth:
+            return TrapReason.path_too_deep
+        if segments and (
+            Counter(segments).most_common(1)[0][1] > self.max_segment_repeats
+            or self._has_repeated_block(segments)
+        ):
+            return TrapReason.repeated_segments
+        return None
+
+    def _has_repeated_block(self, segments: list[str]) -> bool:
+        """Return True when the path ends in a block repeated back to back."""
+        for size in range(2, len(segments) // 2 + 1):
+            if segments[-size:] == segments[-2 * size : -size]:
+                return True
+        return False
+
+    def _budget_reason(self, template: tuple[str, str]) -> TrapReason | None:
+        """Check the per-template budgets without charging them."""
+        path, names = template
+        variants = self._query_variants.get(path)
+        if (
+            self.max_query_variants is not None
+            and names
+            and variants is not None
+            and names not in variants
+            and len(variants) >= self.max_query_variants
+        ):
+            return TrapReason.query_explosion
+        if (
+            self.max_urls_per_template is not None
+            and self._admitted[template] >= self.max_urls_per_template
+        ):
+            return TrapReason.template_budget
+        return None
+
+    def _charge(self, template: tuple[str, str]) -> None:
+        """Count one admitted URL against its template."""
+        path, names = template
+        self._admitted[template] += 1
+        if names:
+            self._query_variants[path].add(names)
+        return None
+
+    def _record_throttle(self, reason: TrapReason, template: tuple[str, str]) -> None:
+        """Count a refused URL and log the first refusal per template."""
+        self.throttled[reason] += 1
+        key = f"{template[0]}?{template[1]}" if template[1] else template[0]
+        if key not in self.throttled_templates:
+            logger.info("Throttling URLs matching %s (%s)", key, reason)
+        self.throttled_templates[key] += 1
+        return None
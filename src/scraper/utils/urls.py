@@ -10,8 +10,37 @@ This module is designed to be used by:
 
 from __future__ import annotations
 
-from urllib.parse import urlparse, urljoin, urldefrag
-from typing import Optional
+import fnmatch
+import functools
+import re
+from urllib.parse import unquote_plus, urlparse, urljoin, urldefrag
+from typing import Iterable, Mapping, Optional
+
+# Tracking and session parameters dropped by QueryCanonicalizer by default.
+DEFAULT_STRIPPED_PARAMS: tuple[str, ...] = (
+    "utm_*",
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "mc_cid",
+    "mc_eid",
+    "_ga",
+    "_gl",
+    "sessionid",
+    "session_id",
+    "sid",
+    "phpsessid",
+    "jsessionid",
+    "aspsessionid*",
+    "cfid",
+    "cftoken",
+)
+
+_SKIPPED_SCHEMES = ("javascript:", "mailto:", "tel:")
+# scheme://netloc prefix of an absolute URL, as urljoin sees it.
+_ORIGIN = re.compile(r"[^:/?#]+://[^/?#]*")
 
 
 def extract_domain_root(url: str) -> str:
@@ -146,3 +175,194 @@ def clean_and_normalize_link(
         return None
 
     return norm
+
+
+class QueryCanonicalizer:
+    """
+    Rewrites query strings so that equivalent URLs compare equal.
+
+    Parameters are matched by name, case-insensitively. ``strip_params``
+    entries may use shell-style wildcards (``utm_*``). A host listed in
+    ``allowed_params`` keeps only those parameters and ignores the strip-list.
+    Parameters without a value are dropped with ``drop_empty``. With
+    ``sort_params`` the rest are ordered by name; repeated names keep their
+    relative order. Names and values are kept as written and never
+    re-encoded.
+    """
+
+    def __init__(
+        self,
+        strip_params: Iterable[str] = DEFAULT_STRIPPED_PARAMS,
+        allowed_params: Mapping[str, Iterable[str]] | None = None,
+        sort_params: bool = True,
+        drop_empty: bool = True,
+    ) -> None:
+        """Compile the strip-list and index the per-host allow-lists."""
+        patterns = [fnmatch.translate(name.lower()) for name in strip_params]
+        self._strip = re.compile("|".join(patterns)) if patterns else None
+        self._allowed: dict[str, frozenset[str]] = {
+            host.lower(): frozenset(name.lower() for name in names)
+            for host, names in (allowed_params or {}).items()
+        }
+        self._sort_params = sort_params
+        self._drop_empty = drop_empty
+
+    def canonicalize(self, host: str, query: str) -> str:
+        """Return the canonical form of query for a URL on host."""
+        allowed = self._allowed.get(host)
+        kept: list[str] = []
+        for pair in query.split("&"):
+            if not pair:
+                continue
+            name, _, value = pair.partition("=")
+            if self._drop_empty and not value:
+                continue
+            key = unquote_plus(name).lower()
+            if allowed is not None:
+                if key not in allowed:
+                    continue
+            elif self._strip is not None and self._strip.match(key):
+                continue
+            kept.append(pair)
+        if self._sort_params:
+            kept.sort(key=lambda pair: pair.partition("=")[0])
+        return "&".join(kept)
+
+
+class UrlNormalizer:
+    """
+    Cached, single-parse equivalent of clean_and_normalize_link() for a crawl.
+
+    The domain root is parsed once. Each link is joined with urljoin, parsed
+    once with urlparse, and then normalized, domain-checked and path-filtered
+    from that one parse. Results are memoized in a bounded LRU keyed by
+    (base, href). Parts of the base that cannot change the result are
+    dropped from the key first: root-relative hrefs (``/about``) only depend
+    on the base's scheme and host, and absolute http(s) hrefs do not depend
+    on the base at all. So a site's navigation links hit the cache from
+    every page.
+
+    With a ``query_canonicalizer`` the query string is canonicalized as part
+    of normalization; without one it is kept verbatim.
+    """
+
+    def __init__(
+        self,
+        domain_root: str,
+        cache_size: int = 65_536,
+        query_canonicalizer: QueryCanonicalizer | None = None,
+    ) -> None:
+        """Pre-parse the crawl's domain root and size the memo cache."""
+        parsed = urlparse(domain_root)
+        self.domain_root = domain_root
+        self._scheme = parsed.scheme
+        self._netloc = parsed.netloc
+        self._query_canonicalizer = query_canonicalizer
+        self._normalize_cached = functools.lru_cache(maxsize=cache_size)(
+            self._normalize_uncached
+        )
+
+    def normalize(self, href: str, base_url: str) -> Optional[str]:
+        """Return the normalized same-domain URL for href, or None."""
+        if not href:
+            return None
+        href = href.strip()
+        if href.startswith(_SKIPPED_SCHEMES):
+            return None
+        return self._normalize_cached(self._base_key(base_url, href), href)
+
+    def normalize_links(self, hrefs: Iterable[str], base_url: str) -> list[str]:
+        """
+        Normalize all links of one page at once.
+
+        Returns the distinct same-domain URLs in first-seen order; repeated
+        hrefs on the page are only looked up once.
+        """
+        seen_hrefs: set[str] = set()
+        seen_urls: set[str] = set()
+        urls: list[str] = []
+        for href in hrefs:
+            if href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
+            url = self.normalize(href, base_url)
+            if url is not None and url not in seen_urls:
+                seen_urls.add(url)
+                urls.append(url)
+        return urls
+
+    def normalize_anchors(
+        self, anchors: Iterable[tuple[str, str]], base_url: str
+    ) -> dict[str, str]:
+        """
+        Like normalize_links(), for (href, anchor text) pairs.
+
+        Maps each distinct URL to the distinct texts of the anchors that
+        link to it, joined by spaces.
+        """
+        texts: dict[str, list[str]] = {}
+        for href, text in anchors:
+            url = self.normalize(href, base_url)
+            if url is None:
+                continue
+            url_texts = texts.setdefault(url, [])
+            if text and text not in url_texts:
+                url_texts.append(text)
+        return {url: " ".join(url_texts) for url, url_texts in texts.items()}
+
+    def canonicalize_query(self, url: str) -> str:
+        """Canonicalize the query of an already normalized URL."""
+        if self._query_canonicalizer is None:
+            return url
+        prefix, separator, query = url.partition("?")
+        if not separator:
+            return url
+        query = self._query_canonicalizer.canonicalize(urlparse(url).netloc, query)
+        return f"{prefix}?{query}" if query else prefix
+
+    def cache_info(self) -> functools._CacheInfo:
+        """Return hit/miss statistics of the memo cache."""
+        return self._normalize_cached.cache_info()
+
+    def _base_key(self, base_url: str, href: str) -> str:
+        """Reduce base_url to the part that can influence urljoin(base, href)."""
+        if href.startswith("/") and not href.startswith("//"):
+            origin = _ORIGIN.match(base_url)
+            return origin.group() if origin else base_url
+        if href.startswith(("http://", "https://")):
+            # Same-scheme absolute URLs ignore the base; keep the scheme so
+            # urljoin takes the same branch.
+            origin = _ORIGIN.match(href)
+            return origin.group() if origin else base_url
+        return base_url
+
+    def _normalize_uncached(self, base_url: str, href: str) -> Optional[str]:
+        """Join, parse once, normalize, check the domain and filter the path."""
+        parsed = urlparse(urljoin(base_url, href))
+
+        scheme = parsed.scheme.lower()
+        netloc = parsed.netloc.lower()
+        if scheme == "http" and netloc.endswith(":80"):
+            netloc = netloc[:-3]
+        elif scheme == "https" and netloc.endswith(":443"):
+            netloc = netloc[:-4]
+        if scheme != self._scheme or netloc != self._netloc:
+            return None
+
+        path = parsed.path
+        if path == "":
+            path = "/"
+        elif not path.endswith("/") and "." not in path.split("/")[-1]:
+            path += "/"
+        path_lower = path.lower()
+        if "login" in path_lower or "tag" in path_lower:
+            return None
+
+        query = parsed.query
+        if query and self._query_canonicalizer is not None:
+            query = self._query_canonicalizer.canonicalize(netloc, query)
+
+        normalized = f"{scheme}://{netloc}{path}"
+        if query:
+            normalized += f"?{query}"
+        return normalized
@@ -0,0 +1,86 @@
+import logging
+import math
+
+from scraper.visited.interface import VisitedStore, url_hash128
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+
+
+class BloomFilterVisitedStore(VisitedStore):
+    """
+    Probabilistic store sized for ``capacity`` URLs at ``false_positive_rate``.
+
+    Uses about ``-1.44 * log2(p)`` bits per URL (~1.2 bytes at 1%). A false
+    positive makes the crawler treat an unseen URL as seen and skip it; there
+    are never false negatives, so no URL is fetched twice. Past ``capacity``
+    the false-positive rate climbs, which is logged once.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01) -> None:
+        """Size the bit array and hash count for the target error rate."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self._bit_count = max(
+            8,
+            math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2)),
+        )
+        self._hash_count = max(1, round(self._bit_count / capacity * math.log(2)))
+        self._bits = bytearray((self._bit_count + 7) // 8)
+        self._count = 0
+        self._warned = False
+        return None
+
+    def add(self, url: str) -> bool:
+        """Set the URL's bits; return True if any of them was unset."""
+        bits = self._bits
+        new = False
+        for position in self._positions(url):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self._count += 1
+            if self._count > self.capacity and not self._warned:
+                self._warned = True
+                logger.warning(
+                    "Bloom filter exceeded its capacity of %s URLs; "
+                    "false-positive rate will rise above %s",
+                    self.capacity,
+                    self.false_positive_rate,
+                )
+        return new
+
+    def __contains__(self, url: object) -> bool:
+        """Return True if every bit for the URL is set."""
+        if not isinstance(url, str):
+            return False
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(url)
+        )
+
+    def __len__(self) -> int:
+        """Return the number of URLs recorded as new."""
+        return self._count
+
+    def clear(self) -> None:
+        """Reset every bit."""
+        self._bits = bytearray(len(self._bits))
+        self._count = 0
+        self._warned = False
+        return None
+
+    def _positions(self, url: str) -> list[int]:
+        """Derive bit positions by double hashing one 128-bit digest."""
+        digest = url_hash128(url)
+        first, second = digest & _MASK64, (digest >> 64) | 1
+        size = self._bit_count
+        return [(first + i * second) % size for i in range(self._hash_count)]
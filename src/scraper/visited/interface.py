@@ -0,0 +1,31 @@
+import hashlib
+from abc import ABC, abstractmethod
+
+
+class VisitedStore(ABC):
+    @abstractmethod
+    def add(self, url: str) -> bool:
+        """Record a URL; return True if it was not already present."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def __contains__(self, url: object) -> bool:
+        """Return True if the URL has (probably) been recorded."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return how many distinct URLs have been recorded."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget every recorded URL."""
+        raise NotImplementedError
+
+
+def url_hash128(url: str) -> int:
+    """Return a stable 128-bit hash of a URL."""
+    return int.from_bytes(
+        hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest(), "little"
+    )
@@ -0,0 +1,30 @@
+from scraper.visited.interface import VisitedStore
+
+
+class SetVisitedStore(VisitedStore):
+    """Exact store keeping full URL strings in a Python set."""
+
+    def __init__(self) -> None:
+        """Initialize an empty set."""
+        self._urls: set[str] = set()
+        return None
+
+    def add(self, url: str) -> bool:
+        """Record a URL; return True if it was new."""
+        if url in self._urls:
+            return False
+        self._urls.add(url)
+        return True
+
+    def __contains__(self, url: object) -> bool:
+        """Return True if the URL was recorded."""
+        return url in self._urls
+
+    def __len__(self) -> int:
+        """Return the number of recorded URLs."""
+        return len(self._urls)
+
+    def clear(self) -> None:
+        """Forget every recorded URL."""
+        self._urls.clear()
+        return None
@@ -0,0 +1,84 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from scraper.models import PageObject
+from scraper.output.buffered_jsonl_writer import BufferedJsonlWriter
+
+
+class DiskFullError(Exception):
+    """Stands in for an OSError; TimeoutError is an OSError too."""
+
+
+def page(number: int) -> PageObject:
+    return PageObject(
+        url=f"https://example.com/{number}",
+        title=f"Page {number}",
+        text="Some text",
+        timestamp="2024-01-01T00:00:00",
+    )
+
+
+class FailingWriter(BufferedJsonlWriter):
+    """Fails every batch write, like a full disk."""
+
+    async def _write_batch(self, lines: list[str]) -> None:
+        if lines:
+            raise DiskFullError("No space left on device")
+
+
+class StalledWriter(BufferedJsonlWriter):
+    """Blocks the first batch write until released, then fails it."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.release = asyncio.Event()
+
+    async def _write_batch(self, lines: list[str]) -> None:
+        if lines:
+            await self.release.wait()
+            raise DiskFullError("No space left on device")
+
+
+class BufferedJsonlWriterTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.path = os.path.join(directory, "pages.jsonl")
+
+    async def test_flush_writes_queued_records(self) -> None:
+        async with BufferedJsonlWriter(self.path, flush_interval=60) as writer:
+            for number in range(3):
+                await writer.write(page(number))
+            await writer.flush()
+            with open(self.path, encoding="utf-8") as f:
+                self.assertEqual(len(f.readlines()), 3)
+
+    async def test_flush_raises_background_write_error(self) -> None:
+        writer = FailingWriter(self.path, flush_interval=60)
+        await writer.__aenter__()
+        await writer.write(page(0))
+        with self.assertRaises(DiskFullError):
+            await asyncio.wait_for(writer.flush(), 1)
+        with self.assertRaises(DiskFullError):
+            await writer.aclose()
+
+    async def test_blocked_write_raises_background_write_error(self) -> None:
+        writer = StalledWriter(self.path, flush_bytes=1, max_pending=1)
+        await writer.__aenter__()
+        await writer.write(page(0))
+        await asyncio.sleep(0)  # The background task takes it and stalls.
+        await writer.write(page(1))
+        blocked = asyncio.ensure_future(writer.write(page(2)))
+        await asyncio.sleep(0)
+        self.assertFalse(blocked.done())
+
+        writer.release.set()
+        with self.assertRaises(DiskFullError):
+            await asyncio.wait_for(blocked, 1)
+        with self.assertRaises(DiskFullError):
+            await writer.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+import httpx
+
+from scraper.http.caching_fetcher import CachingFetcher
+from scraper.http.interface import HttpFetcher
+
+URL = "https://example.com/page"
+
+
+class RevalidatingFetcher(HttpFetcher):
+    """Answer 304 to conditional requests and 200 with an ETag otherwise."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests: list[dict[str, str]] = []
+
+    async def get(self, url: str) -> httpx.Response | None:
+        return await self.fetch(url)
+
+    async def fetch(
+        self, url: str, attempt: int = 0, headers: dict[str, str] | None = None
+    ) -> httpx.Response | None:
+        headers = dict(headers or {})
+        self.requests.append(headers)
+        request = httpx.Request("GET", url, headers=headers)
+        if "If-None-Match" in headers:
+            return httpx.Response(304, headers={"ETag": '"v1"'}, request=request)
+        return httpx.Response(
+            200, headers={"ETag": '"v1"'}, content=b"<p>fresh</p>", request=request
+        )
+
+
+class CachingFetcherTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.cache_dir = self.enterContext(tempfile.TemporaryDirectory())
+
+    async def test_304_is_served_from_disk(self) -> None:
+        upstream = RevalidatingFetcher()
+        async with CachingFetcher(upstream, self.cache_dir) as fetcher:
+            await fetcher.fetch(URL)
+            response = await fetcher.fetch(URL)
+
+        assert response is not None
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<p>fresh</p>")
+        self.assertEqual(upstream.requests[1], {"If-None-Match": '"v1"'})
+        self.assertEqual((fetcher.hits, fetcher.misses), (1, 1))
+
+    async def test_missing_body_refetches_without_validators(self) -> None:
+        upstream = RevalidatingFetcher()
+        async with CachingFetcher(upstream, self.cache_dir) as fetcher:
+            await fetcher.fetch(URL)
+            bodies_dir = os.path.join(self.cache_dir, "bodies")
+            for name in os.listdir(bodies_dir):
+                os.remove(os.path.join(bodies_dir, name))
+
+            response = await fetcher.fetch(URL)
+            self.assertEqual(os.listdir(bodies_dir), [fetcher._key(URL)])
+            cached = await fetcher.fetch(URL)
+
+        assert response is not None and cached is not None
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<p>fresh</p>")
+        self.assertEqual(
+            upstream.requests,
+            [{}, {"If-None-Match": '"v1"'}, {}, {"If-None-Match": '"v1"'}],
+        )
+        self.assertEqual(cached.content, b"<p>fresh</p>")
+        self.assertEqual((fetcher.hits, fetcher.misses), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
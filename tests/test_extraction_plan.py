@@ -0,0 +1,69 @@
+import importlib.util
+import unittest
+
+import httpx
+
+from scraper.parsers.basic_html_parser import BasicHtmlParser
+from scraper.parsers.lxml_html_parser import LxmlHtmlParser
+
+URL = "https://example.com/articles/1/"
+
+# One template: the skeleton (html/body/main/div) is the same on every page.
+# The first page has the boilerplate at skeleton depth only; later pages also
+# nest it below the skeleton, where a cached plan has to keep removing it.
+PAGES = [
+    """<html><head><title>One</title></head><body>
+    <header class="site-header">Menu</header>
+    <main><div>one</div></main>
+    <footer>Legal</footer></body></html>""",
+    """<html><head><title>Two</title></head><body>
+    <header class="site-header">Menu</header>
+    <main><div><article><header>DEEPHDR</header>two</article></div></main>
+    <footer>Legal</footer></body></html>""",
+    """<html><head><title>Three</title></head><body>
+    <header class="site-header">Menu</header>
+    <main><div><section><p class="site-header">banner</p>three
+    <aside><footer>Related</footer></aside></section></div></main>
+    <footer>Legal</footer></body></html>""",
+]
+
+
+def response(markup: str) -> httpx.Response:
+    return httpx.Response(
+        200,
+        content=markup.encode("utf-8"),
+        headers={"Content-Type": "text/html; charset=utf-8"},
+        request=httpx.Request("GET", URL),
+    )
+
+
+class ExtractionPlanParityTest(unittest.TestCase):
+    def assert_cached_matches_uncached(
+        self, make_parser: type[BasicHtmlParser | LxmlHtmlParser]
+    ) -> None:
+        cached = make_parser()
+        for markup in PAGES:
+            page, links = cached.process_page(URL, response(markup))
+            expected_page, expected_links = make_parser().process_page(
+                URL, response(markup)
+            )
+            assert page is not None and expected_page is not None
+            self.assertEqual(page.text, expected_page.text)
+            self.assertEqual(page.title, expected_page.title)
+            self.assertEqual(links, expected_links)
+            self.assertNotIn("DEEPHDR", page.text)
+            self.assertNotIn("Related", page.text)
+
+        self.assertEqual(len(cached.plan_cache), 1)
+        self.assertEqual(cached.plan_cache.hits, len(PAGES) - 1)
+
+    def test_basic_parser(self) -> None:
+        self.assert_cached_matches_uncached(BasicHtmlParser)
+
+    @unittest.skipIf(importlib.util.find_spec("lxml") is None, "lxml not installed")
+    def test_lxml_parser(self) -> None:
+        self.assert_cached_matches_uncached(LxmlHtmlParser)
+
+
+if __name__ == "__main__":
+    unittest.main()